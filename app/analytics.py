@@ -0,0 +1,272 @@
+"""Statistics of the questions of a quiz, over every student it is assigned to.
+
+ItemAnalytics listens to a quiz and keeps, for every question, how many
+students chose each option and the sums needed for its point-biserial
+correlation with the score of the students. They are updated with every
+answer, so asking for the statistics does not go through the submissions.
+
+    difficulty        share of the students that answered a question who
+                      answered it correctly.
+    options           share of the students that answered a question who
+                      chose each option.
+    point biserial    correlation of answering a question correctly with the
+                      number of questions of the quiz answered correctly.
+
+ASSUMPTIONS:
+    The correct answer of a question does not change once it is in the quiz.
+    For the correlation, a question not answered is a question not answered
+    correctly, and every student the quiz is assigned to counts, even with no
+    answers yet.
+    Statistics that can not be computed, as the difficulty of a question
+    nobody answered, are NaN.
+"""
+import threading
+from typing import Dict, List, Optional, Set, TYPE_CHECKING
+
+import numpy as np
+
+from classroom.app.quizzes import QuizListener
+if TYPE_CHECKING: # pragma: no cover
+    from classroom.app.quizzes import Quiz, Submission
+
+# Options are 1 to 4, 0 is a question answered with something else.
+OPTIONS = 5
+
+
+class _Progress:
+    """What is counted of a submission.
+
+    Atributes
+    --------
+    answered : int
+        Answers counted.
+    total : int
+        Questions answered correctly.
+    folded : int
+        Total counted in _correct_total for every question the submission
+        answered correctly.
+    """
+    __slots__ = ('answered', 'total', 'folded')
+
+    def __init__(self, answered: int, total: int) -> None:
+        self.answered = answered
+        self.total = total
+        self.folded = total
+
+
+class ItemAnalytics(QuizListener):
+    """Statistics of every question of a quiz.
+
+    Counts are kept in lists, an answer updates a few of them, and are read
+    as arrays to compute the statistics.
+
+    A correct answer raises the total of the submission, and so the term of
+    every question it answered correctly before. Those are only added when
+    the correlation is read, once per submission that changed, so an answer
+    costs the same whatever the number of questions answered before.
+
+    Atributes
+    --------
+    quiz : Quiz
+        Quiz analysed.
+    semester_id : str
+        Only submissions of this semester are analysed, all if it is None.
+    students : int
+        Number of submissions analysed.
+    _key : [int]
+        Correct option of every question.
+    _option_counts : [[int]]
+        For every question, how many students chose each option (0 for
+        invalid answers).
+    _correct : [int]
+        For every question, how many students answered it correctly.
+    _correct_total : [int]
+        For every question, sum of the totals of the students that answered
+        it correctly, with the totals folded.
+    _total, _total_squares : int
+        Sum of the totals of the students, and of their squares. The total
+        of a student is how many questions they answered correctly.
+    _progress : {Submission: _Progress}
+        What is counted of every submission analysed.
+    _unfolded : {Submission}
+        Submissions whose total is not the one folded.
+    _lock : threading.Lock
+        Taken to update the statistics, answers can arrive from many threads.
+    """
+
+    def __init__(self, quiz: 'Quiz', semester_id: Optional[str] = None) -> None:
+        self.quiz = quiz
+        self.semester_id = semester_id
+        self.students = 0
+        self._key: List[int] = []
+        self._option_counts: List[List[int]] = []
+        self._correct: List[int] = []
+        self._correct_total: List[int] = []
+        self._total = 0
+        self._total_squares = 0
+        self._progress: Dict['Submission', _Progress] = {}
+        self._unfolded: Set['Submission'] = set()
+        self._lock = threading.Lock()
+        self._add_questions()
+
+    def track(self) -> None:
+        """Analyse the current submissions of the quiz, and the new ones.
+
+        Submissions already analysed are not counted again, so calling it
+        more than once does nothing.
+        """
+        self.quiz.add_listener(self)
+        submissions = [s for s in list(self.quiz.submissions.values()) if self._analyses(s)]
+        with self._lock:
+            self._add_all(submissions)
+
+    def _analyses(self, submission: 'Submission') -> bool:
+        return self.semester_id is None or submission.semester_id == self.semester_id
+
+    def _add_all(self, submissions: List['Submission']) -> None:
+        """Add many submissions in a few array operations."""
+        progress = self._progress
+        submissions = list({s: None for s in submissions if s not in progress})
+        questions = len(self._key)
+        answers = np.zeros((len(submissions), questions), dtype=np.uint8)
+        lengths = np.zeros(len(submissions), dtype=np.intp)
+        for row, submission in enumerate(submissions):
+            chosen = submission.get_answers(0, questions)
+            answers[row, :len(chosen)] = np.frombuffer(chosen, dtype=np.uint8)
+            lengths[row] = len(chosen)
+        answered = np.arange(questions) < lengths[:, None]
+        correct = answers == np.array(self._key, dtype=np.uint8)
+        totals = correct.sum(axis=1)
+        option_counts = np.stack(
+            [((answers == option) & answered).sum(axis=0) for option in range(OPTIONS)],
+            axis=1,
+        )
+        for counts, added in zip(self._option_counts, option_counts.tolist()):
+            counts[:] = [count + more for count, more in zip(counts, added)]
+        self._correct = (np.array(self._correct) + correct.sum(axis=0)).tolist()
+        self._correct_total = (np.array(self._correct_total) + totals @ correct).tolist()
+        self._total += int(totals.sum())
+        self._total_squares += int((totals ** 2).sum())
+        self.students += len(submissions)
+        for submission, length, total in zip(submissions, lengths.tolist(), totals.tolist()):
+            progress[submission] = _Progress(length, total)
+
+    def on_assign(self, submission: 'Submission') -> None:
+        if self._analyses(submission):
+            with self._lock:
+                self._add_all([submission])
+
+    def on_unassign(self, submission: 'Submission') -> None:
+        with self._lock:
+            progress = self._progress.pop(submission, None)
+            if progress is None:
+                return
+            self._unfolded.discard(submission)
+            key = self._key
+            for position, chosen in enumerate(submission.get_answers(0, progress.answered)):
+                self._option_counts[position][chosen] -= 1
+                if chosen == key[position]:
+                    self._correct[position] -= 1
+                    self._correct_total[position] -= progress.folded
+            total = progress.total
+            self._total -= total
+            self._total_squares -= total * total
+            self.students -= 1
+
+    def on_answer(self, submission: 'Submission', start: int, count: int) -> None:
+        if not self._analyses(submission):
+            return
+        with self._lock:
+            progress = self._progress.get(submission)
+            if progress is None:
+                return
+            stop = start + count
+            if stop > len(self._key):
+                # Answered a question added right now, before it was notified.
+                self._add_questions()
+            # Answers given before it was tracked are already counted.
+            start = max(start, progress.answered)
+            if start >= stop:
+                return
+            key = self._key
+            folded = progress.folded
+            gained = 0
+            for position, chosen in enumerate(submission.get_answers(start, stop), start):
+                self._option_counts[position][chosen] += 1
+                if chosen == key[position]:
+                    gained += 1
+                    self._correct[position] += 1
+                    # As the questions answered before, until folded.
+                    self._correct_total[position] += folded
+            progress.answered = stop
+            if not gained:
+                return
+            previous = progress.total
+            total = progress.total = previous + gained
+            self._total += gained
+            self._total_squares += total * total - previous * previous
+            self._unfolded.add(submission)
+
+    def _fold(self) -> None:
+        """Count the current total of the changed submissions in _correct_total."""
+        if not self._unfolded:
+            return
+        key = np.array(self._key, dtype=np.uint8)
+        gains = np.zeros(len(key), dtype=np.int64)
+        for submission in self._unfolded:
+            progress = self._progress[submission]
+            answers = np.frombuffer(submission.get_answers(0, progress.answered), dtype=np.uint8)
+            gains[:len(answers)] += (answers == key[:len(answers)]) * (
+                progress.total - progress.folded
+            )
+            progress.folded = progress.total
+        self._unfolded.clear()
+        self._correct_total = (np.array(self._correct_total) + gains).tolist()
+
+    def on_question_added(self, quiz: 'Quiz') -> None:
+        with self._lock:
+            self._add_questions()
+
+    def _add_questions(self) -> None:
+        for question in self.quiz.questions[len(self._key):]:
+            self._key.append(question.correct_answer)
+            self._option_counts.append([0] * OPTIONS)
+            self._correct.append(0)
+            self._correct_total.append(0)
+
+    @property
+    def option_counts(self) -> np.ndarray:
+        """For every question (rows), how many students chose each option (columns)."""
+        return np.array(self._option_counts, dtype=np.int64).reshape(-1, OPTIONS)
+
+    def answered(self) -> np.ndarray:
+        """How many students answered every question."""
+        return self.option_counts.sum(axis=1)
+
+    def difficulty(self) -> np.ndarray:
+        """Share of the answers to every question that are correct."""
+        with self._lock:
+            correct = np.array(self._correct, dtype=np.int64)
+            answered = self.answered()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return correct / answered
+
+    def option_distribution(self) -> np.ndarray:
+        """Share of the answers to every question (rows) with each option (columns)."""
+        counts = self.option_counts
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return counts / counts.sum(axis=1)[:, None]
+
+    def point_biserial(self) -> np.ndarray:
+        """Correlation of answering every question correctly with the totals."""
+        with self._lock:
+            self._fold()
+            n = self.students
+            correct = np.array(self._correct, dtype=np.float64)
+            correct_total = np.array(self._correct_total, dtype=np.float64)
+            total, total_squares = self._total, self._total_squares
+        covariance = n * correct_total - correct * total
+        item_variance = n * correct - correct ** 2
+        total_variance = float(n * total_squares - total * total)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return covariance / np.sqrt(item_variance * total_variance)
@@ -0,0 +1,294 @@
+"""Keep the answers of the students in a file, so they survive a crash.
+
+An AnswerLog listens to quizzes and appends every assignment and every answer
+to a file. Records are written in batches, and the file is synced to disk
+every some records or some seconds, whatever comes first. A thread of the log
+syncs the records left waiting when no more answers arrive.
+
+At startup, replay_answer_log applies the records again to the students, and
+AnswerLog.compact saves a snapshot of the school and starts a new log.
+
+Every record is its length and checksum, followed by:
+
+    kind, first question, semester, student id, quiz id, number of answers,
+    and the chosen answers.
+
+ASSUMPTIONS:
+    Quiz ids are unique, as said in quizzes.
+    Logs are replayed before the log is added to the quizzes, otherwise the
+    replayed answers would be logged again.
+    A record that is cut or corrupt is the end of the log, it is what a crash
+    while writing leaves.
+"""
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import BinaryIO, Iterable, Iterator, List, Mapping, Tuple, Union, TYPE_CHECKING
+
+from classroom.app.quizzes import QuizListener
+from classroom.app.utils import FixedSemesterClock, semester_clock
+if TYPE_CHECKING: # pragma: no cover
+    from classroom.app.courses import Department
+    from classroom.app.entities import Student, Teacher
+    from classroom.app.quizzes import Quiz, Submission
+
+ASSIGN = 1
+ANSWER = 2
+
+FRAME = struct.Struct('<II')
+RECORD = struct.Struct('<BIHHHI')
+
+# Suffix of the log while compact writes the snapshot.
+ROTATED = '.old'
+
+# kind, first question, semester id, student id, quiz id, answers
+Record = Tuple[int, int, str, str, str, bytes]
+
+
+def _pack(
+    kind: int, start: int, submission: 'Submission', answers: Union[bytes, bytearray]
+) -> bytes:
+    semester = submission.semester_id.encode('utf-8')
+    student = submission.student.student_id.encode('utf-8')
+    quiz = submission.quiz.quiz_id.encode('utf-8')
+    body = b''.join((
+        RECORD.pack(kind, start, len(semester), len(student), len(quiz), len(answers)),
+        semester, student, quiz, answers,
+    ))
+    return FRAME.pack(len(body), zlib.crc32(body)) + body
+
+
+class AnswerLog(QuizListener):
+    """Append-only log of assignments and answers.
+
+    Atributes
+    --------
+    path : str
+        File of the log.
+    sync_every : int
+        Records written before syncing the file to disk.
+    sync_interval : float
+        Seconds after which pending records are synced, even if there are
+        less than sync_every.
+    _pending : bytearray
+        Records not written yet.
+    _pending_count : int
+        Number of records in _pending.
+    _last_sync : float
+        When records were last synced.
+    _quizzes : [Quiz]
+        Quizzes logged, they are not logged anymore once the log is closed.
+    _lock : threading.Lock
+        Taken to add records, they can arrive from many threads.
+    _compacting : threading.Lock
+        Taken while compacting, only one snapshot is written at a time.
+    _closed : threading.Event
+        Set when the log is closed, it stops _flusher.
+    _flusher : threading.Thread
+        Syncs pending records sync_interval seconds after the last sync.
+    """
+
+    def __init__(self, path: str, sync_every: int = 1000, sync_interval: float = 1.0) -> None:
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self._file = open(path, 'ab')
+        self._pending = bytearray()
+        self._pending_count = 0
+        self._last_sync = time.monotonic()
+        self._quizzes: List['Quiz'] = []
+        self._lock = threading.Lock()
+        self._compacting = threading.Lock()
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+        self._flusher.start()
+
+    def __enter__(self) -> 'AnswerLog':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def attach(self, quizzes: Iterable['Quiz']) -> None:
+        """Log the assignments and answers of the given quizzes."""
+        for quiz in quizzes:
+            quiz.add_listener(self)
+            self._quizzes.append(quiz)
+
+    def on_assign(self, submission: 'Submission') -> None:
+        self._append(_pack(ASSIGN, 0, submission, b''))
+
+    def on_answer(self, submission: 'Submission', start: int, count: int) -> None:
+        self._append(_pack(ANSWER, start, submission, submission.get_answers(start, start + count)))
+
+    def _append(self, record: bytes) -> None:
+        with self._lock:
+            self._pending += record
+            self._pending_count += 1
+            if (
+                self._pending_count >= self.sync_every
+                or time.monotonic() - self._last_sync >= self.sync_interval
+            ):
+                self._sync()
+
+    def _flush_periodically(self) -> None:
+        timeout = self.sync_interval
+        while not self._closed.wait(timeout):
+            with self._lock:
+                elapsed = time.monotonic() - self._last_sync
+                if elapsed >= self.sync_interval:
+                    if self._pending:
+                        self._sync()
+                    timeout = self.sync_interval
+                else:
+                    timeout = self.sync_interval - elapsed
+
+    def sync(self) -> None:
+        """Write pending records and wait until they are on disk."""
+        with self._lock:
+            self._sync()
+
+    def _sync(self) -> None:
+        if self._pending:
+            self._file.write(self._pending)
+            self._pending.clear()
+            self._pending_count = 0
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        for quiz in self._quizzes:
+            quiz.remove_listener(self)
+        self._quizzes.clear()
+        self._closed.set()
+        if self._flusher is not threading.current_thread():
+            self._flusher.join()
+        with self._lock:
+            if not self._file.closed:
+                self._sync()
+                self._file.close()
+
+    def compact(
+        self,
+        snapshot_path: str,
+        departments: Iterable['Department'],
+        teachers: Iterable['Teacher'] = (),
+        students: Iterable['Student'] = (),
+        quizzes: Iterable['Quiz'] = (),
+    ) -> None:
+        """Save a snapshot of the school and empty the log.
+
+        Only moving the log aside to ROTATED, and starting a new one, is done
+        holding the lock, so students keep answering while the snapshot is
+        written. Records arriving meanwhile go to the new log; their answers
+        may also be in the snapshot, replaying them does not apply them twice.
+
+        The snapshot replaces the previous one only once it is on disk, and
+        the rotated log is removed after that, so a crash while compacting
+        leaves the old snapshot and both logs, which replay_answer_log reads.
+        """
+        from classroom.app.snapshots import save_snapshot
+
+        rotated = self.path + ROTATED
+        with self._compacting:
+            with self._lock:
+                self._sync()
+                self._file.close()
+                if os.path.exists(rotated):
+                    # A previous compact did not finish, keep its records too.
+                    with open(self.path, 'rb') as stream, open(rotated, 'ab') as old:
+                        old.write(stream.read())
+                        old.flush()
+                        os.fsync(old.fileno())
+                    os.remove(self.path)
+                else:
+                    os.replace(self.path, rotated)
+                self._file = open(self.path, 'ab')
+            temporary = snapshot_path + '.tmp'
+            with open(temporary, 'wb') as stream:
+                save_snapshot(stream, departments, teachers, students, quizzes)
+                stream.flush()
+                os.fsync(stream.fileno())
+            os.replace(temporary, snapshot_path)
+            os.remove(rotated)
+
+
+def read_answer_log(stream: BinaryIO) -> Iterator[Record]:
+    """Yield the records of a log, until its end or a cut or corrupt record."""
+    for _, record in _read_records(stream.read()):
+        yield record
+
+
+def _read_records(data: bytes) -> Iterator[Tuple[int, Record]]:
+    """Yield every valid record, with the position where it ends."""
+    position = 0
+    while position + FRAME.size <= len(data):
+        length, checksum = FRAME.unpack_from(data, position)
+        start = position + FRAME.size
+        body = data[start:start + length]
+        if len(body) != length or zlib.crc32(body) != checksum:
+            break
+        kind, first, semester, student, quiz, count = RECORD.unpack_from(body)
+        offset = RECORD.size
+        strings = []
+        for size in (semester, student, quiz):
+            strings.append(body[offset:offset + size].decode('utf-8'))
+            offset += size
+        position = start + length
+        answers = body[offset:offset + count]
+        yield position, (kind, first, strings[0], strings[1], strings[2], answers)
+
+
+def replay_answer_log(
+    path: str, students: Mapping[str, 'Student'], quizzes: Mapping[str, 'Quiz']
+) -> int:
+    """Apply the assignments and answers of a log to the students.
+
+    Answers already in the submissions, for instance because they were in a
+    snapshot, are not applied twice. A cut record at the end of the log is
+    removed from the file, so new records are not written after it. The log
+    left by a compact that did not finish is applied first.
+
+    Return
+    ------
+    applied : int
+        Number of records applied.
+    """
+    applied = 0
+    for log_path in (path + ROTATED, path):
+        if os.path.exists(log_path):
+            applied += _replay(log_path, students, quizzes)
+    return applied
+
+
+def _replay(path: str, students: Mapping[str, 'Student'], quizzes: Mapping[str, 'Quiz']) -> int:
+    applied = 0
+    end = 0
+    with open(path, 'rb') as stream:
+        data = stream.read()
+    for end, record in _read_records(data):
+        kind, first, semester_id, student_id, quiz_id, answers = record
+        student = students.get(student_id)
+        if student is None:
+            continue
+        if kind == ASSIGN:
+            quiz = quizzes.get(quiz_id)
+            if quiz is not None:
+                with semester_clock(FixedSemesterClock(semester_id)):
+                    student.subscribe_to_quiz(quiz)
+                applied += 1
+            continue
+        submission = student.quizzes.get(semester_id, {}).get(quiz_id)
+        if submission is None:
+            continue
+        given = submission.answer_count - first
+        if 0 <= given < len(answers):
+            submission.answer_next_questions(answers[given:])
+            applied += 1
+    if end < len(data):
+        with open(path, 'r+b') as stream:
+            stream.truncate(end)
+    return applied
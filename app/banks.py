@@ -0,0 +1,213 @@
+"""Define a compact storage for large banks of questions.
+
+A QuestionBank keeps every question in columns instead of one Question object
+per question: the correct options are an array of bytes and the texts are
+indexes into a table where every distinct string is stored once.
+
+Quizzes are built from a bank with BankQuestion objects, which are views over
+a row of the bank, so the rest of the code uses them as any other question.
+
+ASSUMPTIONS:
+    As in quizzes, there are always 4 choices in the questions, and 1 correct
+    answer.
+    Questions are never removed from a bank.
+"""
+from array import array
+from collections.abc import Sequence as SequenceABC
+from typing import Dict, Iterable, Iterator, List, Sequence, TYPE_CHECKING
+
+from classroom.app.exceptions import AnswerPositionOverflow
+from classroom.app.quizzes import BaseQuestion, Quiz
+if TYPE_CHECKING: # pragma: no cover
+    from classroom.app.entities import Teacher
+
+CHOICES = 4
+
+
+class QuestionBank:
+    """Columnar storage of questions.
+
+    Atributes
+    --------
+    texts : [str]
+        String table, every distinct text of the bank is stored once.
+    question_texts : array('l')
+        Position in the string table of the text of each question.
+    answer_texts : array('l')
+        Position in the string table of the possible answers, 4 per question.
+    correct_answers : array('b')
+        Which of the answers (1 to 4) is the correct one, for each question.
+    """
+    __slots__ = ('texts', '_text_ids', 'question_texts', 'answer_texts', 'correct_answers')
+
+    def __init__(self) -> None:
+        self.texts: List[str] = ['']
+        self._text_ids: Dict[str, int] = {'': 0}
+        self.question_texts = array('l')
+        self.answer_texts = array('l')
+        self.correct_answers = array('b')
+
+    def __len__(self) -> int:
+        return len(self.correct_answers)
+
+    def _intern(self, text: str) -> int:
+        """Return the position of text in the string table, adding it if new."""
+        text_id = self._text_ids.get(text)
+        if text_id is None:
+            text_id = len(self.texts)
+            self.texts.append(text)
+            self._text_ids[text] = text_id
+        return text_id
+
+    def add_question(
+        self, text: str, possible_answers: Sequence[str] = (), correct_answer: int = 1
+    ) -> int:
+        """Add a question to the bank.
+
+        Parameters
+        ----------
+        text : str
+            question
+        possible_answers : [str]
+            Up to 4 possible answers, in order.
+        correct_answer : int
+            Which of the answers is the correct one (1 to 4).
+
+        Raises
+        ------
+        AnswerPositionOverflow
+            If there are more than 4 answers or the correct one is not 1 to 4.
+
+        Return
+        ------
+        index : int
+            Position of the question in the bank.
+        """
+        if len(possible_answers) > CHOICES or not (0 < correct_answer <= CHOICES):
+            raise AnswerPositionOverflow("Position must be between 1 and 4")
+        self.question_texts.append(self._intern(text))
+        answers = list(possible_answers) + [''] * (CHOICES - len(possible_answers))
+        self.answer_texts.extend(self._intern(answer) for answer in answers)
+        self.correct_answers.append(correct_answer)
+        return len(self.correct_answers) - 1
+
+    def question(self, index: int) -> 'BankQuestion':
+        """Return a Question that reads and writes the row index of the bank."""
+        if not (0 <= index < len(self)):
+            raise IndexError('Question {} is not in the bank'.format(index))
+        return BankQuestion(self, index)
+
+    def create_quiz(
+        self, quiz_id: str, teacher: 'Teacher', name: str, indexes: Iterable[int]
+    ) -> Quiz:
+        """Create a quiz of the teacher with the questions of the bank in the given positions.
+
+        The quiz is added to the teacher, as Teacher.create_quiz does.
+        """
+        quiz = Quiz(quiz_id, teacher, name)
+        for index in indexes:
+            quiz.add_question(self.question(index))
+        teacher.add_quiz(quiz)
+        return quiz
+
+
+class BankQuestion(BaseQuestion):
+    """Question stored in a QuestionBank.
+
+    It has no text or answers of its own, they are read from the bank every
+    time, so the same question can be in many quizzes without being copied.
+
+    Atributes
+    --------
+    bank : QuestionBank
+        Bank where the question is stored.
+    index : int
+        Position of the question in the bank.
+    """
+    __slots__ = ('bank', 'index')
+
+    def __init__(self, bank: QuestionBank, index: int) -> None:
+        self.bank = bank
+        self.index = index
+
+    @property # type: ignore
+    def text(self) -> str: # type: ignore
+        """Question."""
+        return self.bank.texts[self.bank.question_texts[self.index]]
+
+    @property # type: ignore
+    def _correct_answer(self) -> int: # type: ignore
+        return self.bank.correct_answers[self.index]
+
+    @property # type: ignore
+    def possible_answers(self) -> 'BankAnswers': # type: ignore
+        """Possible answers, changing them changes the bank."""
+        return BankAnswers(self.bank, self.index)
+
+    def add_possible_answer(self, answer: str, position: int, is_correct: bool) -> bool:
+        """Add a possible answer in a position (1, 2, 3, 4).
+
+        As in Question, the last answer added is the correct one.
+
+        Raises
+        ------
+        AnswerPositionOverflow
+        """
+        if not (0 < position <= CHOICES):
+            raise AnswerPositionOverflow("Position must be between 1 and 4")
+        self.bank.answer_texts[self.index * CHOICES + position - 1] = self.bank._intern(answer)
+        self.bank.correct_answers[self.index] = position
+        return True
+
+
+class BankAnswers(SequenceABC):
+    """The 4 possible answers of a question of a QuestionBank.
+
+    A view over the bank, as BankQuestion: answers are read from the bank,
+    and setting one stores it in the bank, as setting an item of the
+    possible_answers of a Question. It is compared equal to lists with the
+    same answers.
+
+    Atributes
+    --------
+    bank : QuestionBank
+        Bank where the question is stored.
+    row : int
+        Position of the question in the bank.
+    """
+    __slots__ = ('bank', 'row')
+
+    def __init__(self, bank: QuestionBank, row: int) -> None:
+        self.bank = bank
+        self.row = row
+
+    def __len__(self) -> int:
+        return CHOICES
+
+    def _position(self, i: int) -> int:
+        if i < 0:
+            i += CHOICES
+        if not (0 <= i < CHOICES):
+            raise IndexError('Answer {} is not in the question'.format(i))
+        return self.row * CHOICES + i
+
+    def __getitem__(self, i): # type: ignore
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(CHOICES))]
+        return self.bank.texts[self.bank.answer_texts[self._position(i)]]
+
+    def __setitem__(self, i: int, answer: str) -> None:
+        self.bank.answer_texts[self._position(i)] = self.bank._intern(answer)
+
+    def __iter__(self) -> Iterator[str]:
+        start = self.row * CHOICES
+        texts = self.bank.texts
+        return iter([texts[i] for i in self.bank.answer_texts[start:start + CHOICES]])
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (BankAnswers, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
@@ -0,0 +1,152 @@
+"""Use the classroom from many threads.
+
+The classes of the classroom are not thread safe: answering a quiz or
+subscribing to one reads and then changes the state of a student. A
+ThreadSafeClassroom takes a lock before every change. Locks are sharded by
+student id, so two threads only wait for each other when their students
+fall in the same shard, and never for the whole school.
+
+Adding a question to a quiz moves the answers of all its submissions, so it
+takes every student lock, always in the same order, and no answer is being
+written meanwhile. It is rare, answering is not.
+
+Classroom has the same operations without locks, for code that is not
+threaded, like the asyncio service.
+
+ASSUMPTIONS:
+    Every change to students goes through the ThreadSafeClassroom.
+    What is shared by students (quizzes, running courses, gradebooks) is only
+    changed with operations that are atomic in python, or under their own
+    locks.
+"""
+import contextlib
+import threading
+from typing import (
+    ContextManager, Dict, Iterable, List, Optional, Sequence, Tuple, Union, TYPE_CHECKING,
+)
+
+if TYPE_CHECKING: # pragma: no cover
+    from classroom.app.courses import CourseRunning
+    from classroom.app.entities import Student
+    from classroom.app.quizzes import BaseQuestion, Quiz
+
+STUDENT_NOT_FOUND = "Student not found"
+
+
+class ShardedLocks:
+    """A fixed number of locks, each key always gets the same one."""
+    __slots__ = ('_locks',)
+
+    def __init__(self, shards: int = 64) -> None:
+        self._locks = [threading.Lock() for _ in range(shards)]
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    def lock_for(self, key: str) -> threading.Lock:
+        return self._locks[hash(key) % len(self._locks)]
+
+    def all(self) -> List[threading.Lock]:
+        """Return every lock, always in the same order."""
+        return list(self._locks)
+
+
+class Classroom:
+    """Operations over the students of a school, by student id.
+
+    Atributes
+    --------
+    students : {'<student_id>': Student}
+        Students served.
+    """
+
+    def __init__(self, students: Iterable['Student'] = ()) -> None:
+        self.students: Dict[str, 'Student'] = {s.student_id: s for s in students}
+
+    def add_student(self, student: 'Student') -> None:
+        """Serve a new student."""
+        self.students[student.student_id] = student
+
+    def _lock_for(self, student_id: str) -> ContextManager:
+        """Return what is held while changing a student."""
+        return contextlib.nullcontext()
+
+    def answer_quiz(self, student_id: str, quiz_id: str, answer: int) -> str:
+        """Answer the next question of a quiz, as Student.answer_quiz."""
+        student = self.students.get(student_id)
+        if student is None:
+            return STUDENT_NOT_FOUND
+        with self._lock_for(student_id):
+            return student.answer_quiz(quiz_id, answer)
+
+    def answer_quiz_batch(
+        self, student_id: str, quiz_id: str, answers: Sequence[int]
+    ) -> Tuple[str, int]:
+        """Answer many questions of a quiz, as Student.answer_quiz_batch."""
+        student = self.students.get(student_id)
+        if student is None:
+            return STUDENT_NOT_FOUND, 0
+        with self._lock_for(student_id):
+            return student.answer_quiz_batch(quiz_id, answers)
+
+    def assign_quiz(self, student_id: str, quiz: 'Quiz') -> Optional[str]:
+        """Assign a quiz to a student. Return an error message, if any."""
+        student = self.students.get(student_id)
+        if student is None:
+            return STUDENT_NOT_FOUND
+        with self._lock_for(student_id):
+            student.subscribe_to_quiz(quiz)
+        return None
+
+    def enrol(self, student_id: str, course_running: 'CourseRunning') -> Optional[str]:
+        """Enrol a student in a running course. Return an error message, if any."""
+        student = self.students.get(student_id)
+        if student is None:
+            return STUDENT_NOT_FOUND
+        with self._lock_for(student_id):
+            student.enrol(course_running)
+        return None
+
+    def get_score_for_semester(
+        self, student_id: str, semester_id: Optional[str] = None
+    ) -> Union[str, float]:
+        """Score of a student, as Student.get_score_for_semester."""
+        student = self.students.get(student_id)
+        if student is None:
+            return STUDENT_NOT_FOUND
+        with self._lock_for(student_id):
+            return student.get_score_for_semester(semester_id) # type: ignore
+
+    def add_question(self, quiz: 'Quiz', question: 'BaseQuestion') -> None:
+        """Add a question to a quiz."""
+        quiz.add_question(question)
+
+
+class ThreadSafeClassroom(Classroom):
+    """Thread safe operations over the students of a school.
+
+    Atributes
+    --------
+    students : {'<student_id>': Student}
+        Students served.
+    student_locks : ShardedLocks
+        Locks taken to change a student.
+    quiz_locks : ShardedLocks
+        Locks taken to change a quiz definition.
+    """
+
+    def __init__(self, students: Iterable['Student'] = (), shards: int = 64) -> None:
+        super().__init__(students)
+        self.student_locks = ShardedLocks(shards)
+        self.quiz_locks = ShardedLocks(shards)
+
+    def _lock_for(self, student_id: str) -> ContextManager:
+        return self.student_locks.lock_for(student_id)
+
+    def add_question(self, quiz: 'Quiz', question: 'BaseQuestion') -> None:
+        """Add a question to a quiz, while none of its submissions is answered."""
+        with self.quiz_locks.lock_for(quiz.quiz_id), contextlib.ExitStack() as stack:
+            # Every student lock, students may be assigned the quiz meanwhile.
+            for lock in self.student_locks.all():
+                stack.enter_context(lock)
+            quiz.add_question(question)
@@ -11,30 +11,72 @@ Each time they have a list of enrolled students
 ASSUMPTIONS:
     A course can be created through a department.
     A course can be running only once a year.
+    Running courses created and assigned through a department are indexed in
+    the registry given, by department and code, and by teacher. Codes are
+    unique in a department, two departments can run courses with the same
+    code.
 
     There are no functions to mark course as finished, and more functionalities
     Checks, and how information is related are not comprehensive comparing with
     reality, and much more things can be done.
     I consider them out of scope of the exercise.
 """
-from typing import Dict, List, TYPE_CHECKING
+import sys
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 if TYPE_CHECKING: # pragma: no cover
     from classroom.app.entities import Student, Teacher
+    from classroom.app.leaderboards import Leaderboard
     CoursesInfo = Dict[str, Course]
 
 class CourseRunning:
+    __slots__ = (
+        'course', 'year', 'teacher', 'running_course_code', 'students', '_student_ids',
+        '_leaderboards',
+    )
+
     def __init__(self, course: 'Course', year: str, teacher: 'Teacher'=None) -> None:
         self.course = course
         self.year = year
         self.teacher = teacher
-        rcc = "{}_{}".format(course.course_code, year)
+        # Interned, the code is repeated in the classes of every student.
+        rcc = sys.intern("{}_{}".format(course.course_code, year))
         self.running_course_code = rcc
         self.students: 'List[Student]' = []
+        # Index of the students by id, to know in O(1) if one is enroled.
+        self._student_ids: 'Dict[str, Student]' = {}
+        # Will have the following shape : {'<semester_id>': Leaderboard}
+        self._leaderboards: 'Dict[str, Leaderboard]' = {}
 
     def add_student(self, student: 'Student') -> None:
-        """Add a student to the students that assist to this specific course"""
+        """Add a student to the students that assist to this specific course.
+
+        Adding a student that is already in the course does nothing.
+        """
+        if student.student_id in self._student_ids:
+            return
+        self._student_ids[student.student_id] = student
         self.students.append(student)
 
+    def has_student(self, student_id: str) -> bool:
+        """Is the student with the given id assisting to this course?."""
+        return student_id in self._student_ids
+
+    def get_leaderboard(self, semester_id: Optional[str] = None) -> 'Leaderboard':
+        """Return the ranking of the students of this course in a semester.
+
+        It is created the first time it is asked for, and kept up to date
+        from then on. The current semester is used if none is given.
+        """
+        from classroom.app.leaderboards import Leaderboard
+        from classroom.app.utils import get_semester_id
+
+        if not semester_id:
+            semester_id = get_semester_id()
+        leaderboard = self._leaderboards.get(semester_id)
+        if leaderboard is None:
+            leaderboard = self._leaderboards[semester_id] = Leaderboard(self, semester_id)
+        return leaderboard
+
     def assign_teacher(self, teacher: 'Teacher') -> None:
         """Assign a teacher to this specific course."""
         self.teacher = teacher
@@ -49,9 +91,11 @@ class CourseRunning:
 
 
 class Course:
+    __slots__ = ('description', 'course_code', 'department', 'runnings')
+
     def __init__(self, description: str, course_code: str, department: 'Department') -> None:
         self.description = description
-        self.course_code = course_code
+        self.course_code = sys.intern(course_code)
         self.department = department
         # self.department.add_course(self)
         self.runnings: List[CourseRunning] = []
@@ -78,10 +122,64 @@ class Course:
         return self.runnings
 
 
+# Identifies a running course in a registry: (department_code, running_course_code).
+RunningKey = Tuple[str, str]
+
+
+class CourseRegistry:
+    """Index of running courses, by department and code, and by the teacher
+    teaching them.
+
+    Atributes
+    --------
+    _by_code : {('<department_code>', '<running_course_code>'): CourseRunning}
+    _by_teacher : {'<teacher_id>': {('<department_code>', '<running_course_code>'): CourseRunning}}
+    _teacher_ids : {('<department_code>', '<running_course_code>'): '<teacher_id>'}
+    """
+    __slots__ = ('_by_code', '_by_teacher', '_teacher_ids')
+
+    def __init__(self) -> None:
+        self._by_code: Dict[RunningKey, CourseRunning] = {}
+        self._by_teacher: Dict[str, Dict[RunningKey, CourseRunning]] = {}
+        self._teacher_ids: Dict[RunningKey, str] = {}
+
+    @staticmethod
+    def key(running_course: CourseRunning) -> RunningKey:
+        """Return the key of a running course in the registry."""
+        return (running_course.course.department.department_code,
+                running_course.running_course_code)
+
+    def add(self, running_course: CourseRunning) -> None:
+        """Index a running course, and its teacher if it has one."""
+        self._by_code[self.key(running_course)] = running_course
+        if running_course.teacher is not None:
+            self.assign_teacher(running_course, running_course.teacher)
+
+    def assign_teacher(self, running_course: CourseRunning, teacher: 'Teacher') -> None:
+        """Index a running course under its new teacher."""
+        key = self.key(running_course)
+        self._by_code[key] = running_course
+        previous = self._teacher_ids.get(key)
+        if previous is not None:
+            self._by_teacher[previous].pop(key, None)
+        self._teacher_ids[key] = teacher.teacher_id
+        self._by_teacher.setdefault(teacher.teacher_id, {})[key] = running_course
+
+    def get(self, department_code: str, running_course_code: str) -> Optional[CourseRunning]:
+        """Return the running course of a department with the given code, if any."""
+        return self._by_code.get((department_code, running_course_code))
+
+    def get_teacher_runnings(self, teacher_id: str) -> List[CourseRunning]:
+        """Return the running courses taught by a teacher."""
+        return list(self._by_teacher.get(teacher_id, {}).values())
+
+
 class Department:
+    __slots__ = ('name', 'department_code', 'courses')
+
     def __init__(self, name: str, department_code: str) -> None:
         self.name = name
-        self.department_code = department_code
+        self.department_code = sys.intern(department_code)
         self.courses: CoursesInfo = {} # type: ignore
 
     def add_course(self, description: str, course_code: str) -> Course:
@@ -103,14 +201,27 @@ class Department:
         running_course.add_student(student)
 
     @staticmethod
-    def assign_teacher_to_course(teacher: 'Teacher', running_course: CourseRunning) -> None:
+    def assign_teacher_to_course(
+        teacher: 'Teacher',
+        running_course: CourseRunning,
+        registry: Optional[CourseRegistry] = None,
+    ) -> None:
+        """Make a teacher teach a running course, indexing it in registry if given."""
         running_course.assign_teacher(teacher)
         teacher.add_course_to_teach(running_course.running_course_code)
+        if registry is not None:
+            registry.assign_teacher(running_course, teacher)
 
     @staticmethod
-    def mark_course_as_running(course: Course, year: str) -> CourseRunning:
+    def mark_course_as_running(
+        course: Course, year: str, registry: Optional[CourseRegistry] = None
+    ) -> CourseRunning:
+        """Run a course in a year, indexing it in registry if given."""
         # add_running returns a CourseRunning
-        return course.add_running(year)
+        running_course = course.add_running(year)
+        if registry is not None:
+            registry.add(running_course)
+        return running_course
 
 
 
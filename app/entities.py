@@ -16,23 +16,34 @@ ASSUMPTIONS:
     I assumed that the grade of the students is the sum of the grades of the
     quizzes they have completed.
 """
+import itertools
+import sys
+
+from classroom.app.courses import CourseRegistry, CourseRunning, RunningKey
 from classroom.app.exceptions import QuizFinishedException, SemesterNotFound
+from classroom.app.gradebooks import Gradebook
 from classroom.app.utils import get_semester_id
-from typing import List, Dict, NoReturn, Union, TYPE_CHECKING
-from classroom.app.quizzes import Quiz
+from typing import (
+    Dict, Iterable, List, Mapping, NoReturn, Optional, Sequence, Set, Tuple, Union,
+    TYPE_CHECKING,
+)
+from classroom.app.quizzes import Quiz, Submission
 if TYPE_CHECKING: # pragma: no cover
     from classroom.app.quizzes import Quiz
-    from classroom.app.courses import CourseRunning
-    QuizInfo = Dict[str, Quiz]
+    QuizInfo = Dict[str, Submission]
     Quizzes = Dict[str, QuizInfo]
     Classes = List[str]
 
+# Gives every student a different number.
+_student_numbers = itertools.count()
+
 
 class Person(object):
     """
     Returns a ```Person``` object with given name.
 
     """
+    __slots__ = ('first_name', 'last_name')
 
     def __init__(self, first_name: str, last_name: str) -> None:
         self.first_name = first_name
@@ -57,9 +68,13 @@ class Student(Person):
         unique identifier of a student
     classes : list[str]
         list of running courses codes that a student is enroled in.
-    quizzes : list[Quiz]
-        list of quizzes this student has answered to.
+    quizzes : dict
+        submissions of the quizzes assigned to this student, by semester.
+    number : int
+        Different for every student, to find their answers in the answer
+        tables of the quizzes.
     """
+    __slots__ = ('student_id', 'classes', '_class_codes', 'quizzes', 'number')
 
     def __init__(
         self, first_name: str, last_name: str, student_id: str, *args, **kwargs
@@ -75,30 +90,56 @@ class Student(Person):
             unique identifier of a student
         """
         Person.__init__(self, first_name, last_name)
-        self.student_id = student_id
+        self.student_id = sys.intern(student_id)
         self.classes: 'Classes' = []
-        # Will have the following shape : {'<semester_id>':{'<quiz_id>': Quiz}}
+        # Same codes as classes, to know in O(1) if the student is enroled.
+        self._class_codes: Set[str] = set()
+        # Will have the following shape :
+        # {'<semester_id>':{'<quiz_id>': Submission}}
         self.quizzes: 'Quizzes' = {}
+        self.number = next(_student_numbers)
 
     def get_enroled_courses(self) -> 'Classes':
         """Get courses this student is enroled to."""
         return self.classes
 
     def enrol(self, course_running: 'CourseRunning') -> None:
-        """Add course to courses that the student is enroled in."""
-        self.classes.append(course_running.running_course_code)
+        """Add course to courses that the student is enroled in.
+
+        Enroling twice to the same course does nothing.
+        """
+        code = course_running.running_course_code
+        if code not in self._class_codes:
+            self._class_codes.add(code)
+            self.classes.append(code)
         course_running.add_student(self)
 
+    def is_enroled(self, running_course_code: str) -> bool:
+        """Is this student enroled in the given running course?."""
+        return running_course_code in self._class_codes
+
     def subscribe_to_quiz(self, quiz: 'Quiz') -> None:
-        """Given a quiz, subscribe this user to it."""
-        # quiz.add_student(self)
+        """Given a quiz, subscribe this user to it.
+
+        The quiz is shared with other students, the answers of this student
+        are kept in a Submission of its own.
+        """
         semester = get_semester_id()
         # If semester's key is not created, do it, and add quiz.
-        self.quizzes.setdefault(semester, {})[quiz.quiz_id] = quiz
+        semester_quizzes = self.quizzes.setdefault(semester, {})
+        current = semester_quizzes.get(quiz.quiz_id)
+        if current is not None:
+            if current.quiz is quiz:
+                # Already subscribed, keep the answers given.
+                return
+            current.quiz.remove_submission(current)
+        submission = Submission(quiz, self, semester)
+        semester_quizzes[quiz.quiz_id] = submission
+        quiz.add_submission(submission)
 
     # def _get_semester_quizzes(self, semester_id: str) -> Union[QuizInfo, NoReturn]:
     def _get_semester_quizzes(self, semester_id: str) -> 'QuizInfo':
-        """Given a semester id, return an object:  {quiz_id : Quiz}.
+        """Given a semester id, return an object:  {quiz_id : Submission}.
 
         Raises
         ------
@@ -107,7 +148,7 @@ class Student(Person):
 
         Return
         ------
-        Quizzes Info: {'<quiz_id>' : Quiz, ... }
+        Quizzes Info: {'<quiz_id>' : Submission, ... }
             Information about quizzes belonging to the semester.
         """
         current_semester_quiz_info = self.quizzes.get(semester_id, None)
@@ -121,15 +162,60 @@ class Student(Person):
             current_quizzes = self._get_semester_quizzes(get_semester_id())
         except SemesterNotFound:
             return "You are not subscribed to this quiz in current semester"
-        quiz = current_quizzes.get(quiz_id) # type: ignore
-        if not quiz:
+        submission = current_quizzes.get(quiz_id) # type: ignore
+        if not submission:
             return "Quiz not defined"
         try:
-            quiz.answer_next_question(answer)
+            submission.answer_next_question(answer)
         except QuizFinishedException as err:
             return "Quiz already finished"
         return "Ok"
 
+    def answer_quiz_batch(self, quiz_id: str, answers: Sequence[int]) -> Tuple[str, int]:
+        """Answer many questions of a quiz for this semester at once.
+
+        Return
+        ------
+        (message, applied) : (str, int)
+            message is the one answer_quiz would give, it is "Quiz already
+            finished" if the quiz got finished before using all the answers.
+            applied is how many answers were applied.
+        """
+        return self.answer_quizzes_batch({quiz_id: answers})[quiz_id]
+
+    def answer_quizzes_batch(
+        self, quiz_answers: Mapping[str, Sequence[int]]
+    ) -> Dict[str, Tuple[str, int]]:
+        """Answer many questions of many quizzes for this semester at once.
+
+        Parameters
+        ----------
+        quiz_answers : {'<quiz_id>': [int]}
+            Answers for each quiz, in order.
+
+        Return
+        ------
+        results : {'<quiz_id>': (message, applied)}
+            Result of each quiz, as in answer_quiz_batch.
+        """
+        try:
+            current_quizzes = self._get_semester_quizzes(get_semester_id())
+        except SemesterNotFound:
+            message = "You are not subscribed to this quiz in current semester"
+            return {quiz_id: (message, 0) for quiz_id in quiz_answers}
+        results = {}
+        for quiz_id, answers in quiz_answers.items():
+            submission = current_quizzes.get(quiz_id)
+            if not submission:
+                results[quiz_id] = ("Quiz not defined", 0)
+                continue
+            applied = submission.answer_next_questions(answers)
+            if applied < len(answers):
+                results[quiz_id] = ("Quiz already finished", applied)
+            else:
+                results[quiz_id] = ("Ok", applied)
+        return results
+
     def get_score_for_semester(self, semester_id: str = None) ->  Union[str, float]:
         """Given a semester_id, get score for that semester.
 
@@ -169,7 +255,10 @@ class Teacher(Person):
         unique identifier of a teacher
     classes : list[str]
         list of running courses codes that the teacher is teaching in.
+    quizzes : list[Quiz]
+        quizzes created by the teacher.
     """
+    __slots__ = ('teacher_id', 'classes', '_class_codes', 'quizzes', '_gradebooks')
 
     def __init__(self, first_name: str, last_name: str, teacher_id: str) -> None:
         """
@@ -183,19 +272,79 @@ class Teacher(Person):
             unique identifier of a teacher
         """
         Person.__init__(self, first_name, last_name)
-        self.teacher_id = teacher_id
+        self.teacher_id = sys.intern(teacher_id)
         self.classes: 'Classes' = []
+        self._class_codes: Set[str] = set()
+        self.quizzes: List[Quiz] = []
+        # Will have the following shape : {'<semester_id>': Gradebook}
+        self._gradebooks: Dict[str, Gradebook] = {}
 
     def add_course_to_teach(self, course_code):
-        """Add running course to courses that the teacher is teaching in."""
-        self.classes.append(course_code)
+        """Add running course to courses that the teacher is teaching in.
+
+        Adding a course the teacher already teaches does nothing.
+        """
+        if course_code not in self._class_codes:
+            course_code = sys.intern(course_code)
+            self._class_codes.add(course_code)
+            self.classes.append(course_code)
+
+    def is_teaching(self, running_course_code: str) -> bool:
+        """Is this teacher teaching the given running course?."""
+        return running_course_code in self._class_codes
 
     def get_teaching_courses(self):
         """Return a list of running courses the teacher is teaching in."""
         return self.classes
 
     def create_quiz(self, qid: str, name: str) -> 'Quiz':
-        return Quiz(qid, self, name)
+        quiz = Quiz(qid, self, name)
+        self.add_quiz(quiz)
+        return quiz
+
+    def add_quiz(self, quiz: 'Quiz') -> None:
+        """Add a quiz made by this teacher, so it is graded in the gradebooks."""
+        self.quizzes.append(quiz)
+        for gradebook in self._gradebooks.values():
+            gradebook.track(quiz)
+
+    def get_gradebook(self, semester_id: Optional[str] = None) -> Gradebook:
+        """Return the gradebook of the quizzes of this teacher for a semester.
+
+        It is created the first time it is asked for, and kept up to date
+        from then on.
+        """
+        if not semester_id:
+            semester_id = get_semester_id()
+        gradebook = self._gradebooks.get(semester_id)
+        if gradebook is None:
+            gradebook = Gradebook(self, semester_id)
+            for quiz in self.quizzes:
+                gradebook.track(quiz)
+            self._gradebooks[semester_id] = gradebook
+        return gradebook
+
+    def get_semester_report(
+        self, registry: CourseRegistry, semester_id: Optional[str] = None
+    ) -> Dict[RunningKey, Dict[str, float]]:
+        """Return the total of every student in every class of this teacher.
+
+        The classes are the running courses of the teacher in registry.
+        Totals are read from the gradebook of the semester, so the report
+        only goes through the students of the teacher's classes.
+
+        Return
+        ------
+        report : {('<department_code>', '<running_course_code>'): {'<student_id>': float}}
+        """
+        gradebook = self.get_gradebook(semester_id)
+        return {
+            registry.key(running): {
+                student.student_id: gradebook.get_total(student.student_id)
+                for student in running.get_students()
+            }
+            for running in registry.get_teacher_runnings(self.teacher_id)
+        }
 
     @staticmethod
     def assign_quiz_to_student(student: Student, quiz: 'Quiz') -> None:
@@ -204,3 +353,21 @@ class Teacher(Person):
     @staticmethod
     def calc_student_grade_for_semester(student: Student, semester_id: str = None) -> Union[str,float]:
         return student.get_score_for_semester(semester_id)
+
+    @staticmethod
+    def calc_grades_for_semester(
+        students: Union[CourseRunning, Iterable[Student]], semester_id: Optional[str] = None
+    ) -> Dict[str, float]:
+        """Compute the grade of many students, or of a running course, at once.
+
+        Return
+        ------
+        grades : {'<student_id>': float}
+            Score of every student for the semester. It is 0 for students
+            without quizzes in the semester.
+        """
+        from classroom.app.grading import grade_students
+
+        if isinstance(students, CourseRunning):
+            students = students.get_students()
+        return grade_students(students, semester_id)
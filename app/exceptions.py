@@ -12,3 +12,11 @@ class AnswerPositionOverflow(QuizException):
 
 class SemesterNotFound(QuizException):
     pass
+
+
+class RosterImportException(Exception):
+    pass
+
+
+class SnapshotException(Exception):
+    pass
@@ -0,0 +1,90 @@
+"""Export the grades of a semester, one row per student and quiz.
+
+iter_grade_rows walks departments, courses, running courses and their students
+and yields a row as soon as its score is known, so an export of any size only
+keeps one row in memory. Filters are checked at the level they belong to: a
+department or course left out is never walked, and neither are the running
+courses of other years.
+
+write_grades_csv and write_grades_jsonl write the rows to a text stream as
+they are produced.
+
+ASSUMPTIONS:
+    A quiz is graded in a running course when it was made by the teacher of
+    the running course. Running courses without teacher have no grades.
+    The semester id is '<year>_<semester>', and only running courses of that
+    year are exported.
+    A student in two running courses of the same teacher gets the quizzes of
+    that teacher in both.
+"""
+import csv
+import json
+from typing import Collection, Iterable, Iterator, NamedTuple, Optional, TextIO, TYPE_CHECKING
+
+from classroom.app.utils import get_semester_id
+if TYPE_CHECKING: # pragma: no cover
+    from classroom.app.courses import CourseRunning, Department
+
+
+class GradeRow(NamedTuple):
+    """Score of a student in a quiz of a running course."""
+    student_id: str
+    running_course_code: str
+    quiz_id: str
+    score: float
+
+
+def iter_grade_rows(
+    departments: Iterable['Department'],
+    semester_id: Optional[str] = None,
+    department_codes: Optional[Collection[str]] = None,
+    course_codes: Optional[Collection[str]] = None,
+) -> Iterator[GradeRow]:
+    """Yield the grades of a semester, filtered by department and course codes.
+
+    Codes not given mean every department or course.
+    """
+    if not semester_id:
+        semester_id = get_semester_id()
+    year = semester_id.split('_')[0]
+    for department in departments:
+        if department_codes is not None and department.department_code not in department_codes:
+            continue
+        for course in department.get_courses().values():
+            if course_codes is not None and course.course_code not in course_codes:
+                continue
+            for running in course.get_runnings():
+                if str(running.year) == year:
+                    yield from _running_grade_rows(running, semester_id)
+
+
+def _running_grade_rows(running: 'CourseRunning', semester_id: str) -> Iterator[GradeRow]:
+    teacher = running.teacher
+    if teacher is None:
+        return
+    code = running.running_course_code
+    for student in running.get_students():
+        for submission in student.quizzes.get(semester_id, {}).values():
+            if submission.quiz.teacher is teacher:
+                yield GradeRow(student.student_id, code, submission.quiz_id, submission.get_score())
+
+
+def write_grades_csv(stream: TextIO, rows: Iterable[GradeRow]) -> int:
+    """Write rows as CSV, with a header. Return the number of rows written."""
+    writer = csv.writer(stream)
+    writer.writerow(GradeRow._fields)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_grades_jsonl(stream: TextIO, rows: Iterable[GradeRow]) -> int:
+    """Write rows as JSON Lines, one object per row. Return the number of rows written."""
+    count = 0
+    for row in rows:
+        stream.write(json.dumps(row._asdict()))
+        stream.write('\n')
+        count += 1
+    return count
@@ -0,0 +1,130 @@
+"""Define the gradebook of a teacher for a semester.
+
+A Gradebook keeps the total score of every student that was assigned a quiz
+of the teacher in the semester. It listens to the quizzes, so totals are
+updated as answers arrive and reading them does not compute any score.
+
+Totals of students are changed under a lock of their shard, as students of a
+ThreadSafeClassroom, so threads answering for different students of the same
+teacher seldom wait for each other. Listeners of totals, as leaderboards,
+are called from many threads and take their own locks.
+
+ASSUMPTIONS:
+    As in Student.get_score_for_semester, the total of a student is the sum of
+    the scores of the quizzes, here only the ones made by the teacher.
+    Scores have 2 decimals, so they are kept as integer hundredths and totals
+    do not accumulate rounding errors however many answers arrive.
+"""
+from typing import Callable, Dict, List, TYPE_CHECKING
+
+from classroom.app.concurrency import ShardedLocks
+from classroom.app.quizzes import QuizListener
+if TYPE_CHECKING: # pragma: no cover
+    from classroom.app.entities import Student, Teacher
+    from classroom.app.quizzes import Quiz, Submission
+
+# Called with student, previous total and new total, in hundredths.
+TotalListener = Callable[['Student', int, int], None]
+
+
+def to_hundredths(score: float) -> int:
+    """Return a score with 2 decimals as an integer number of hundredths."""
+    return int(round(score * 100))
+
+
+class Gradebook(QuizListener):
+    """Totals of the students of a teacher for a semester.
+
+    Atributes
+    --------
+    teacher : Teacher
+        Teacher whose quizzes are graded.
+    semester_id : str
+        Semester graded.
+    students : {'<student_id>': Student}
+        Students with a quiz of the teacher in the semester.
+    _scores : {Submission: int}
+        Last known score of every submission, in hundredths.
+    _totals : {'<student_id>': int}
+        Total of every student, in hundredths.
+    _total_listeners : [callable]
+        Called every time the total of a student changes.
+    _locks : ShardedLocks
+        The lock of the shard of a student is taken to change their total,
+        scores of a quiz can change from many threads.
+    """
+
+    def __init__(self, teacher: 'Teacher', semester_id: str) -> None:
+        self.teacher = teacher
+        self.semester_id = semester_id
+        self.students: Dict[str, 'Student'] = {}
+        self._scores: Dict['Submission', int] = {}
+        self._totals: Dict[str, int] = {}
+        self._total_listeners: List[TotalListener] = []
+        self._locks = ShardedLocks()
+
+    def track(self, quiz: 'Quiz') -> None:
+        """Grade the submissions of a quiz, the current ones and the new ones."""
+        quiz.add_listener(self)
+        for submission in list(quiz.submissions.values()):
+            self.on_assign(submission)
+
+    def add_total_listener(self, listener: TotalListener) -> None:
+        """Call listener(student, previous, new) when a total changes."""
+        self._total_listeners.append(listener)
+
+    def get_total(self, student_id: str) -> float:
+        """Return the total of a student, 0 if not graded in this gradebook."""
+        return self._totals.get(student_id, 0) / 100
+
+    def get_total_hundredths(self, student_id: str) -> int:
+        """Return the total of a student, in hundredths."""
+        return self._totals.get(student_id, 0)
+
+    def get_totals(self) -> Dict[str, float]:
+        """Return the total of every student: {'<student_id>': float}."""
+        return {student_id: total / 100 for student_id, total in self._totals.items()}
+
+    def on_assign(self, submission: 'Submission') -> None:
+        if submission.semester_id == self.semester_id:
+            student = submission.student
+            self.students[student.student_id] = student
+            self._set_score(submission)
+
+    def on_unassign(self, submission: 'Submission') -> None:
+        if submission in self._scores:
+            self._set_score(submission, removed=True)
+
+    def on_answer(self, submission: 'Submission', start: int, count: int) -> None:
+        if submission.semester_id == self.semester_id:
+            self._set_score(submission)
+
+    def on_question_added(self, quiz: 'Quiz') -> None:
+        # Every score of the quiz changes, as there are more questions now.
+        # Copied, submissions may be added from other threads meanwhile.
+        for submission in list(quiz.submissions.values()):
+            if submission in self._scores:
+                self._set_score(submission)
+
+    def _set_score(self, submission: 'Submission', removed: bool = False) -> None:
+        """Update the total of the student with the current score of a submission.
+
+        The score is read while holding the lock of the student: read before
+        it, a thread could store a score older than the one another thread
+        stored.
+        """
+        student = submission.student
+        with self._locks.lock_for(student.student_id):
+            score = 0 if removed else to_hundredths(submission.get_score())
+            previous_score = self._scores.get(submission, 0)
+            if removed:
+                self._scores.pop(submission, None)
+            else:
+                self._scores[submission] = score
+            if score == previous_score and student.student_id in self._totals:
+                return
+            previous = self._totals.get(student.student_id, 0)
+            total = previous + score - previous_score
+            self._totals[student.student_id] = total
+            for listener in self._total_listeners:
+                listener(student, previous, total)
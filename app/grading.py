@@ -0,0 +1,410 @@
+"""Grade many students at once.
+
+Instead of asking every submission for its score, the answers of all the
+students are put in one matrix, with a column per question of every quiz of
+the semester, and compared with the answer keys in a few array operations.
+The answers are first copied from the answer tables of the quizzes, which
+is quick, and then put in the matrix from the copies, which can be done in
+another thread, see AnswerCopies.
+
+To use more than one core, grade_students_parallel puts the matrix in shared
+memory, and processes score disjoint slices of students without copying it.
+
+ASSUMPTIONS:
+    Scores are the same that Submission.get_score gives, rounded to 2
+    decimals, and the total of a student is the sum of their quiz scores.
+    The sums are done in a different order, so totals can differ from
+    Student.get_score_for_semester in the last digits of precision.
+    A student with no quizzes in the semester has a total of 0.
+"""
+import os
+from array import array
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional, Set, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from classroom.app.utils import get_semester_id
+if TYPE_CHECKING: # pragma: no cover
+    from classroom.app.entities import Student
+    from classroom.app.quizzes import Quiz, Submission
+
+# Quizzes of a student with none in the semester.
+_NO_QUIZZES: Dict[str, 'Submission'] = {}
+
+# Only the rows of the students are copied from an answer table when it has
+# more than this times as many rows as students.
+SMALL_SHARE = 8
+
+
+class AnswerMatrix:
+    """Answers of many students to the quizzes of one semester.
+
+    Atributes
+    --------
+    student_ids : [str]
+        Id of the student of each row.
+    answers : numpy.ndarray
+        Chosen option of every student (rows) for every question (columns),
+        0 where the question was not answered. Questions of a quiz are in
+        consecutive columns.
+    answer_key : numpy.ndarray
+        Correct option for every column.
+    quiz_starts : numpy.ndarray
+        First column of every quiz.
+    score_tables : numpy.ndarray
+        For every quiz (rows), the score given by each number of correct
+        answers (columns).
+    """
+    __slots__ = ('student_ids', 'answers', 'answer_key', 'quiz_starts', 'score_tables')
+
+    def __init__(
+        self,
+        student_ids: List[str],
+        answers: np.ndarray,
+        answer_key: np.ndarray,
+        quiz_starts: np.ndarray,
+        score_tables: np.ndarray,
+    ) -> None:
+        self.student_ids = student_ids
+        self.answers = answers
+        self.answer_key = answer_key
+        self.quiz_starts = quiz_starts
+        self.score_tables = score_tables
+
+    @classmethod
+    def build(cls, students: Iterable['Student'], semester_id: str) -> 'AnswerMatrix':
+        """Collect the answers of the students for the given semester.
+
+        Same as AnswerCopies.collect followed by AnswerCopies.build, collecting
+        again with every quiz if some quiz was missed.
+        """
+        students = list(students)
+        matrix = AnswerCopies.collect(students, semester_id).build()
+        if matrix is None:
+            matrix = AnswerCopies.collect(students, semester_id, every_quiz=True).build()
+            assert matrix is not None
+        return matrix
+
+    def totals(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Compute the total score of the students in rows start to stop."""
+        return score_totals(
+            self.answers[start:stop], self.answer_key, self.quiz_starts, self.score_tables
+        )
+
+
+class _QuizCopy:
+    """Answers to a quiz copied from its answer table.
+
+    Atributes
+    --------
+    quiz_id : str
+        Id of the quiz.
+    size : int
+        Number of questions of the quiz.
+    key : bytes
+        Correct option of every question.
+    data : bytes
+        Rows of answers copied from the table.
+    columns : int
+        Answers in every row of data.
+    owners : array('q') or None
+        Student number of every row, when the whole table is copied.
+    semesters : array('H')
+        Semester code of every row, when the whole table is copied.
+    code : int
+        Code of the semester graded in the table.
+    rows : [int]
+        Row of the matrix of every row of data, when only the rows of the
+        students are copied.
+    """
+    __slots__ = ('quiz_id', 'size', 'key', 'data', 'columns', 'owners', 'semesters', 'code', 'rows')
+
+    def __init__(self, quiz: 'Quiz', size: int) -> None:
+        self.quiz_id = quiz.quiz_id
+        self.size = size
+        self.key = bytes(question.correct_answer for question in quiz.questions[:size])
+        self.data = b''
+        self.columns = size
+        self.owners: Optional[array] = None
+        self.semesters = array('H')
+        self.code = 0
+        self.rows: List[int] = []
+
+    def answers(self) -> np.ndarray:
+        """Return the rows of answers copied, with at least size columns."""
+        count = len(self.rows) if self.owners is None else len(self.owners)
+        answers = np.frombuffer(self.data, dtype=np.uint8).reshape(count, self.columns)
+        if self.columns < self.size:
+            # Questions were added to the quiz without add_question.
+            answers = np.pad(answers, ((0, 0), (0, self.size - self.columns)))
+        return answers
+
+
+class AnswerCopies:
+    """Answers of many students for one semester, copied from the answer tables.
+
+    Collecting reads the students and the quizzes, but only copies the answer
+    tables, so it is quick and can be done where they are not being changed,
+    as the event loop of ClassroomService. Building the AnswerMatrix from the
+    copies is most of the work, and it reads nothing else, so it can be done
+    in another thread.
+
+    Atributes
+    --------
+    student_ids : [str]
+        Id of every student, in order.
+    numbers : numpy.ndarray
+        Number of every student.
+    quizzes : [_QuizCopy]
+        Copies of the answers to every quiz, in order of quiz id.
+    expected : int
+        Submissions of the students in the semester, 0 when every quiz was
+        copied. When quizzes are taken once per id, some of them may be
+        missing from the copies.
+    """
+    __slots__ = ('student_ids', 'numbers', 'quizzes', 'expected')
+
+    def __init__(
+        self,
+        student_ids: List[str],
+        numbers: np.ndarray,
+        quizzes: List[_QuizCopy],
+        expected: int,
+    ) -> None:
+        self.student_ids = student_ids
+        self.numbers = numbers
+        self.quizzes = quizzes
+        self.expected = expected
+
+    @classmethod
+    def collect(
+        cls, students: Iterable['Student'], semester_id: str, every_quiz: bool = False
+    ) -> 'AnswerCopies':
+        """Copy the answers of the students for the given semester.
+
+        Quiz ids are meant to be unique, so the quiz of every id is taken from
+        the first student that has it, unless every_quiz is given. Then every
+        quiz gets its own columns, even if another quiz has its id, but
+        finding them all goes through every submission.
+
+        The answers of a quiz given to many of the students are copied from
+        its answer table at once. When the students are a few of the rows of
+        the table, only their rows are copied.
+        """
+        students = list(students)
+        assigned = [student.quizzes.get(semester_id, _NO_QUIZZES) for student in students]
+        numbers = np.fromiter(
+            map(attrgetter('number'), students), dtype=np.int64, count=len(students)
+        )
+        quizzes: List['Quiz'] = []
+        if every_quiz:
+            quizzes = list({
+                submission.quiz: None
+                for submissions in assigned for submission in submissions.values()
+            })
+        else:
+            quiz_ids: Set[str] = set().union(*assigned)
+            for submissions in assigned:
+                if not quiz_ids:
+                    break
+                for quiz_id in [quiz_id for quiz_id in quiz_ids if quiz_id in submissions]:
+                    quiz_ids.discard(quiz_id)
+                    quizzes.append(submissions[quiz_id].quiz)
+        quizzes.sort(key=attrgetter('quiz_id'))
+        copies = []
+        for quiz in quizzes:
+            copy = _QuizCopy(quiz, len(quiz.questions))
+            table = quiz.answer_table
+            if len(students) * SMALL_SHARE < len(table):
+                quiz_id = quiz.quiz_id
+                table_rows: List[int] = []
+                for row, submissions in enumerate(assigned):
+                    submission = submissions.get(quiz_id)
+                    if submission is not None and submission.quiz is quiz:
+                        copy.rows.append(row)
+                        table_rows.append(submission.row)
+                copy.data, copy.columns = table.copy_rows(table_rows)
+            else:
+                code = table.semester_codes.get(semester_id)
+                if code is not None:
+                    copy.data, copy.columns, copy.owners, copy.semesters = table.copy()
+                    copy.code = code
+            copies.append(copy)
+        return cls(
+            [student.student_id for student in students],
+            numbers,
+            copies,
+            0 if every_quiz else sum(map(len, assigned)),
+        )
+
+    def build(self) -> Optional[AnswerMatrix]:
+        """Put the answers copied in an AnswerMatrix.
+
+        Return None if some submissions of the students are to quizzes that
+        were not copied, because another quiz has their id. Collect them
+        again with every_quiz then.
+        """
+        sizes = [copy.size for copy in self.quizzes]
+        matrix = np.zeros((len(self.student_ids), sum(sizes)), dtype=np.uint8)
+        numbers = self.numbers
+        lowest = int(numbers.min(initial=0))
+        positions: Optional[np.ndarray] = None
+        found = 0
+        start = 0
+        for copy in self.quizzes:
+            size = copy.size
+            answers = copy.answers()
+            if copy.owners is None:
+                rows = np.array(copy.rows, dtype=np.intp)
+                table_rows = np.ones(len(rows), dtype=bool)
+            else:
+                owners = np.frombuffer(copy.owners, dtype=np.int64) - lowest
+                if positions is None:
+                    # Row of the matrix of every student number, from the lowest one.
+                    positions = np.full(
+                        int(numbers.max(initial=-1)) + 1 - lowest, -1, dtype=np.intp
+                    )
+                    positions[numbers - lowest] = np.arange(len(numbers))
+                rows = np.full(len(owners), -1, dtype=np.intp)
+                known = (owners >= 0) & (owners < len(positions))
+                rows[known] = positions[owners[known]]
+                table_rows = (rows >= 0) & (
+                    np.frombuffer(copy.semesters, dtype=np.uint16) == copy.code
+                )
+                rows = rows[table_rows]
+            found += len(rows)
+            if size:
+                # Rows are copied as single values, much faster than byte by byte.
+                row_type = np.dtype((np.void, size))
+                matrix[:, start:start + size].view(row_type)[:, 0][rows] = \
+                    answers[:, :size].view(row_type)[:, 0][table_rows]
+            start += size
+        if found < self.expected:
+            return None
+        # Quizzes without questions have no columns.
+        sizes = [size for size in sizes if size]
+        quiz_starts = np.cumsum([0] + sizes)
+        answer_key = np.frombuffer(
+            b''.join(copy.key for copy in self.quizzes), dtype=np.uint8
+        ).copy()
+        score_tables = np.zeros((len(sizes), max(sizes, default=0) + 1))
+        for i, total_questions in enumerate(sizes):
+            # Round as Submission.get_score does, with python's round.
+            score_tables[i, :total_questions + 1] = [
+                round((correct / total_questions) * 100.0, 2)
+                for correct in range(total_questions + 1)
+            ]
+        return AnswerMatrix(
+            self.student_ids,
+            matrix,
+            answer_key,
+            quiz_starts[:-1].astype(np.intp),
+            score_tables,
+        )
+
+
+def score_totals(
+    answers: np.ndarray, answer_key: np.ndarray, quiz_starts: np.ndarray, score_tables: np.ndarray
+) -> np.ndarray:
+    """Compute the total score of every row of an answers matrix."""
+    if not len(quiz_starts):
+        return np.zeros(len(answers))
+    correct = answers == answer_key
+    # Number of correct answers of every student in every quiz, counted in
+    # the smallest type that fits the longest quiz.
+    longest = score_tables.shape[1] - 1
+    dtype = np.uint8 if longest <= 0xFF else np.uint16 if longest <= 0xFFFF else np.intp
+    counts = np.add.reduceat(correct.view(np.uint8), quiz_starts, axis=1, dtype=dtype)
+    scores = score_tables.take(np.arange(len(quiz_starts)) * score_tables.shape[1] + counts)
+    return scores.sum(axis=1)
+
+
+def grade_students(
+    students: Iterable['Student'], semester_id: Optional[str] = None
+) -> Dict[str, float]:
+    """Compute the total score for a semester of many students at once.
+
+    Return
+    ------
+    totals : {'<student_id>': float}
+        Sum of the scores of the quizzes of every student in the semester.
+    """
+    if not semester_id:
+        semester_id = get_semester_id()
+    matrix = AnswerMatrix.build(students, semester_id)
+    return dict(zip(matrix.student_ids, matrix.totals().tolist()))
+
+
+# Name, shape and type of an array in shared memory.
+SharedArray = Tuple[str, Tuple[int, ...], str]
+
+# Arrays used by a grading process, set when it starts.
+_shared: Dict[str, np.ndarray] = {}
+_shared_memories: List[SharedMemory] = []
+
+
+def _attach(answers: SharedArray, arrays: Dict[str, np.ndarray]) -> None:
+    """Initialize a grading process, attaching to the shared answers."""
+    memory_name, shape, dtype = answers
+    memory = SharedMemory(name=memory_name)
+    _shared_memories.append(memory)
+    _shared['answers'] = np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+    _shared.update(arrays)
+
+
+def _grade_rows(rows: Tuple[int, int]) -> np.ndarray:
+    """Grade a slice of the students, in a grading process."""
+    start, stop = rows
+    return score_totals(
+        _shared['answers'][start:stop],
+        _shared['answer_key'],
+        _shared['quiz_starts'],
+        _shared['score_tables'],
+    )
+
+
+def grade_students_parallel(
+    students: Iterable['Student'],
+    semester_id: Optional[str] = None,
+    processes: Optional[int] = None,
+) -> Dict[str, float]:
+    """Compute the total score for a semester of many students, in processes.
+
+    Same as grade_students, but once the matrix is built, the students are
+    split in slices scored by a pool of processes, one per core unless
+    processes is given. The answers are put in shared memory, so processes
+    do not copy them. Processes are spawned, not forked, so locks held by
+    other threads, as the one of an AnswerLog, are not copied locked.
+    """
+    if not semester_id:
+        semester_id = get_semester_id()
+    matrix = AnswerMatrix.build(students, semester_id)
+    rows = len(matrix.student_ids)
+    processes = min(processes or os.cpu_count() or 1, rows)
+    if processes <= 1 or not matrix.answers.size:
+        return dict(zip(matrix.student_ids, matrix.totals().tolist()))
+    answers = matrix.answers
+    memory = SharedMemory(create=True, size=answers.nbytes)
+    try:
+        np.ndarray(answers.shape, dtype=answers.dtype, buffer=memory.buf)[...] = answers
+        shared = (memory.name, answers.shape, answers.dtype.str)
+        # Free the private copy, processes only use the shared one.
+        matrix.answers = answers = answers[:0]
+        arrays = {
+            'answer_key': matrix.answer_key,
+            'quiz_starts': matrix.quiz_starts,
+            'score_tables': matrix.score_tables,
+        }
+        step = -(-rows // processes)
+        slices = [(start, min(start + step, rows)) for start in range(0, rows, step)]
+        with get_context('spawn').Pool(
+            processes, initializer=_attach, initargs=(shared, arrays)
+        ) as pool:
+            totals = np.concatenate(pool.map(_grade_rows, slices))
+    finally:
+        memory.close()
+        memory.unlink()
+    return dict(zip(matrix.student_ids, totals.tolist()))
@@ -0,0 +1,90 @@
+"""Give ids and codes a single string object and a dense integer key.
+
+Entities intern their ids and codes when created, so equal ids read from
+different rows, files or requests are one string in memory, and dict lookups
+with them compare by identity before comparing characters.
+
+An IdRegistry also numbers the ids it sees 0, 1, 2... so indexes and lists
+of ids can be kept as arrays of integers, of 4 bytes each, instead of lists
+of strings.
+
+Where integer keys are used:
+    Snapshots keep every string once, and refer to it by its key.
+    Answer tables of quizzes have a row per submission, whose student is
+    kept as Student.number in an array. It is a key of the Student, not of
+    its id, as a student id can be loaded again in another Student.
+
+Where they are not:
+    The dict indexes by id (submissions of a quiz, students of a running
+    course, the course registry) and Student.classes and Teacher.classes
+    keep interned strings. Callers look them up and get them by id, so
+    integer keys would add a lookup in an IdRegistry to every call, and an
+    interned string is already hashed once and compared by identity.
+    identifier_bench measures what each choice costs.
+
+ASSUMPTIONS:
+    Ids are never forgotten by a registry, it is meant to live as long as the
+    data it numbers, as a snapshot or a batch job.
+"""
+import sys
+from array import array
+from typing import Dict, Iterable, List
+
+
+class IdRegistry:
+    """Interned ids and their integer keys.
+
+    Atributes
+    --------
+    _keys : {'<id>': int}
+        Key of every id.
+    _ids : [str]
+        Id of every key, the interned string.
+    """
+    __slots__ = ('_keys', '_ids')
+
+    def __init__(self) -> None:
+        self._keys: Dict[str, int] = {}
+        self._ids: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, value: object) -> bool:
+        return value in self._keys
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def key(self, value: str) -> int:
+        """Return the key of an id, giving it the next one if it is new."""
+        key = self._keys.get(value)
+        if key is None:
+            value = sys.intern(value)
+            key = self._keys[value] = len(self._ids)
+            self._ids.append(value)
+        return key
+
+    def intern(self, value: str) -> str:
+        """Return the single string kept for an id."""
+        return self._ids[self.key(value)]
+
+    def id(self, key: int) -> str:
+        """Return the id of a key.
+
+        Raises
+        ------
+        IndexError
+            If the key was not given by this registry.
+        """
+        return self._ids[key]
+
+    def keys(self, values: Iterable[str]) -> array:
+        """Return the keys of many ids, as an array of integers."""
+        key = self.key
+        return array('i', [key(value) for value in values])
+
+    def ids(self, keys: Iterable[int]) -> List[str]:
+        """Return the ids of many keys."""
+        ids = self._ids
+        return [ids[key] for key in keys]
@@ -0,0 +1,203 @@
+"""Rank the students of a running course by their total for a semester.
+
+A Leaderboard listens to the gradebook of the teacher of the running course,
+so it changes only when the total of one of its students changes. Totals are
+counted in a Fenwick tree indexed by total, in hundredths, which answers how
+many students have up to a given total in logarithmic time. With it the rank
+and percentile of a student, and the top k students, are found without
+sorting the students.
+
+ASSUMPTIONS:
+    The total of a student is the one in the gradebook of the teacher of the
+    running course, the sum of the scores of the quizzes of that teacher.
+    Students without quizzes have a total of 0. Totals are never negative.
+    The teacher of the running course does not change once the leaderboard
+    is created.
+    Students with the same total share the same rank.
+"""
+import heapq
+import threading
+from typing import Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from classroom.app.utils import get_semester_id
+if TYPE_CHECKING: # pragma: no cover
+    from classroom.app.courses import CourseRunning
+    from classroom.app.entities import Student
+    from classroom.app.gradebooks import Gradebook
+
+# Totals, in hundredths, the tree can count before growing.
+INITIAL_SIZE = 1 << 14
+
+
+class _FenwickTree:
+    """Counts of values 0 to size - 1, with prefix sums in logarithmic time."""
+    __slots__ = ('size', '_tree')
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._tree = [0] * (size + 1)
+
+    def add(self, value: int, delta: int) -> None:
+        i = value + 1
+        tree = self._tree
+        while i <= self.size:
+            tree[i] += delta
+            i += i & -i
+
+    def count_up_to(self, value: int) -> int:
+        """How many values are lower or equal than value."""
+        i = min(value + 1, self.size)
+        tree = self._tree
+        count = 0
+        while i > 0:
+            count += tree[i]
+            i -= i & -i
+        return count
+
+    def find(self, k: int) -> int:
+        """Return the k-th lowest value, counting from 1."""
+        position = 0
+        step = 1 << self.size.bit_length()
+        tree = self._tree
+        while step:
+            following = position + step
+            if following <= self.size and tree[following] < k:
+                position = following
+                k -= tree[following]
+            step >>= 1
+        return position
+
+
+class Leaderboard:
+    """Ranking of the students of a running course in a semester.
+
+    Atributes
+    --------
+    running : CourseRunning
+        Running course ranked.
+    semester_id : str
+        Semester whose totals are ranked.
+    _totals : {'<student_id>': int}
+        Total of every student ranked, in hundredths.
+    _by_total : {int: {'<student_id>'}}
+        Students with every total.
+    _tree : _FenwickTree
+        How many students have every total.
+    _seen : int
+        Students of the running course already ranked, students are only
+        added to the end of its list.
+    _lock : threading.Lock
+        Taken to change or read the ranking, totals change from many threads.
+    """
+
+    def __init__(self, running: 'CourseRunning', semester_id: Optional[str] = None) -> None:
+        self.running = running
+        self.semester_id = semester_id or get_semester_id()
+        self._totals: Dict[str, int] = {}
+        self._by_total: Dict[int, Set[str]] = {}
+        self._tree = _FenwickTree(INITIAL_SIZE)
+        self._seen = 0
+        self._lock = threading.Lock()
+        self._gradebook: Optional['Gradebook'] = None
+        if running.teacher is not None:
+            self._gradebook = running.teacher.get_gradebook(self.semester_id)
+            self._gradebook.add_total_listener(self._on_total)
+        with self._lock:
+            self._add_new_students()
+
+    def _add_new_students(self) -> None:
+        students = self.running.get_students()
+        for student in students[self._seen:]:
+            if self._gradebook is None:
+                total = 0
+            else:
+                total = self._gradebook.get_total_hundredths(student.student_id)
+            self._set_total(student.student_id, total)
+        self._seen = len(students)
+
+    def _on_total(self, student: 'Student', previous: int, total: int) -> None:
+        if self.running.has_student(student.student_id):
+            with self._lock:
+                self._add_new_students()
+                self._set_total(student.student_id, total)
+
+    def _set_total(self, student_id: str, total: int) -> None:
+        previous = self._totals.get(student_id)
+        if previous == total:
+            return
+        if previous is not None:
+            self._tree.add(previous, -1)
+            students = self._by_total[previous]
+            students.discard(student_id)
+            if not students:
+                del self._by_total[previous]
+        if total >= self._tree.size:
+            self._grow(total)
+        self._totals[student_id] = total
+        self._tree.add(total, 1)
+        self._by_total.setdefault(total, set()).add(student_id)
+
+    def _grow(self, total: int) -> None:
+        size = self._tree.size
+        while size <= total:
+            size *= 2
+        self._tree = _FenwickTree(size)
+        for value, students in self._by_total.items():
+            self._tree.add(value, len(students))
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._add_new_students()
+            return len(self._totals)
+
+    def get_total(self, student_id: str) -> Optional[float]:
+        """Return the total of a student, None if not in the running course."""
+        with self._lock:
+            self._add_new_students()
+            total = self._totals.get(student_id)
+        return None if total is None else total / 100
+
+    def rank(self, student_id: str) -> Optional[int]:
+        """Return the position of a student, 1 is the highest total.
+
+        Return None if the student is not in the running course.
+        """
+        with self._lock:
+            self._add_new_students()
+            total = self._totals.get(student_id)
+            if total is None:
+                return None
+            return len(self._totals) - self._tree.count_up_to(total) + 1
+
+    def percentile(self, student_id: str) -> Optional[float]:
+        """Return the share of students with a total up to the student's, 0 to 100.
+
+        Return None if the student is not in the running course.
+        """
+        with self._lock:
+            self._add_new_students()
+            total = self._totals.get(student_id)
+            if total is None:
+                return None
+            return self._tree.count_up_to(total) * 100 / len(self._totals)
+
+    def top(self, k: int) -> List[Tuple[str, float]]:
+        """Return the k students with highest totals, as (student_id, total).
+
+        Students with the same total are ordered by id. Of the students with
+        the lowest total returned, only the ones needed are picked, without
+        sorting all of them.
+        """
+        with self._lock:
+            self._add_new_students()
+            ranked: List[Tuple[str, float]] = []
+            remaining = len(self._totals)
+            while len(ranked) < k and remaining:
+                total = self._tree.find(remaining)
+                students = self._by_total[total]
+                ranked.extend(
+                    (student_id, total / 100)
+                    for student_id in heapq.nsmallest(k - len(ranked), students)
+                )
+                remaining -= len(students)
+            return ranked
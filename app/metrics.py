@@ -0,0 +1,165 @@
+"""Count and time the calls to the hot paths of the classroom.
+
+Instrumentation is off by default and then costs nothing: enable() replaces
+the instrumented methods by wrappers that record every call, and disable()
+puts the original methods back.
+
+For every method, the number of calls, the total time, a histogram of the
+time of the calls and their outcomes are kept. The outcome of a call is the
+message it returned, for methods that answer with a message, 'ok' for the
+rest, or the name of the exception raised.
+
+    from classroom.app import metrics
+
+    metrics.enable()
+    ...
+    metrics.snapshot()  # {'Student.answer_quiz': {'count': 10, ...}, ...}
+
+ASSUMPTIONS:
+    Instrumentation is enabled and disabled at startup or in tests, not while
+    other threads are calling the instrumented methods.
+"""
+import functools
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Tuple
+
+from classroom.app.courses import Department
+from classroom.app.entities import Student
+from classroom.app.quizzes import Submission
+
+# Upper bounds of the histogram buckets, in seconds. A last bucket has the
+# calls slower than all of them.
+BUCKETS = (
+    1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+    1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0,
+)
+
+OK = 'ok'
+
+# Class and name of every instrumented method.
+INSTRUMENTED: Tuple[Tuple[type, str], ...] = (
+    (Student, 'answer_quiz'),
+    (Student, 'get_score_for_semester'),
+    (Submission, 'answer_next_question'),
+    (Submission, 'get_score'),
+    (Department, 'add_student_to_course'),
+    (Department, 'assign_teacher_to_course'),
+    (Department, 'mark_course_as_running'),
+)
+
+
+class Metric:
+    """Calls to one method.
+
+    Atributes
+    --------
+    count : int
+        Number of calls.
+    total_seconds : float
+        Time spent in all the calls.
+    buckets : [int]
+        Number of calls that took up to each of BUCKETS, and more.
+    outcomes : {'<outcome>': int}
+        Number of calls with every outcome.
+    _lock : threading.Lock
+        Taken to record a call, methods are called from many threads.
+    """
+    __slots__ = ('count', 'total_seconds', 'buckets', 'outcomes', '_lock')
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget every call recorded."""
+        with self._lock:
+            self.count = 0
+            self.total_seconds = 0.0
+            self.buckets: List[int] = [0] * (len(BUCKETS) + 1)
+            self.outcomes: Dict[str, int] = {}
+
+    def record(self, seconds: float, outcome: str) -> None:
+        """Record a call that took seconds and ended with outcome."""
+        bucket = bisect_left(BUCKETS, seconds)
+        with self._lock:
+            self.count += 1
+            self.total_seconds += seconds
+            self.buckets[bucket] += 1
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a copy of the metric, as plain values."""
+        with self._lock:
+            histogram = {str(bound): count for bound, count in zip(BUCKETS, self.buckets)}
+            histogram['+Inf'] = self.buckets[-1]
+            return {
+                'count': self.count,
+                'total_seconds': self.total_seconds,
+                'histogram': histogram,
+                'outcomes': dict(self.outcomes),
+            }
+
+
+_metrics: Dict[str, Metric] = {}
+# Original attribute of every instrumented method, while enabled.
+_originals: Dict[Tuple[type, str], Any] = {}
+
+
+def _instrument(function: Callable, metric: Metric) -> Callable:
+    perf_counter = time.perf_counter
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            result = function(*args, **kwargs)
+        except Exception as err:
+            metric.record(perf_counter() - start, type(err).__name__)
+            raise
+        metric.record(perf_counter() - start, result if isinstance(result, str) else OK)
+        return result
+    return wrapper
+
+
+def is_enabled() -> bool:
+    """Are the calls being recorded?."""
+    return bool(_originals)
+
+
+def enable() -> None:
+    """Start recording the calls to the instrumented methods."""
+    if is_enabled():
+        return
+    for cls, name in INSTRUMENTED:
+        original = cls.__dict__[name]
+        key = '{}.{}'.format(cls.__name__, name)
+        metric = _metrics.setdefault(key, Metric())
+        if isinstance(original, staticmethod):
+            wrapped: Any = staticmethod(_instrument(original.__func__, metric))
+        else:
+            wrapped = _instrument(original, metric)
+        _originals[(cls, name)] = original
+        setattr(cls, name, wrapped)
+
+
+def disable() -> None:
+    """Stop recording calls, the original methods are used again.
+
+    Recorded metrics are kept until reset.
+    """
+    for (cls, name), original in _originals.items():
+        setattr(cls, name, original)
+    _originals.clear()
+
+
+def reset() -> None:
+    """Forget every recorded call."""
+    for metric in _metrics.values():
+        metric.clear()
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    """Return the metrics of every method called: {'<Class.method>': {...}}."""
+    return {key: metric.snapshot() for key, metric in _metrics.items() if metric.count}
@@ -0,0 +1,201 @@
+"""Read quizzes from a file without loading it in memory.
+
+A QuizStore maps a quiz bank file in memory. Only an index of where every
+quiz starts is read when it is opened, questions are read from the mapped
+file when they are used. Processes opening the same file share its pages
+through the OS page cache.
+
+    header     : magic, version, number of quizzes, position of the index
+    quizzes    : id, name, number of questions, position of every question
+    questions  : correct answer, text and 4 possible answers
+    index      : id and position of every quiz
+
+Strings are utf-8, preceded by their length in bytes.
+
+ASSUMPTIONS:
+    Stores are read only, they are written once with write_quiz_store.
+    Quizzes read from a store are kept by quiz and teacher, so all the
+    students of a quiz of a teacher share the same Quiz, and every teacher
+    gets a Quiz of its own.
+"""
+import mmap
+import os
+import struct
+from typing import BinaryIO, Dict, Iterable, List, Tuple, TYPE_CHECKING
+
+from classroom.app.exceptions import QuizException
+from classroom.app.quizzes import BaseQuestion, Quiz
+if TYPE_CHECKING: # pragma: no cover
+    from classroom.app.entities import Teacher
+
+MAGIC = b'QZST'
+QUIZ_STORE_VERSION = 1
+
+HEADER = struct.Struct('<4sHIQ')
+LENGTH = struct.Struct('<H')
+COUNT = struct.Struct('<I')
+POSITION = struct.Struct('<Q')
+
+
+def _pack_string(text: str) -> bytes:
+    data = text.encode('utf-8')
+    return LENGTH.pack(len(data)) + data
+
+
+def _unpack_string(buffer, offset: int) -> Tuple[str, int]:
+    """Read the string at offset, return it and where the next thing starts."""
+    (length,) = LENGTH.unpack_from(buffer, offset)
+    start = offset + LENGTH.size
+    return str(buffer[start:start + length], 'utf-8'), start + length
+
+
+def write_quiz_store(stream: BinaryIO, quizzes: Iterable[Quiz]) -> None:
+    """Write quizzes to a binary stream, in the format read by QuizStore."""
+    stream.write(b'\0' * HEADER.size)
+    position = HEADER.size
+    index: List[Tuple[str, int]] = []
+    for quiz in quizzes:
+        index.append((quiz.quiz_id, position))
+        head = _pack_string(quiz.quiz_id) + _pack_string(quiz.name)
+        head += COUNT.pack(len(quiz.questions))
+        bodies = [
+            bytes([question.correct_answer])
+            + _pack_string(question.text)
+            + b''.join(_pack_string(answer) for answer in question.possible_answers)
+            for question in quiz.questions
+        ]
+        offset = position + len(head) + POSITION.size * len(bodies)
+        for body in bodies:
+            head += POSITION.pack(offset)
+            offset += len(body)
+        stream.write(head)
+        stream.write(b''.join(bodies))
+        position = offset
+    for quiz_id, quiz_position in index:
+        stream.write(_pack_string(quiz_id) + POSITION.pack(quiz_position))
+    stream.seek(0)
+    stream.write(HEADER.pack(MAGIC, QUIZ_STORE_VERSION, len(index), position))
+
+
+class QuizStore:
+    """Quizzes of a file, read on demand.
+
+    Atributes
+    --------
+    path : str
+        File of the store.
+    _buffer : mmap.mmap
+        The whole file, mapped in memory.
+    _positions : {'<quiz_id>': int}
+        Where each quiz starts in the file.
+    _quizzes : {('<quiz_id>', Teacher): Quiz}
+        Quizzes already read, for every teacher that asked for them.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, 'rb') as stream:
+            if os.fstat(stream.fileno()).st_size < HEADER.size:
+                raise QuizException('Not a quiz store')
+            self._buffer = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, position = HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC or version != QUIZ_STORE_VERSION:
+            self._buffer.close()
+            if magic != MAGIC:
+                raise QuizException('Not a quiz store')
+            raise QuizException('Unsupported quiz store version {}'.format(version))
+        self._positions: Dict[str, int] = {}
+        for _ in range(count):
+            quiz_id, position = _unpack_string(self._buffer, position)
+            (self._positions[quiz_id],) = POSITION.unpack_from(self._buffer, position)
+            position += POSITION.size
+        self._quizzes: Dict[Tuple[str, 'Teacher'], Quiz] = {}
+
+    def __enter__(self) -> 'QuizStore':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, quiz_id: str) -> bool:
+        return quiz_id in self._positions
+
+    def close(self) -> None:
+        self._quizzes.clear()
+        self._buffer.close()
+
+    def get_quiz_ids(self) -> List[str]:
+        """Return the ids of the quizzes in the store."""
+        return list(self._positions)
+
+    def get_quiz(self, quiz_id: str, teacher: 'Teacher') -> Quiz:
+        """Return a quiz of the teacher, whose questions are read from the store.
+
+        The same Quiz is returned every time it is asked for by the same
+        teacher. It is added to the teacher the first time, as
+        Teacher.create_quiz does.
+
+        Raises
+        ------
+        KeyError
+            If the quiz is not in the store.
+        """
+        quiz = self._quizzes.get((quiz_id, teacher))
+        if quiz is None:
+            position = self._positions[quiz_id]
+            _, position = _unpack_string(self._buffer, position)
+            name, position = _unpack_string(self._buffer, position)
+            (count,) = COUNT.unpack_from(self._buffer, position)
+            position += COUNT.size
+            quiz = Quiz(quiz_id, teacher, name)
+            quiz.questions.extend(
+                StoredQuestion(self._buffer, offset)
+                for (offset,) in POSITION.iter_unpack(
+                    self._buffer[position:position + count * POSITION.size]
+                )
+            )
+            self._quizzes[quiz_id, teacher] = quiz
+            teacher.add_quiz(quiz)
+        return quiz
+
+
+class StoredQuestion(BaseQuestion):
+    """Question read from a QuizStore every time it is used. Read only.
+
+    Atributes
+    --------
+    _buffer : mmap.mmap
+        File of the store.
+    _offset : int
+        Where the question starts in the file.
+    """
+    __slots__ = ('_buffer', '_offset')
+
+    def __init__(self, buffer: mmap.mmap, offset: int) -> None:
+        self._buffer = buffer
+        self._offset = offset
+
+    @property # type: ignore
+    def text(self) -> str: # type: ignore
+        """Question."""
+        return _unpack_string(self._buffer, self._offset + 1)[0]
+
+    @property # type: ignore
+    def _correct_answer(self) -> int: # type: ignore
+        return self._buffer[self._offset]
+
+    @property # type: ignore
+    def possible_answers(self) -> List[str]: # type: ignore
+        """List of possible answers."""
+        _, position = _unpack_string(self._buffer, self._offset + 1)
+        answers = []
+        for _ in range(4):
+            answer, position = _unpack_string(self._buffer, position)
+            answers.append(answer)
+        return answers
+
+    def add_possible_answer(self, answer: str, position: int, is_correct: bool) -> bool:
+        raise QuizException('Questions of a quiz store are read only')
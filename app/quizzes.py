@@ -8,15 +8,78 @@ ASSUMPTIONS:
     When take a quiz, student can answer questions in order.Can not take a quiz
     again if it is finished.
     Question is the set of question and possible answers.Could be more granular
+    A Quiz is the definition shared by every student it is assigned to. What
+    each student answered is kept apart in a Submission, so assigning a quiz
+    to many students does not copy its questions.
+    The answers of all the submissions of a quiz are stored together, a row
+    per submission in its AnswerTable, so they can be read at once.
+    Questions are not added to a quiz while it is being answered.
 """
 
+import abc
+import sys
+import threading
+from array import array
+
 from classroom.app.exceptions import AnswerPositionOverflow, QuizFinishedException
-from typing import List, TYPE_CHECKING
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
 if TYPE_CHECKING: # pragma: no cover
-    from classroom.app.entities import Teacher
+    from classroom.app.entities import Student, Teacher
+
+# Stored in a submission for answers that are not one of the 4 choices.
+NO_ANSWER = 0
+
+# Student of the rows of submissions that were replaced.
+NO_STUDENT = -1
+
+
+class QuizListener:
+    """Gets notified of changes in a quiz and its submissions.
+
+    Add it to a quiz with Quiz.add_listener. Every method does nothing,
+    subclasses override the ones they need.
+    """
+
+    def on_assign(self, submission: 'Submission') -> None:
+        """The quiz was assigned to a student."""
+
+    def on_unassign(self, submission: 'Submission') -> None:
+        """A submission was replaced by a new one, it does not count anymore."""
+
+    def on_answer(self, submission: 'Submission', start: int, count: int) -> None:
+        """count answers were given, starting at question number start."""
+
+    def on_question_added(self, quiz: 'Quiz') -> None:
+        """A question was added to the quiz, submissions may not be finished now."""
+
+
+class BaseQuestion(abc.ABC):
+    """What a quiz needs from a question, wherever its text and answers are kept.
+
+    It has no state of its own, subclasses keep text, _correct_answer and
+    possible_answers as attributes or read them from somewhere else.
+    """
+    __slots__ = ()
+
+    text: str
+    _correct_answer: int
+    possible_answers: List[str]
+
+    @property
+    def correct_answer(self) -> int:
+        """Return the position where the correct answer is in."""
+        return self._correct_answer
+
+    @abc.abstractmethod
+    def add_possible_answer(self, answer: str, position: int, is_correct: bool) -> bool:
+        """Add a possible answer in a position (1, 2, 3, 4)."""
+
+    def is_answer_correct(self, answer: int) -> bool:
+        """Check if the selected answer is the correct one."""
+        return answer == self.correct_answer
 
 
-class Question:
+class Question(BaseQuestion):
     """Question. A question belong to a quiz.
     I consider a question as the set of question, and multiple choice answer.
 
@@ -28,11 +91,8 @@ class Question:
         Which of the answer is the correct one.
     possible_answers : [string]
         List of possible answers.
-    is_answered : bool
-        is this question already answered?
-    is_answered_correct : bool
-        is this question answered and correct?
     """
+    __slots__ = ('text', '_correct_answer', 'possible_answers')
 
     def __init__(self, text: str) -> None:
         """
@@ -44,13 +104,6 @@ class Question:
         self.text = text
         self._correct_answer: int = 1
         self.possible_answers: List[str] = [''] * 4
-        self.is_answered: bool = False
-        self.is_answered_correct: bool = False
-
-    @property
-    def correct_answer(self) -> int:
-        """Return the position where the correct answer is in."""
-        return self._correct_answer
 
     #    @correct_answer.setter
     #    def correct_answer(self, num):
@@ -68,20 +121,104 @@ class Question:
         if not (0 < position <= 4):
             raise AnswerPositionOverflow("Position must be between 1 and 4")
         else:
-            self.possible_answers[position] = answer
+            self.possible_answers[position - 1] = answer
             self._correct_answer = position
             return True
 
-    def is_answer_correct(self, answer: int) -> bool:
-        """Check if the selected answer is the correct one."""
-        return answer == self.correct_answer
+
+class AnswerTable:
+    """Answers of every submission of a quiz, a row per submission.
+
+    Rows have a column per question and are stored one after the other in a
+    single buffer, answers not given yet are NO_ANSWER. Rows are only added,
+    so answers already given never move, except when there are more
+    questions than columns and every row is widened. How many answers a row
+    has is kept by its submission.
+
+    Atributes
+    --------
+    columns : int
+        Length of every row, at least the number of questions of the quiz.
+    data : bytearray
+        Chosen option of every row (rows * columns).
+    students : array('q')
+        Number of the student of every row, NO_STUDENT for rows of
+        submissions that were replaced.
+    semesters : array('H')
+        Code of the semester of every row.
+    semester_codes : {'<semester_id>': int}
+        Code of every semester with rows.
+    lock : threading.Lock
+        Taken to add rows or widen them, submissions can be added from many
+        threads.
+    """
+    __slots__ = ('columns', 'data', 'students', 'semesters', 'semester_codes', 'lock')
+
+    def __init__(self, columns: int = 0) -> None:
+        self.columns = columns
+        self.data = bytearray()
+        self.students = array('q')
+        self.semesters = array('H')
+        self.semester_codes: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.students)
+
+    def add_row(self, student_number: int, semester_id: str) -> int:
+        """Add an empty row and return its position."""
+        with self.lock:
+            code = self.semester_codes.setdefault(semester_id, len(self.semester_codes))
+            self.data.extend(bytes(self.columns))
+            self.students.append(student_number)
+            self.semesters.append(code)
+            return len(self.students) - 1
+
+    def remove_row(self, row: int) -> None:
+        """Stop counting a row as the answers of its student."""
+        self.students[row] = NO_STUDENT
+
+    def widen(self, columns: int) -> None:
+        """Make rows have at least the given number of columns."""
+        with self.lock:
+            if columns <= self.columns:
+                return
+            # Grow by at least half, to move the answers a few times.
+            columns = max(columns, self.columns + self.columns // 2)
+            old, data = self.columns, bytearray(len(self.students) * columns)
+            for row in range(len(self.students)):
+                data[row * columns:row * columns + old] = self.data[row * old:(row + 1) * old]
+            self.data[:] = data
+            self.columns = columns
+
+    def get(self, row: int, start: int, stop: int) -> bytes:
+        """Return the answers of a row from start to stop."""
+        offset = row * self.columns
+        return bytes(self.data[offset + start:offset + max(start, stop)])
+
+    def set(self, row: int, answers: bytes) -> None:
+        """Replace the answers of a row."""
+        if len(answers) > self.columns:
+            self.widen(len(answers))
+        offset = row * self.columns
+        self.data[offset:offset + self.columns] = bytes(answers).ljust(self.columns, b'\0')
+
+    def copy(self) -> Tuple[bytes, int, array, array]:
+        """Return the answers, columns, students and semesters of the rows, copied."""
+        with self.lock:
+            return bytes(self.data), self.columns, self.students[:], self.semesters[:]
+
+    def copy_rows(self, rows: Iterable[int]) -> Tuple[bytes, int]:
+        """Return the answers of some rows, one after the other, and the columns."""
+        with self.lock:
+            columns, data = self.columns, self.data
+            return b''.join([data[row * columns:(row + 1) * columns] for row in rows]), columns
 
 
 class Quiz:
     """Represents a quiz.
     A quiz is composed of questions. It is done by a teacher.
-    It can be finished, i.e. all the questions are ansered, or be
-    partially finished.
+    It is not answered itself, every student answers it in a Submission.
 
     Atribute
     --------
@@ -89,13 +226,21 @@ class Quiz:
         id of this quiz
     teacher : Teacher
         Teacher that created this quiz
-    _is_finished : bool
-        is the quizz finished?
-    questions : [Question]
+    questions : [BaseQuestion]
         List of questions belonging to this quiz
     name : str
         name of the quiz
+    submissions : dict
+        Submission of every student the quiz is assigned to, by semester and
+        student id.
+    listeners : [QuizListener]
+        Objects notified of changes in the quiz and its submissions.
+    answer_table : AnswerTable
+        Answers of all the submissions of the quiz.
     """
+    __slots__ = (
+        'quiz_id', 'teacher', 'name', 'questions', 'submissions', 'listeners', 'answer_table',
+    )
 
     def __init__(self, quiz_id: str, teacher: 'Teacher', name: str) -> None:
         """
@@ -108,48 +253,187 @@ class Quiz:
         name : str
             name of the quiz
         """
-        self.quiz_id = quiz_id
+        self.quiz_id = sys.intern(quiz_id)
         self.teacher = teacher
         self.name = name
-        self.questions: List[Question] = []
-        self._is_finished: bool = False
+        self.questions: List[BaseQuestion] = []
+        self.submissions: Dict[Tuple[str, str], Submission] = {}
+        self.listeners: List[QuizListener] = []
+        self.answer_table = AnswerTable()
 
-    @property
-    def is_finished(self):
-        """Is this quiz completed?."""
-        return self._is_finished
-
-    def add_question(self, q: Question) -> None:
+    def add_question(self, q: BaseQuestion) -> None:
         """Add a question to this quiz."""
         self.questions.append(q)
-        self._is_finished = False
+        self.answer_table.widen(len(self.questions))
+        for listener in self.listeners:
+            listener.on_question_added(self)
+
+    def add_listener(self, listener: QuizListener) -> None:
+        """Notify listener of the changes in this quiz and its submissions."""
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+
+    def remove_listener(self, listener: QuizListener) -> None:
+        """Stop notifying listener."""
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def add_submission(self, submission: 'Submission') -> None:
+        """Keep the submission of a student this quiz was assigned to."""
+        key = (submission.semester_id, submission.student.student_id)
+        previous = self.submissions.get(key)
+        if previous is not None:
+            self.remove_submission(previous)
+        self.submissions[key] = submission
+        for listener in self.listeners:
+            listener.on_assign(submission)
+
+    def remove_submission(self, submission: 'Submission') -> None:
+        """Forget a submission, when it is replaced by another one."""
+        key = (submission.semester_id, submission.student.student_id)
+        if self.submissions.get(key) is submission:
+            del self.submissions[key]
+            self.answer_table.remove_row(submission.row)
+            for listener in self.listeners:
+                listener.on_unassign(submission)
+
+
+class Submission:
+    """The answers of one student to one quiz.
+
+    Questions are answered in order, so the answers given so far are enough to
+    know which is the next question to answer. They are kept in a row of the
+    answer table of the quiz.
+
+    Atributes
+    --------
+    quiz : Quiz
+        Quiz being answered. It is shared, a submission never modifies it.
+    student : Student
+        Student answering the quiz.
+    semester_id : str
+        Semester in which the quiz was assigned.
+    row : int
+        Row of the answer table of the quiz with the answers.
+    answer_count : int
+        How many questions were answered.
+    _correct_answers : int
+        How many questions were answered correctly so far.
+    """
+    __slots__ = ('quiz', 'student', 'semester_id', 'row', 'answer_count', '_correct_answers')
 
-    def _is_quiz_finished(self) -> bool:
-        """Compute if the quiz is finished."""
-        # Check if there is a question that is not answered
-        question = next((q for q in self.questions if q.is_answered is False), None)
-        return question is not None
+    def __init__(self, quiz: Quiz, student: 'Student', semester_id: str) -> None:
+        """
+        Parameters
+        ----------
+        quiz : Quiz
+            Quiz being answered
+        student : Student
+            Student answering the quiz
+        semester_id : str
+            Semester in which the quiz was assigned
+        """
+        self.quiz = quiz
+        self.student = student
+        self.semester_id = semester_id
+        self.row = quiz.answer_table.add_row(student.number, semester_id)
+        self.answer_count: int = 0
+        self._correct_answers: int = 0
+
+    @property
+    def quiz_id(self) -> str:
+        """Id of the quiz being answered."""
+        return self.quiz.quiz_id
+
+    @property
+    def answers(self) -> bytes:
+        """Chosen option (1 to 4) for every answered question, in order."""
+        return self.quiz.answer_table.get(self.row, 0, self.answer_count)
+
+    @answers.setter
+    def answers(self, answers: bytes) -> None:
+        self.quiz.answer_table.set(self.row, answers)
+        self.answer_count = len(answers)
+
+    def get_answers(self, start: int = 0, stop: Optional[int] = None) -> bytes:
+        """Return the answers given from question number start to stop."""
+        count = self.answer_count
+        return self.quiz.answer_table.get(
+            self.row, start, count if stop is None else min(stop, count)
+        )
+
+    @property
+    def is_finished(self) -> bool:
+        """Are all the questions of the quiz answered?."""
+        total_questions = len(self.quiz.questions)
+        return bool(total_questions) and self.answer_count >= total_questions
 
     def answer_next_question(self, answer: int) -> None:
-        """Answer next unanswered question."""
-        # Get first question not answered, we can continue an unifinished quizz
-        question = next((q for q in self.questions if q.is_answered is False), None)
-        if question is None or self.is_finished:
+        """Answer next unanswered question.
+
+        Raises
+        ------
+        QuizFinishedException
+            If there is no question left to answer.
+        """
+        quiz = self.quiz
+        questions = quiz.questions
+        position = self.answer_count
+        if position >= len(questions):
             raise QuizFinishedException('Quiz is already finished')
-        # If answer matches the correct option, mark as answered ok.
-        if question.is_answer_correct(answer):
-            question.is_answered_correct = True
-        # Mark question as answered
-        question.is_answered = True
-        # If there is no more unanswered questions
-        if not self._is_quiz_finished():
-            self._is_finished = True
+        if questions[position].is_answer_correct(answer):
+            self._correct_answers += 1
+        table = quiz.answer_table
+        columns = table.columns
+        if position >= columns:
+            # Questions were added to the quiz without add_question.
+            table.widen(len(questions))
+            columns = table.columns
+        table.data[self.row * columns + position] = answer if 0 < answer <= 4 else NO_ANSWER
+        self.answer_count = position + 1
+        for listener in quiz.listeners:
+            listener.on_answer(self, position, 1)
+
+    def answer_next_questions(self, answers: Iterable[int]) -> int:
+        """Answer the next unanswered questions, one per answer, in order.
+
+        Answers left when the quiz gets finished are not applied.
+
+        Return
+        ------
+        applied : int
+            How many of the answers were applied.
+        """
+        questions = self.quiz.questions
+        start = position = self.answer_count
+        total_questions = len(questions)
+        chosen = bytearray()
+        correct = 0
+        for answer in answers:
+            if position >= total_questions:
+                break
+            if questions[position].is_answer_correct(answer):
+                correct += 1
+            chosen.append(answer if 0 < answer <= 4 else NO_ANSWER)
+            position += 1
+        # Correct answers are counted before answer_count, as in
+        # answer_next_question, snapshots rely on it.
+        self._correct_answers += correct
+        if position > start:
+            table = self.quiz.answer_table
+            if position > table.columns:
+                table.widen(total_questions)
+            offset = self.row * table.columns
+            table.data[offset + start:offset + position] = chosen
+            self.answer_count = position
+            for listener in self.quiz.listeners:
+                listener.on_answer(self, start, position - start)
+        return position - start
 
     def get_score(self) -> float:
-        """Compute score for this quiz."""
-        if not self.questions:
+        """Compute score for this submission."""
+        total_questions = len(self.quiz.questions)
+        if not total_questions:
             return 0
-        total_questions = len(self.questions)
-        correct_answers = len([x for x in self.questions if x.is_answered_correct])
-        score = round((correct_answers / total_questions) * 100.0, 2)
+        score = round((self._correct_answers / total_questions) * 100.0, 2)
         return score
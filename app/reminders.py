@@ -0,0 +1,127 @@
+"""Know which students have quizzes left to finish in a semester.
+
+An IncompleteIndex listens to quizzes and keeps, for every quiz, the
+submissions of the semester that are not finished: assigned and not started,
+or partially answered. A submission enters the index when the quiz is
+assigned and leaves it when its last question is answered, so a reminder job
+only goes through the submissions it has to remind, not through every
+student of the school.
+
+ASSUMPTIONS:
+    Quiz ids are unique, as said in quizzes.
+    A quiz without questions is never finished, so its submissions are
+    always in the index.
+    Adding a question to a quiz makes its finished submissions unfinished
+    again.
+    The students to remind in a running course are the ones in it with an
+    unfinished quiz of its teacher.
+"""
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, TYPE_CHECKING
+
+from classroom.app.quizzes import QuizListener
+from classroom.app.utils import get_semester_id
+if TYPE_CHECKING: # pragma: no cover
+    from classroom.app.courses import CourseRunning
+    from classroom.app.entities import Student
+    from classroom.app.quizzes import Quiz, Submission
+
+
+class IncompleteIndex(QuizListener):
+    """Unfinished submissions of a semester, by quiz.
+
+    Atributes
+    --------
+    semester_id : str
+        Semester indexed.
+    _by_quiz : {'<quiz_id>': {'<student_id>': Submission}}
+        Unfinished submissions of every quiz with any.
+    _lock : threading.Lock
+        Taken to change the index, answers can arrive from many threads.
+    """
+
+    def __init__(self, semester_id: Optional[str] = None) -> None:
+        self.semester_id = semester_id or get_semester_id()
+        self._by_quiz: Dict[str, Dict[str, 'Submission']] = {}
+        self._lock = threading.Lock()
+
+    def track(self, quizzes: Iterable['Quiz']) -> None:
+        """Index the submissions of the quizzes, the current ones and the new ones."""
+        for quiz in quizzes:
+            quiz.add_listener(self)
+            for submission in list(quiz.submissions.values()):
+                self.on_assign(submission)
+
+    def _add(self, submission: 'Submission') -> None:
+        submissions = self._by_quiz.setdefault(submission.quiz_id, {})
+        submissions[submission.student.student_id] = submission
+
+    def _remove(self, submission: 'Submission') -> None:
+        quiz_id = submission.quiz_id
+        submissions = self._by_quiz.get(quiz_id)
+        student_id = submission.student.student_id
+        if submissions is not None and submissions.get(student_id) is submission:
+            del submissions[student_id]
+            if not submissions:
+                del self._by_quiz[quiz_id]
+
+    def on_assign(self, submission: 'Submission') -> None:
+        if submission.semester_id == self.semester_id and not submission.is_finished:
+            with self._lock:
+                self._add(submission)
+
+    def on_unassign(self, submission: 'Submission') -> None:
+        if submission.semester_id == self.semester_id:
+            with self._lock:
+                self._remove(submission)
+
+    def on_answer(self, submission: 'Submission', start: int, count: int) -> None:
+        if submission.semester_id == self.semester_id:
+            # Checked while holding the lock, a question may be being added.
+            with self._lock:
+                if submission.is_finished:
+                    self._remove(submission)
+
+    def on_question_added(self, quiz: 'Quiz') -> None:
+        # Copied, submissions may be added from other threads meanwhile.
+        for submission in list(quiz.submissions.values()):
+            if submission.semester_id == self.semester_id:
+                with self._lock:
+                    if not submission.is_finished:
+                        self._add(submission)
+
+    def get_submissions(self, quiz_id: str) -> List['Submission']:
+        """Return the unfinished submissions of a quiz."""
+        with self._lock:
+            return list(self._by_quiz.get(quiz_id, {}).values())
+
+    def get_students(self, quiz_id: str) -> List['Student']:
+        """Return the students that did not finish a quiz."""
+        return [submission.student for submission in self.get_submissions(quiz_id)]
+
+    def get_running_students(self, running: 'CourseRunning') -> List['Student']:
+        """Return the students of a running course with quizzes of its teacher to finish.
+
+        Only the quizzes of the teacher and their unfinished submissions are
+        gone through.
+        """
+        teacher = running.teacher
+        if teacher is None:
+            return []
+        students: Dict[str, 'Student'] = {}
+        with self._lock:
+            for quiz in teacher.quizzes:
+                for student_id, submission in self._by_quiz.get(quiz.quiz_id, {}).items():
+                    if running.has_student(student_id):
+                        students[student_id] = submission.student
+        return list(students.values())
+
+    def __iter__(self) -> Iterator['Submission']:
+        """Go through every unfinished submission."""
+        with self._lock:
+            submissions = [s for quiz in self._by_quiz.values() for s in quiz.values()]
+        return iter(submissions)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(submissions) for submissions in self._by_quiz.values())
@@ -0,0 +1,150 @@
+"""Load departments, courses, running courses, students and teachers in bulk.
+
+A roster is a CSV file with one enrolment per row and these columns:
+
+    department_code, department_name, course_code, course_description, year,
+    teacher_id, teacher_first_name, teacher_last_name,
+    student_id, student_first_name, student_last_name
+
+The file is read row by row, so it can be larger than the memory. Only the
+entities built from it are kept, every one of them once, by its id.
+
+ASSUMPTIONS:
+    Names and descriptions are taken from the first row an id appears in.
+    Teacher and student columns can be empty, for courses without teacher or
+    rows that only declare a running course.
+"""
+import csv
+import time
+from typing import Dict, Iterable, Optional
+
+from classroom.app.courses import Course, CourseRegistry, CourseRunning, Department, RunningKey
+from classroom.app.entities import Student, Teacher
+from classroom.app.exceptions import RosterImportException
+
+COLUMNS = (
+    'department_code', 'department_name', 'course_code', 'course_description', 'year',
+    'teacher_id', 'teacher_first_name', 'teacher_last_name',
+    'student_id', 'student_first_name', 'student_last_name',
+)
+
+
+class RosterImporter:
+    """Build the entities of one or more roster files.
+
+    Atributes
+    --------
+    departments : {'<department_code>': Department}
+    teachers : {'<teacher_id>': Teacher}
+    students : {'<student_id>': Student}
+    runnings : {('<department_code>', '<running_course_code>'): CourseRunning}
+    registry : CourseRegistry or None
+        Where running courses and their teachers are indexed, if given.
+    rows : int
+        Number of rows imported.
+    elapsed : float
+        Seconds spent importing.
+    """
+
+    def __init__(self, registry: Optional[CourseRegistry] = None) -> None:
+        self.departments: Dict[str, Department] = {}
+        self.teachers: Dict[str, Teacher] = {}
+        self.students: Dict[str, Student] = {}
+        self.runnings: Dict[RunningKey, CourseRunning] = {}
+        self.registry = registry
+        self.rows = 0
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def import_csv(self, lines: Iterable[str]) -> int:
+        """Import every row of a roster, given as an open file or lines.
+
+        Raises
+        ------
+        RosterImportException
+            If a column is missing in the header, or a row is shorter than
+            the header.
+
+        Return
+        ------
+        rows : int
+            Number of rows imported from this roster.
+        """
+        start = time.perf_counter()
+        reader = csv.reader(lines)
+        header = next(reader, None) or []
+        missing = [column for column in COLUMNS if column not in header]
+        if missing:
+            raise RosterImportException('Missing columns: {}'.format(', '.join(missing)))
+        positions = [header.index(column) for column in COLUMNS]
+        needed = max(positions) + 1
+        rows = 0
+        for row in reader:
+            if row:
+                if len(row) < needed:
+                    raise RosterImportException(
+                        'Line {}: expected {} columns, found {}'.format(
+                            reader.line_num, needed, len(row))
+                    )
+                self.add_row(*[row[i] for i in positions])
+                rows += 1
+        self.rows += rows
+        self.elapsed += time.perf_counter() - start
+        return rows
+
+    def add_row(
+        self,
+        department_code: str,
+        department_name: str,
+        course_code: str,
+        course_description: str,
+        year: str,
+        teacher_id: str = '',
+        teacher_first_name: str = '',
+        teacher_last_name: str = '',
+        student_id: str = '',
+        student_first_name: str = '',
+        student_last_name: str = '',
+    ) -> CourseRunning:
+        """Add the entities of one row, reusing the ones already created."""
+        running = self.runnings.get((department_code, '{}_{}'.format(course_code, year)))
+        if running is None:
+            running = self._add_running(
+                department_code, department_name, course_code, course_description, year
+            )
+        if teacher_id:
+            teacher = self.teachers.get(teacher_id)
+            if teacher is None:
+                teacher = Teacher(teacher_first_name, teacher_last_name, teacher_id)
+                self.teachers[teacher_id] = teacher
+            if running.teacher is not teacher:
+                Department.assign_teacher_to_course(teacher, running, self.registry)
+        if student_id:
+            student = self.students.get(student_id)
+            if student is None:
+                student = Student(student_first_name, student_last_name, student_id)
+                self.students[student_id] = student
+            student.enrol(running)
+        return running
+
+    def _add_running(
+        self,
+        department_code: str,
+        department_name: str,
+        course_code: str,
+        course_description: str,
+        year: str,
+    ) -> CourseRunning:
+        department = self.departments.get(department_code)
+        if department is None:
+            department = Department(department_name, department_code)
+            self.departments[department_code] = department
+        course: Optional[Course] = department.get_courses().get(course_code)
+        if course is None:
+            course = department.add_course(course_description, course_code)
+        running = department.mark_course_as_running(course, year, self.registry)
+        self.runnings[(department_code, running.running_course_code)] = running
+        return running
@@ -0,0 +1,102 @@
+"""Use the classroom from asyncio code.
+
+The classes of the classroom are not thread safe and never wait, so an async
+web server can use them from its event loop. ClassroomService is the entry
+point for it. Its operations never wait in between, so every request is
+applied whole, in the order it arrives, without locks.
+
+Grading many students is CPU bound. Only copying the answer tables of their
+quizzes is done in the event loop, building the matrix of answers from the
+copies and scoring it runs in a thread, not to stop the event loop. Answers
+arriving while grading do not change the grades.
+
+ASSUMPTIONS:
+    Every change to students goes through the service, from one event loop.
+"""
+import asyncio
+from typing import Dict, Iterable, Optional, Sequence, Tuple, Union, TYPE_CHECKING
+
+from classroom.app.concurrency import Classroom
+from classroom.app.grading import AnswerCopies
+from classroom.app.utils import get_semester_id
+if TYPE_CHECKING: # pragma: no cover
+    from classroom.app.courses import CourseRunning
+    from classroom.app.entities import Student
+    from classroom.app.quizzes import Quiz
+
+
+class ClassroomService:
+    """Async operations over the students of a school.
+
+    Only grade_students awaits, the other operations are coroutines so that
+    callers do not change if some of them wait for storage in the future.
+
+    Atributes
+    --------
+    classroom : Classroom
+        Operations applied, without locks, as they run in the event loop.
+    students : {'<student_id>': Student}
+        Students served, the ones of the classroom.
+    """
+
+    def __init__(self, students: Iterable['Student'] = ()) -> None:
+        self.classroom = Classroom(students)
+        self.students = self.classroom.students
+
+    def add_student(self, student: 'Student') -> None:
+        """Serve a new student."""
+        self.classroom.add_student(student)
+
+    async def answer_quiz(self, student_id: str, quiz_id: str, answer: int) -> str:
+        """Answer the next question of a quiz, as Student.answer_quiz."""
+        return self.classroom.answer_quiz(student_id, quiz_id, answer)
+
+    async def answer_quiz_batch(
+        self, student_id: str, quiz_id: str, answers: Sequence[int]
+    ) -> Tuple[str, int]:
+        """Answer many questions of a quiz, as Student.answer_quiz_batch."""
+        return self.classroom.answer_quiz_batch(student_id, quiz_id, answers)
+
+    async def assign_quiz(self, student_id: str, quiz: 'Quiz') -> Optional[str]:
+        """Assign a quiz to a student. Return an error message, if any."""
+        return self.classroom.assign_quiz(student_id, quiz)
+
+    async def enrol(self, student_id: str, course_running: 'CourseRunning') -> Optional[str]:
+        """Enrol a student in a running course. Return an error message, if any."""
+        return self.classroom.enrol(student_id, course_running)
+
+    async def get_score_for_semester(
+        self, student_id: str, semester_id: Optional[str] = None
+    ) -> Union[str, float]:
+        """Score of a student, as Student.get_score_for_semester."""
+        return self.classroom.get_score_for_semester(student_id, semester_id)
+
+    async def grade_students(
+        self, student_ids: Iterable[str], semester_id: Optional[str] = None
+    ) -> Dict[str, float]:
+        """Grade many students at once, in a thread. Unknown ids are skipped.
+
+        Students are graded with the answers they have when this is called,
+        or when their answers are copied again, if a quiz was missed because
+        another one has its id.
+        """
+        students = [self.students[sid] for sid in student_ids if sid in self.students]
+        semester_id = semester_id or get_semester_id()
+        loop = asyncio.get_running_loop()
+        # Copied here, the event loop does not change answers while copying.
+        copies = AnswerCopies.collect(students, semester_id)
+        totals = await loop.run_in_executor(None, _grade, copies)
+        if totals is None:
+            # Another quiz has the id of one of theirs, copy every quiz.
+            copies = AnswerCopies.collect(students, semester_id, every_quiz=True)
+            totals = await loop.run_in_executor(None, _grade, copies)
+            assert totals is not None
+        return totals
+
+
+def _grade(copies: AnswerCopies) -> Optional[Dict[str, float]]:
+    """Grade the answers copied, in a thread, or None if some quiz was not copied."""
+    matrix = copies.build()
+    if matrix is None:
+        return None
+    return dict(zip(matrix.student_ids, matrix.totals().tolist()))
@@ -0,0 +1,396 @@
+"""Save the whole school to a binary file, and load it back.
+
+A snapshot has departments with their courses and running courses, teachers,
+students, enrolments, quizzes with their questions, and the submissions of
+the students.
+
+Every string is stored once in a string table, and every entity is a record
+of fixed width made of 32 bit integers, which are positions in the string
+table or in other sections. Sections are written and read as whole arrays,
+so there is no work per field.
+
+    header         : magic, version
+    strings        : count, byte length of each string, utf-8 blob
+    sections       : tag, record count, records
+                     (submissions are followed by the chosen answers blob)
+
+ASSUMPTIONS:
+    Quizzes are saved as definitions, only the answers of submissions are
+    saved.
+    Questions of question banks are saved as plain questions.
+    Gradebooks are not saved, they are rebuilt when asked for.
+    Years of running courses are saved as strings.
+"""
+import gc
+import operator
+import struct
+import sys
+from array import array
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+from classroom.app.courses import (
+    Course,
+    CourseRegistry,
+    CourseRunning,
+    Department,
+)
+from classroom.app.entities import Student, Teacher
+from classroom.app.exceptions import SnapshotException
+from classroom.app.identifiers import IdRegistry
+from classroom.app.quizzes import Question, Quiz, Submission
+
+MAGIC = b'CLSS'
+SNAPSHOT_VERSION = 1
+NONE = -1
+
+HEADER = struct.Struct('<4sH')
+SECTION = struct.Struct('<4sI')
+
+# Tag and number of fields of the records of every section, in file order.
+SECTIONS = (
+    (b'DEPT', 2),  # name, code
+    (b'CRSE', 3),  # department, description, code
+    (b'TCHR', 3),  # first name, last name, id
+    (b'STDT', 3),  # first name, last name, id
+    (b'RUNN', 3),  # course, year, teacher
+    (b'TCLS', 2),  # teacher, running course code
+    (b'SCLS', 2),  # student, running course code
+    (b'RSTD', 2),  # running course, student
+    (b'QUIZ', 4),  # teacher, id, name, number of questions
+    (b'QUES', 6),  # text, 4 possible answers, correct answer
+    (b'TQUI', 2),  # teacher, quiz
+    (b'SUBM', 5),  # student, quiz, semester, correct answers, number of answers
+)
+
+
+class School:
+    """Everything in a snapshot.
+
+    Atributes
+    --------
+    departments : {'<department_code>': Department}
+    teachers : {'<teacher_id>': Teacher}
+    students : {'<student_id>': Student}
+    quizzes : [Quiz]
+    """
+
+    def __init__(
+        self,
+        departments: Iterable[Department] = (),
+        teachers: Iterable[Teacher] = (),
+        students: Iterable[Student] = (),
+        quizzes: Iterable[Quiz] = (),
+    ) -> None:
+        self.departments = {d.department_code: d for d in departments}
+        self.teachers = {t.teacher_id: t for t in teachers}
+        self.students = {s.student_id: s for s in students}
+        self.quizzes = list(quizzes)
+
+
+def _int_array(values: Iterable[int] = ()) -> array:
+    return array('i', values)
+
+
+def _write_array(stream: BinaryIO, values: array) -> None:
+    if sys.byteorder == 'big':  # pragma: no cover
+        values = array(values.typecode, values)
+        values.byteswap()
+    stream.write(values.tobytes())
+
+
+def _read(stream: BinaryIO, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) != size:
+        raise SnapshotException('Snapshot is truncated')
+    return data
+
+
+def _read_array(stream: BinaryIO, typecode: str, count: int) -> array:
+    values = array(typecode)
+    values.frombytes(_read(stream, values.itemsize * count))
+    if sys.byteorder == 'big':  # pragma: no cover
+        values.byteswap()
+    return values
+
+
+class _Writer:
+    """Give a position to every string and entity, and collect the records."""
+
+    def __init__(self) -> None:
+        self.strings = IdRegistry()
+        self.records = {tag: _int_array() for tag, _ in SECTIONS}
+        self.answers = bytearray()
+        self.teachers: Dict[Teacher, int] = {}
+        self.students: Dict[Student, int] = {}
+        self.runnings: Dict[CourseRunning, int] = {}
+        self.quizzes: Dict[Quiz, int] = {}
+        self.keys: Dict[Quiz, bytes] = {}
+
+    def string(self, text) -> int:
+        return self.strings.key(str(text))
+
+    def teacher(self, teacher: Optional[Teacher]) -> int:
+        if teacher is None:
+            return NONE
+        position = self.teachers.get(teacher)
+        if position is None:
+            position = self.teachers[teacher] = len(self.teachers)
+            self.records[b'TCHR'].extend((
+                self.string(teacher.first_name),
+                self.string(teacher.last_name),
+                self.string(teacher.teacher_id),
+            ))
+        return position
+
+    def student(self, student: Student) -> int:
+        position = self.students.get(student)
+        if position is None:
+            position = self.students[student] = len(self.students)
+            self.records[b'STDT'].extend((
+                self.string(student.first_name),
+                self.string(student.last_name),
+                self.string(student.student_id),
+            ))
+        return position
+
+    def quiz(self, quiz: Quiz) -> int:
+        position = self.quizzes.get(quiz)
+        if position is None:
+            position = self.quizzes[quiz] = len(self.quizzes)
+            quiz_questions = list(quiz.questions)
+            self.records[b'QUIZ'].extend((
+                self.teacher(quiz.teacher),
+                self.string(quiz.quiz_id),
+                self.string(quiz.name),
+                len(quiz_questions),
+            ))
+            questions = self.records[b'QUES']
+            self.keys[quiz] = bytes(question.correct_answer for question in quiz_questions)
+            for question in quiz_questions:
+                questions.append(self.string(question.text))
+                questions.extend(self.string(a) for a in question.possible_answers)
+                questions.append(question.correct_answer)
+        return position
+
+    def add_department(self, department: Department) -> None:
+        position = len(self.records[b'DEPT']) // 2
+        self.records[b'DEPT'].extend((
+            self.string(department.name), self.string(department.department_code)
+        ))
+        for course in department.get_courses().values():
+            course_position = len(self.records[b'CRSE']) // 3
+            self.records[b'CRSE'].extend((
+                position, self.string(course.description), self.string(course.course_code)
+            ))
+            for running in course.get_runnings():
+                self.runnings[running] = len(self.runnings)
+                self.records[b'RUNN'].extend((
+                    course_position, self.string(running.year), self.teacher(running.teacher)
+                ))
+
+    def add_relations(self) -> None:
+        """Add enrolments, quizzes and submissions of every entity found."""
+        for running, position in list(self.runnings.items()):
+            for student in running.get_students():
+                self.records[b'RSTD'].extend((position, self.student(student)))
+        # Entities found while adding relations get their relations added too.
+        done_teachers: Dict[Teacher, bool] = {}
+        done_students: Dict[Student, bool] = {}
+        done_quizzes: Dict[Quiz, bool] = {}
+        while (
+            len(done_teachers) < len(self.teachers)
+            or len(done_students) < len(self.students)
+            or len(done_quizzes) < len(self.quizzes)
+        ):
+            for teacher in list(self.teachers):
+                if teacher not in done_teachers:
+                    done_teachers[teacher] = True
+                    self._add_teacher_relations(teacher)
+            for quiz in list(self.quizzes):
+                if quiz not in done_quizzes:
+                    done_quizzes[quiz] = True
+                    for submission in list(quiz.submissions.values()):
+                        self.student(submission.student)
+            for student in list(self.students):
+                if student not in done_students:
+                    done_students[student] = True
+                    self._add_student_relations(student)
+
+    def _add_teacher_relations(self, teacher: Teacher) -> None:
+        position = self.teachers[teacher]
+        for code in teacher.get_teaching_courses():
+            self.records[b'TCLS'].extend((position, self.string(code)))
+        for quiz in teacher.quizzes:
+            self.records[b'TQUI'].extend((position, self.quiz(quiz)))
+
+    def _add_student_relations(self, student: Student) -> None:
+        position = self.students[student]
+        for code in student.get_enroled_courses():
+            self.records[b'SCLS'].extend((position, self.string(code)))
+        # Students may be answering while the snapshot is written, so dicts
+        # are copied. Correct answers of a finished submission are counted
+        # before answer_count is set, so they can be read afterwards; the
+        # ones of other submissions are counted from the answers read.
+        for semester_id, submissions in list(student.quizzes.items()):
+            for submission in list(submissions.values()):
+                quiz_position = self.quiz(submission.quiz)
+                key = self.keys[submission.quiz]
+                count = min(submission.answer_count, len(key))
+                correct = submission._correct_answers
+                answers = submission.get_answers(0, count)
+                if count < len(key) or len(submission.quiz.questions) > len(key):
+                    correct = sum(map(operator.eq, answers, key))
+                self.records[b'SUBM'].extend((
+                    position,
+                    quiz_position,
+                    self.string(semester_id),
+                    correct,
+                    len(answers),
+                ))
+                self.answers += answers
+
+    def write(self, stream: BinaryIO) -> None:
+        stream.write(HEADER.pack(MAGIC, SNAPSHOT_VERSION))
+        encoded = [text.encode('utf-8') for text in self.strings]
+        stream.write(struct.pack('<I', len(encoded)))
+        _write_array(stream, _int_array(len(text) for text in encoded))
+        stream.write(b''.join(encoded))
+        for tag, width in SECTIONS:
+            records = self.records[tag]
+            stream.write(SECTION.pack(tag, len(records) // width))
+            _write_array(stream, records)
+        stream.write(struct.pack('<I', len(self.answers)))
+        stream.write(self.answers)
+
+
+def save_snapshot(
+    stream: BinaryIO,
+    departments: Iterable[Department],
+    teachers: Iterable[Teacher] = (),
+    students: Iterable[Student] = (),
+    quizzes: Iterable[Quiz] = (),
+) -> None:
+    """Write a snapshot of the school to a binary stream.
+
+    Teachers, students and quizzes reachable from the departments, and from
+    each other, are saved even if they are not given.
+    """
+    writer = _Writer()
+    for department in departments:
+        writer.add_department(department)
+    for teacher in teachers:
+        writer.teacher(teacher)
+    for student in students:
+        writer.student(student)
+    for quiz in quizzes:
+        writer.quiz(quiz)
+    writer.add_relations()
+    writer.write(stream)
+
+
+def _records(stream: BinaryIO, tag: bytes, width: int) -> List[Tuple[int, ...]]:
+    found, count = SECTION.unpack(_read(stream, SECTION.size))
+    if found != tag:
+        raise SnapshotException('Expected section {!r}, found {!r}'.format(tag, found))
+    values = _read_array(stream, 'i', count * width)
+    return list(zip(*[iter(values)] * width))
+
+
+def load_snapshot(stream: BinaryIO, registry: Optional[CourseRegistry] = None) -> School:
+    """Read a snapshot written by save_snapshot.
+
+    Running courses are added to the registry, if given, as if they were
+    marked as running by their departments.
+
+    Raises
+    ------
+    SnapshotException
+        If the stream is not a snapshot, is of another version or is
+        truncated.
+    """
+    # Only new objects are created, none of them garbage, so collecting while
+    # they are created is wasted time.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _load(stream, registry)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def _load(stream: BinaryIO, registry: Optional[CourseRegistry]) -> School:
+    header = stream.read(HEADER.size)
+    if len(header) != HEADER.size or HEADER.unpack(header)[0] != MAGIC:
+        raise SnapshotException('Not a snapshot')
+    version = HEADER.unpack(header)[1]
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotException('Unsupported snapshot version {}'.format(version))
+    (count,) = struct.unpack('<I', _read(stream, 4))
+    lengths = _read_array(stream, 'i', count)
+    blob = _read(stream, sum(lengths))
+    strings: List[str] = []
+    offset = 0
+    for length in lengths:
+        strings.append(blob[offset:offset + length].decode('utf-8'))
+        offset += length
+    records = {tag: _records(stream, tag, width) for tag, width in SECTIONS}
+    (answers_length,) = struct.unpack('<I', _read(stream, 4))
+    answers = _read(stream, answers_length)
+
+    departments = [Department(strings[name], strings[code]) for name, code in records[b'DEPT']]
+    courses = []
+    for department, description, code in records[b'CRSE']:
+        course = Course(strings[description], strings[code], departments[department])
+        departments[department].courses[course.course_code] = course
+        courses.append(course)
+    teachers = [
+        Teacher(strings[first], strings[last], strings[tid])
+        for first, last, tid in records[b'TCHR']
+    ]
+    students = [
+        Student(strings[first], strings[last], strings[sid])
+        for first, last, sid in records[b'STDT']
+    ]
+    runnings = []
+    for course_index, year, teacher in records[b'RUNN']:
+        running = CourseRunning(
+            courses[course_index], strings[year],
+            teachers[teacher] if teacher != NONE else None, # type: ignore
+        )
+        courses[course_index].runnings.append(running)
+        if registry is not None:
+            registry.add(running)
+        runnings.append(running)
+    for teacher, code in records[b'TCLS']:
+        teachers[teacher].add_course_to_teach(strings[code])
+    for student, code in records[b'SCLS']:
+        students[student].classes.append(strings[code])
+        students[student]._class_codes.add(strings[code])
+    for running_index, student in records[b'RSTD']:
+        runnings[running_index].add_student(students[student])
+
+    quizzes = []
+    questions = iter(records[b'QUES'])
+    for teacher, quiz_id, name, question_count in records[b'QUIZ']:
+        owner = teachers[teacher] if teacher != NONE else None
+        quiz = Quiz(strings[quiz_id], owner, strings[name]) # type: ignore
+        for _ in range(question_count):
+            text, *possible_answers, correct = next(questions)
+            question = Question(strings[text])
+            question.possible_answers = [strings[answer] for answer in possible_answers]
+            question._correct_answer = correct
+            quiz.add_question(question)
+        quizzes.append(quiz)
+    for teacher, quiz_index in records[b'TQUI']:
+        teachers[teacher].quizzes.append(quizzes[quiz_index])
+    offset = 0
+    for student, quiz_index, semester, correct, answer_count in records[b'SUBM']:
+        submission = Submission(quizzes[quiz_index], students[student], strings[semester])
+        submission.answers = answers[offset:offset + answer_count]
+        submission._correct_answers = correct
+        offset += answer_count
+        semester_id = submission.semester_id
+        students[student].quizzes.setdefault(semester_id, {})[submission.quiz_id] = submission
+        quizzes[quiz_index].submissions[(semester_id, students[student].student_id)] = submission
+    return School(departments, teachers, students, quizzes)
@@ -1,5 +1,106 @@
 import datetime
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional, Protocol, Tuple
 
-def get_semester_id():
-    semester = 1 if datetime.datetime.now().month <= 6 else 2
-    return "{}_{}".format(datetime.datetime.now().year, semester)
+
+class Clock(Protocol):
+    """Anything that gives the id of the current semester."""
+
+    def get_semester_id(self) -> str:
+        ...  # pragma: no cover
+
+
+class SemesterClock:
+    """Gives the id of the current semester, as '<year>_<semester>'.
+
+    The id is computed once and kept until the semester ends, so asking for it
+    only costs reading the time.
+
+    Atributes
+    --------
+    _now : callable
+        Returns the current time as a timestamp. Can be replaced in tests.
+    _current : (float, float, str)
+        Start and end timestamps of the cached semester, and its id.
+    """
+    __slots__ = ('_now', '_current')
+
+    def __init__(self, now: Callable[[], float] = time.time) -> None:
+        self._now = now
+        self._current: Tuple[float, float, str] = (0.0, 0.0, '')
+
+    def get_semester_id(self) -> str:
+        now = self._now()
+        starts_at, ends_at, semester_id = self._current
+        if not (starts_at <= now < ends_at):
+            # Replaced all at once, so concurrent readers never mix semesters.
+            self._current = starts_at, ends_at, semester_id = self._semester_at(now)
+        return semester_id
+
+    @staticmethod
+    def _semester_at(timestamp: float) -> Tuple[float, float, str]:
+        """Compute start, end and id of the semester of the given time."""
+        date = datetime.datetime.fromtimestamp(timestamp)
+        if date.month <= 6:
+            semester = 1
+            start = datetime.datetime(date.year, 1, 1)
+            end = datetime.datetime(date.year, 7, 1)
+        else:
+            semester = 2
+            start = datetime.datetime(date.year, 7, 1)
+            end = datetime.datetime(date.year + 1, 1, 1)
+        return start.timestamp(), end.timestamp(), "{}_{}".format(date.year, semester)
+
+
+class FixedSemesterClock:
+    """Always gives the same semester id. Useful for tests and backfills."""
+    __slots__ = ('semester_id',)
+
+    def __init__(self, semester_id: str) -> None:
+        self.semester_id = semester_id
+
+    def get_semester_id(self) -> str:
+        return self.semester_id
+
+
+_clock: Clock = SemesterClock()
+# Clock of the current thread or task, if it does not use the default one.
+_context_clock: ContextVar[Optional[Clock]] = ContextVar('semester_clock', default=None)
+
+
+def get_semester_id() -> str:
+    """Return the id of the current semester, given by the semester clock."""
+    clock = _context_clock.get()
+    return (clock or _clock).get_semester_id()
+
+
+def set_semester_clock(clock: Clock) -> Clock:
+    """Replace the default clock used by get_semester_id. Return the previous one.
+
+    It changes the clock of every thread and task, it is meant for startup.
+    To use another clock only for a while, use semester_clock.
+    """
+    global _clock
+    previous, _clock = _clock, clock
+    return previous
+
+
+@contextmanager
+def semester_clock(clock: Clock) -> Iterator[None]:
+    """Use the given clock for get_semester_id inside a with block.
+
+    Only the current thread, or asyncio task, uses it. Others keep their
+    clock.
+
+    Example: pin a semester while loading old answers.
+
+        with semester_clock(FixedSemesterClock('2019_1')):
+            student.answer_quiz('quiz_01', 1)
+    """
+    token = _context_clock.set(clock)
+    try:
+        yield
+    finally:
+        _context_clock.reset(token)
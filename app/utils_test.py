@@ -1,7 +1,14 @@
+import threading
 from unittest import TestCase
 from datetime import datetime
 
-from classroom.app.utils import get_semester_id
+from classroom.app.utils import (
+    FixedSemesterClock,
+    SemesterClock,
+    get_semester_id,
+    semester_clock,
+    set_semester_clock,
+)
 
 class UtilsTest(TestCase):
 
@@ -12,3 +19,38 @@ class UtilsTest(TestCase):
         res = get_semester_id()
         assert (res == first_semester or res == second_semester)
 
+    def test_semester_clock_changes_on_boundary(self):
+        now = [datetime(2019, 6, 30, 23, 59, 59).timestamp()]
+        clock = SemesterClock(lambda: now[0])
+        assert clock.get_semester_id() == "2019_1"
+        now[0] += 1
+        assert clock.get_semester_id() == "2019_2"
+        now[0] = datetime(2020, 1, 1).timestamp()
+        assert clock.get_semester_id() == "2020_1"
+        # Going back in time is also noticed.
+        now[0] = datetime(2018, 8, 1).timestamp()
+        assert clock.get_semester_id() == "2018_2"
+
+    def test_semester_clock_can_be_pinned(self):
+        with semester_clock(FixedSemesterClock("2019_1")):
+            assert get_semester_id() == "2019_1"
+        assert get_semester_id() != "2019_1"
+
+    def test_pinned_clock_is_only_for_current_thread(self):
+        seen = []
+        with semester_clock(FixedSemesterClock("2019_1")):
+            thread = threading.Thread(target=lambda: seen.append(get_semester_id()))
+            thread.start()
+            thread.join()
+            assert get_semester_id() == "2019_1"
+        assert seen != ["2019_1"]
+
+    def test_default_clock_can_be_replaced(self):
+        previous = set_semester_clock(FixedSemesterClock("2019_2"))
+        try:
+            assert get_semester_id() == "2019_2"
+            with semester_clock(FixedSemesterClock("2019_1")):
+                assert get_semester_id() == "2019_1"
+        finally:
+            set_semester_clock(previous)
+        assert get_semester_id() != "2019_2"
@@ -0,0 +1,59 @@
+"""Benchmark logging answers to disk, and replaying the log.
+
+Run from the directory that contains the project:
+
+    $ python -m classroom.benchmarks.answer_log_bench [students] [sync_every]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from classroom.app.answerlogs import AnswerLog, replay_answer_log
+from classroom.app.entities import Student, Teacher
+from classroom.app.quizzes import Question
+
+QUESTIONS = 50
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    sync_every = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    teacher = Teacher('John', 'Doe', 'JD1966')
+    quiz = teacher.create_quiz('quiz_01', 'Benchmark quiz')
+    for i in range(QUESTIONS):
+        question = Question('Question {}'.format(i))
+        question.add_possible_answer('answer', 1 + i % 4, True)
+        quiz.add_question(question)
+    students = [Student('Student', str(i), 'S{}'.format(i)) for i in range(count)]
+    for student in students:
+        student.subscribe_to_quiz(quiz)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'answers.log')
+        log = AnswerLog(path, sync_every=sync_every)
+        log.attach([quiz])
+        start = time.perf_counter()
+        for position in range(QUESTIONS):
+            for student in students:
+                student.answer_quiz('quiz_01', 1 + position % 4)
+        log.close()
+        logged = time.perf_counter()
+
+        restored = {s.student_id: Student('Student', s.last_name, s.student_id) for s in students}
+        for student in restored.values():
+            student.subscribe_to_quiz(quiz)
+        replayed_start = time.perf_counter()
+        replay_answer_log(path, restored, {'quiz_01': quiz})
+        replayed = time.perf_counter()
+        size = os.path.getsize(path)
+
+    answers = count * QUESTIONS
+    print('{} answers, {:.1f} MB of log, sync every {} records'.format(
+        answers, size / 2 ** 20, sync_every))
+    print('ingest: {:12,.0f} answers/s'.format(answers / (logged - start)))
+    print('replay: {:12,.0f} answers/s'.format(answers / (replayed - replayed_start)))
+
+
+if __name__ == '__main__':
+    main()
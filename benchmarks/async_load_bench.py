@@ -0,0 +1,68 @@
+"""Simulate many students answering quizzes at the same time through asyncio.
+
+Every student is a task that answers the questions of a quiz one by one,
+yielding to the event loop between answers, as requests of a web server do.
+The latency of every answer is measured.
+
+Run from the directory that contains the project:
+
+    $ python -m classroom.benchmarks.async_load_bench [students] [questions]
+"""
+import asyncio
+import random
+import sys
+import time
+from typing import List
+
+from classroom.app.entities import Student, Teacher
+from classroom.app.quizzes import Question
+from classroom.app.services import ClassroomService
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+async def student_session(
+    service: ClassroomService, student_id: str, questions: int, latencies: List[float]
+) -> None:
+    rng = random.Random(student_id)
+    for _ in range(questions):
+        # Requests of a student arrive some time apart.
+        await asyncio.sleep(rng.random() * 0.01)
+        start = time.perf_counter()
+        await service.answer_quiz(student_id, 'quiz_01', rng.randint(1, 4))
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(count: int, questions: int) -> None:
+    teacher = Teacher('John', 'Doe', 'JD1966')
+    quiz = teacher.create_quiz('quiz_01', 'Load quiz')
+    for i in range(questions):
+        question = Question('Question {}'.format(i))
+        question.add_possible_answer('answer', 1 + i % 4, True)
+        quiz.add_question(question)
+    teacher.get_gradebook()
+    service = ClassroomService(Student('Student', str(i), 'S{}'.format(i)) for i in range(count))
+    await asyncio.gather(*(service.assign_quiz(sid, quiz) for sid in service.students))
+
+    latencies: List[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        student_session(service, sid, questions, latencies) for sid in service.students
+    ))
+    elapsed = time.perf_counter() - start
+    print('{} concurrent students, {} answers in {:.2f} s'.format(count, len(latencies), elapsed))
+    print('p50: {:8.1f} us'.format(percentile(latencies, 0.50) * 1e6))
+    print('p99: {:8.1f} us'.format(percentile(latencies, 0.99) * 1e6))
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    questions = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    asyncio.run(run(count, questions))
+
+
+if __name__ == '__main__':
+    main()
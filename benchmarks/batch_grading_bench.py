@@ -0,0 +1,72 @@
+"""Benchmark grading every student of a large running course at once.
+
+Every student is assigned the same quizzes and answers them at random. The
+time to collect the answers in a matrix and the time to score it are shown
+separately, and compared with grading the students one by one.
+
+Run from the directory that contains the project:
+
+    $ python -m classroom.benchmarks.batch_grading_bench [students] [quizzes]
+
+Defaults are 100000 students and 50 quizzes.
+"""
+import random
+import sys
+import time
+
+from classroom.app.entities import Student, Teacher
+from classroom.app.grading import AnswerMatrix
+from classroom.app.quizzes import Question, Quiz
+from classroom.app.utils import get_semester_id
+
+QUESTIONS_PER_QUIZ = 10
+
+
+def build_students(count: int, quiz_count: int):
+    """Create students with every quiz assigned and answered at random."""
+    rng = random.Random(0)
+    teacher = Teacher('John', 'Doe', 'JD1966')
+    quizzes = []
+    for q in range(quiz_count):
+        quiz = Quiz('quiz_{}'.format(q), teacher, 'Quiz {}'.format(q))
+        for i in range(QUESTIONS_PER_QUIZ):
+            question = Question('Question {}'.format(i))
+            question.add_possible_answer('answer', rng.randint(1, 4), True)
+            quiz.add_question(question)
+        quizzes.append(quiz)
+    students = []
+    for s in range(count):
+        student = Student('Student', str(s), 'S{}'.format(s))
+        for quiz in quizzes:
+            student.subscribe_to_quiz(quiz)
+            student.answer_quiz_batch(quiz.quiz_id, [
+                rng.randint(1, 4) for _ in range(rng.randint(0, QUESTIONS_PER_QUIZ))
+            ])
+        students.append(student)
+    return students
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    quiz_count = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    students = build_students(count, quiz_count)
+    semester = get_semester_id()
+
+    start = time.perf_counter()
+    matrix = AnswerMatrix.build(students, semester)
+    built = time.perf_counter()
+    matrix.totals()
+    scored = time.perf_counter()
+    for student in students:
+        student.get_score_for_semester(semester)
+    one_by_one = time.perf_counter()
+
+    print('{} students x {} quizzes x {} questions'.format(
+        count, quiz_count, QUESTIONS_PER_QUIZ))
+    print('build matrix:  {:8.3f} s'.format(built - start))
+    print('score matrix:  {:8.3f} s'.format(scored - built))
+    print('one by one:    {:8.3f} s'.format(one_by_one - scored))
+
+
+if __name__ == '__main__':
+    main()
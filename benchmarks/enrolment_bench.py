@@ -0,0 +1,50 @@
+"""Benchmark enroling many students in many running courses.
+
+Every student is enroled twice in the same course, as a sync that runs again
+would do, and then every enrolment is checked.
+
+Run from the directory that contains the project:
+
+    $ python -m classroom.benchmarks.enrolment_bench [students] [runnings]
+"""
+import sys
+import time
+
+from classroom.app.courses import Department
+from classroom.app.entities import Student
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    running_count = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    department = Department('Department of Mathematics', 'DEPOM')
+    runnings = [
+        department.mark_course_as_running(
+            department.add_course('Course {}'.format(i), 'C{}'.format(i)), '2019'
+        )
+        for i in range(running_count)
+    ]
+    students = [Student('Student', str(i), 'S{}'.format(i)) for i in range(count)]
+
+    start = time.perf_counter()
+    for i, student in enumerate(students):
+        student.enrol(runnings[i % running_count])
+    enroled = time.perf_counter()
+    for i, student in enumerate(students):
+        student.enrol(runnings[i % running_count])
+    enroled_again = time.perf_counter()
+    for i, student in enumerate(students):
+        running = runnings[i % running_count]
+        assert running.has_student(student.student_id)
+        assert student.is_enroled(running.running_course_code)
+    checked = time.perf_counter()
+
+    print('{} students in {} runnings'.format(count, running_count))
+    print('enrol:        {:8.3f} s'.format(enroled - start))
+    print('enrol again:  {:8.3f} s'.format(enroled_again - enroled))
+    print('membership:   {:8.3f} s'.format(checked - enroled_again))
+    print('students in first running: {}'.format(len(runnings[0].get_students())))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark the memory used by every domain entity.
+
+The entities define ``__slots__``. To compare with instances that have a
+``__dict__``, as they had before, every class is also measured through a copy
+of it, and of its bases, without ``__slots__``. A subclass would not do: it
+would still carry the slots of the class besides the ``__dict__``.
+
+Run from the directory that contains the project:
+
+    $ python -m classroom.benchmarks.entity_memory_bench
+"""
+import tracemalloc
+from typing import Callable, Dict, List
+
+from classroom.app.courses import Course, CourseRunning, Department
+from classroom.app.entities import Person, Student, Teacher
+from classroom.app.quizzes import Question, Quiz, Submission
+
+COUNT = 10000
+
+
+def with_dict(cls: type, copies: Dict[type, type]) -> type:
+    """Return a copy of cls, and of its bases, without __slots__."""
+    if cls is object:
+        return cls
+    if cls not in copies:
+        slots = cls.__dict__.get('__slots__', ())
+        namespace = {
+            name: value for name, value in cls.__dict__.items()
+            if name not in slots and name not in ('__slots__', '__dict__', '__weakref__')
+        }
+        bases = tuple(with_dict(base, copies) for base in cls.__bases__)
+        copies[cls] = type(cls.__name__, bases, namespace)
+    return copies[cls]
+
+
+def bytes_per_instance(create: Callable[[int], object]) -> float:
+    """Measure memory allocated by creating COUNT objects, per object."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects: List[object] = [create(i) for i in range(COUNT)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list holding the objects is not part of them.
+    total = after - before - objects.__sizeof__()
+    return total / COUNT
+
+
+def factories(slotted: bool):
+    """Build a creator for every entity, using the real or the dict classes."""
+    classes = [Person, Student, Teacher, Question, Quiz, Submission, Course,
+               CourseRunning, Department]
+    if not slotted:
+        copies: Dict[type, type] = {}
+        classes = [with_dict(cls, copies) for cls in classes]
+    (person, student, teacher, question, quiz, submission, course, running,
+     department) = classes
+    a_department = department('Department of Mathematics', 'DEPOM')
+    a_course = course('Mathematics', 'MAT', a_department)
+    a_teacher = teacher('John', 'Doe', 'JD1966')
+    a_student = student('Gonzalo', 'Amadio', 'GA1988')
+    a_quiz = quiz('quiz_01', a_teacher, 'Mathematics Quiz Number 1')
+    return [
+        ('Person', lambda i: person('Gonzalo', 'Amadio')),
+        ('Student', lambda i: student('Gonzalo', 'Amadio', 'GA1988')),
+        ('Teacher', lambda i: teacher('John', 'Doe', 'JD1966')),
+        ('Question', lambda i: question('How much is 1 + 1?')),
+        ('Quiz', lambda i: quiz('quiz_01', a_teacher, 'Mathematics Quiz Number 1')),
+        ('Submission', lambda i: submission(a_quiz, a_student, '2019_1')),
+        ('Course', lambda i: course('Mathematics', 'MAT', a_department)),
+        ('CourseRunning', lambda i: running(a_course, '2019')),
+        ('Department', lambda i: department('Department of Mathematics', 'DEPOM')),
+    ]
+
+
+def main() -> None:
+    print('{:<14} {:>12} {:>12}'.format('entity', '__dict__', '__slots__'))
+    for (name, create_dict), (_, create_slots) in zip(factories(False), factories(True)):
+        print('{:<14} {:>12.0f} {:>12.0f}'.format(
+            name, bytes_per_instance(create_dict), bytes_per_instance(create_slots)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark exporting the grades of a large school to CSV.
+
+A school is imported from a roster, every teacher gives a few quizzes to the
+students of their courses, and the grades are written to a temporary file as
+they are produced. Rows per second and the memory grown while exporting are
+shown, compared with building every row in a list first.
+
+Run from the directory that contains the project:
+
+    $ python -m classroom.benchmarks.grade_export_bench [rows] [quizzes]
+"""
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+from classroom.app.exports import iter_grade_rows, write_grades_csv
+from classroom.app.quizzes import Question
+from classroom.app.roster import RosterImporter
+from classroom.app.utils import FixedSemesterClock, semester_clock
+from classroom.benchmarks.roster_import_bench import write_roster
+
+SEMESTER = '2019_1'
+QUESTIONS_PER_QUIZ = 10
+
+
+def peak_memory() -> float:
+    """Peak memory of the process, in MB. ru_maxrss is in kilobytes on linux."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def build_school(rows: int, quiz_count: int) -> RosterImporter:
+    """Import a roster and assign quizzes of every teacher to their students."""
+    rng = random.Random(0)
+    importer = RosterImporter()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'roster.csv')
+        write_roster(path, rows)
+        with open(path, newline='') as roster:
+            importer.import_csv(roster)
+    with semester_clock(FixedSemesterClock(SEMESTER)):
+        for running in importer.runnings.values():
+            teacher = running.teacher
+            for q in range(quiz_count):
+                quiz_id = '{}_{}'.format(running.running_course_code, q)
+                quiz = teacher.create_quiz(quiz_id, 'Quiz')
+                for i in range(QUESTIONS_PER_QUIZ):
+                    question = Question('Question {}'.format(i))
+                    question.add_possible_answer('answer', rng.randint(1, 4), True)
+                    quiz.add_question(question)
+                for student in running.get_students():
+                    student.subscribe_to_quiz(quiz)
+                    student.answer_quiz_batch(
+                        quiz.quiz_id,
+                        [rng.randint(1, 4) for _ in range(rng.randint(0, QUESTIONS_PER_QUIZ))],
+                    )
+    return importer
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    quiz_count = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    school = build_school(rows, quiz_count)
+    departments = list(school.departments.values())
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'grades.csv')
+        before = peak_memory()
+        start = time.perf_counter()
+        with open(path, 'w', newline='') as stream:
+            count = write_grades_csv(stream, iter_grade_rows(departments, SEMESTER))
+        streamed = time.perf_counter() - start
+        streamed_memory = peak_memory() - before
+
+        before = peak_memory()
+        start = time.perf_counter()
+        grades = list(iter_grade_rows(departments, SEMESTER))
+        with open(path, 'w', newline='') as stream:
+            write_grades_csv(stream, grades)
+        listed = time.perf_counter() - start
+        listed_memory = peak_memory() - before
+    print('{} grade rows'.format(count))
+    print('streamed:   {:8.3f}s {:10,.0f} rows/s, peak memory grew {:6.1f} MB'.format(
+        streamed, count / streamed, streamed_memory))
+    print('in a list:  {:8.3f}s {:10,.0f} rows/s, peak memory grew {:6.1f} MB'.format(
+        listed, count / listed, listed_memory))
+
+
+if __name__ == '__main__':
+    main()
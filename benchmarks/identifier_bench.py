@@ -0,0 +1,74 @@
+"""Benchmark keeping ids as fresh strings, interned strings or integer keys.
+
+Every student has the codes of the running courses they are enroled in, as
+they would be read from a file: a new string for every row. The memory of
+those lists is measured keeping the strings as read, interning them, and
+replacing them by the keys of an IdRegistry in arrays. Then the time to look
+ids up in an index is measured for every kind of key.
+
+Run from the directory that contains the project:
+
+    $ python -m classroom.benchmarks.identifier_bench [students] [classes]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+
+from classroom.app.identifiers import IdRegistry
+
+RUNNINGS = 2000
+
+
+def read_code(number: int) -> str:
+    """A running course code, as a new string like the ones read from a file."""
+    return 'COURSE{}_2019'.format(number)
+
+
+def measure(build):
+    """Return what build returns and the memory it keeps, in MB."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size / 2 ** 20
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    classes = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    enrolments = [
+        [(s * 7919 + c * 104729) % RUNNINGS for c in range(classes)] for s in range(count)
+    ]
+    registry = IdRegistry()
+
+    fresh, fresh_size = measure(
+        lambda: [[read_code(n) for n in row] for row in enrolments])
+    interned, interned_size = measure(
+        lambda: [[sys.intern(read_code(n)) for n in row] for row in enrolments])
+    keys, keys_size = measure(
+        lambda: [registry.keys(read_code(n) for n in row) for row in enrolments])
+    print('{} students in {} classes each, {} running courses'.format(count, classes, RUNNINGS))
+    print('fresh strings:    {:8.1f} MB'.format(fresh_size))
+    print('interned strings: {:8.1f} MB'.format(interned_size))
+    print('integer keys:     {:8.1f} MB'.format(keys_size))
+
+    index = {registry.id(key): key for key in range(len(registry))}
+    by_key = list(range(len(registry)))
+    for name, rows, lookup in (
+        ('fresh strings', fresh, index.__getitem__),
+        ('interned strings', interned, index.__getitem__),
+        ('integer keys', keys, by_key.__getitem__),
+    ):
+        start = time.perf_counter()
+        for row in rows:
+            for value in row:
+                lookup(value)
+        elapsed = time.perf_counter() - start
+        print('{:17} {:8.0f} ns per lookup'.format(
+            name + ':', elapsed / (count * classes) * 1e9))
+
+
+if __name__ == '__main__':
+    main()
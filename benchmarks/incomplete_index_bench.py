@@ -0,0 +1,56 @@
+"""Benchmark finding the students with unfinished quizzes in a semester.
+
+A school is generated, and the students to remind are found going through
+every submission of every student, and reading them from an IncompleteIndex
+kept while the students answered.
+
+Run from the directory that contains the project:
+
+    $ python -m classroom.benchmarks.incomplete_index_bench [students]
+"""
+import sys
+import time
+
+from classroom.app.courses import CourseRegistry
+from classroom.app.reminders import IncompleteIndex
+from classroom.app.utils import get_semester_id
+from classroom.tests.generators import generate_school
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    semester_id = get_semester_id()
+    school = generate_school(
+        departments=5, courses_per_department=20, teachers=50, students=count,
+        semester_id=semester_id, registry=CourseRegistry(),
+    )
+    index = IncompleteIndex(semester_id)
+    index.track(school.quizzes)
+    # Most students finish their quizzes, a few are left to remind.
+    for i, student in enumerate(school.students.values()):
+        if i % 50:
+            for submission in student.quizzes[semester_id].values():
+                left = len(submission.quiz.questions) - len(submission.answers)
+                submission.answer_next_questions([1] * left)
+
+    start = time.perf_counter()
+    walked = {
+        student.student_id
+        for student in school.students.values()
+        for submission in student.quizzes.get(semester_id, {}).values()
+        if not submission.is_finished
+    }
+    walking = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = {submission.student.student_id for submission in index}
+    reading = time.perf_counter() - start
+    assert walked == indexed
+
+    print('{} students, {} to remind'.format(count, len(indexed)))
+    print('walking every student: {:8.4f}s'.format(walking))
+    print('reading the index:     {:8.4f}s ({:.0f}x)'.format(reading, walking / reading))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark item analytics of a quiz answered by many students.
+
+Statistics are kept while the students answer, and then computed again from
+scratch over every submission. The cost per answer of keeping them, the time
+to read the kept ones and the time to compute them at once are shown.
+
+Run from the directory that contains the project:
+
+    $ python -m classroom.benchmarks.item_analytics_bench [students] [questions]
+"""
+import random
+import sys
+import time
+
+from classroom.app.analytics import ItemAnalytics
+from classroom.app.entities import Student, Teacher
+from classroom.app.quizzes import Question
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    questions = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rng = random.Random(0)
+    teacher = Teacher('John', 'Doe', 'JD1966')
+    quiz = teacher.create_quiz('quiz', 'Quiz')
+    for i in range(questions):
+        question = Question('Question {}'.format(i))
+        question.add_possible_answer('answer', rng.randint(1, 4), True)
+        quiz.add_question(question)
+    students = [Student('Student', str(s), 'S{}'.format(s)) for s in range(count)]
+    for student in students:
+        student.subscribe_to_quiz(quiz)
+    answers = [[rng.randint(1, 4) for _ in range(questions)] for _ in students]
+
+    start = time.perf_counter()
+    for student, chosen in zip(students, answers):
+        for answer in chosen[:questions // 2]:
+            student.answer_quiz('quiz', answer)
+    plain = time.perf_counter() - start
+
+    analytics = ItemAnalytics(quiz)
+    analytics.track()
+    start = time.perf_counter()
+    for student, chosen in zip(students, answers):
+        for answer in chosen[questions // 2:]:
+            student.answer_quiz('quiz', answer)
+    tracked = time.perf_counter() - start
+    answered = count * (questions - questions // 2)
+    start = time.perf_counter()
+    analytics.point_biserial()
+    folded = time.perf_counter() - start
+
+    start = time.perf_counter()
+    from_scratch = ItemAnalytics(quiz)
+    from_scratch.track()
+    computed = time.perf_counter() - start
+    start = time.perf_counter()
+    from_scratch.difficulty()
+    from_scratch.option_distribution()
+    from_scratch.point_biserial()
+    queried = time.perf_counter() - start
+
+    print('{} students, {} questions'.format(count, questions))
+    print('answer without analytics: {:8.0f} ns'.format(plain / (count * (questions // 2)) * 1e9))
+    print('answer with analytics:    {:8.0f} ns'.format(tracked / answered * 1e9))
+    print('kept statistics read:     {:8.3f}s'.format(folded))
+    print('computed from scratch:    {:8.3f}s'.format(computed))
+    print('statistics read:          {:8.6f}s'.format(queried))
+
+
+if __name__ == '__main__':
+    main()
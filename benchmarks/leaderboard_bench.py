@@ -0,0 +1,88 @@
+"""Benchmark ranking the students of a large running course.
+
+Every page view asks for the top students, the rank and the percentile of a
+student. They are computed sorting the scores of every student, and read
+from a Leaderboard kept up to date while the students answer.
+
+Run from the directory that contains the project:
+
+    $ python -m classroom.benchmarks.leaderboard_bench [students] [views]
+"""
+import random
+import sys
+import time
+
+from classroom.app.courses import CourseRunning
+from classroom.app.entities import Student, Teacher
+from classroom.app.quizzes import Question
+from classroom.tests.factories import CourseFactory
+
+QUIZZES = 5
+QUESTIONS_PER_QUIZ = 10
+TOP = 10
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    views = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    rng = random.Random(0)
+    teacher = Teacher('John', 'Doe', 'JD1966')
+    running = CourseRunning(CourseFactory(), '2019', teacher)
+    quizzes = []
+    for q in range(QUIZZES):
+        quiz = teacher.create_quiz('quiz_{}'.format(q), 'Quiz')
+        for i in range(QUESTIONS_PER_QUIZ):
+            question = Question('Question {}'.format(i))
+            question.add_possible_answer('answer', rng.randint(1, 4), True)
+            quiz.add_question(question)
+        quizzes.append(quiz)
+    students = [Student('Student', str(s), 'S{}'.format(s)) for s in range(count)]
+    for student in students:
+        student.enrol(running)
+        for quiz in quizzes:
+            teacher.assign_quiz_to_student(student, quiz)
+
+    # The gradebook is kept in both runs, only the leaderboard cost is compared.
+    teacher.get_gradebook()
+    start = time.perf_counter()
+    for student in students:
+        for quiz in quizzes:
+            student.answer_quiz_batch(quiz.quiz_id, [rng.randint(1, 4) for _ in range(5)])
+    plain = time.perf_counter() - start
+
+    leaderboard = running.get_leaderboard()
+    start = time.perf_counter()
+    for student in students:
+        for quiz in quizzes:
+            student.answer_quiz_batch(quiz.quiz_id, [rng.randint(1, 4) for _ in range(5)])
+    ranked = time.perf_counter() - start
+
+    asked = [rng.choice(students).student_id for _ in range(views)]
+    start = time.perf_counter()
+    for student_id in asked:
+        scores = sorted(
+            ((s.get_score_for_semester(), s.student_id) for s in running.get_students()),
+            reverse=True,
+        )
+        scores[:TOP]
+        position = next(i for i, (_, sid) in enumerate(scores) if sid == student_id)
+        position / len(scores)
+    sorting = (time.perf_counter() - start) / views
+
+    start = time.perf_counter()
+    for student_id in asked:
+        leaderboard.top(TOP)
+        leaderboard.rank(student_id)
+        leaderboard.percentile(student_id)
+    indexed = (time.perf_counter() - start) / views
+
+    answers = count * QUIZZES
+    print('{} students, {} page views'.format(count, views))
+    print('answer without leaderboard: {:10.0f} ns'.format(plain / answers * 1e9))
+    print('answer with leaderboard:    {:10.0f} ns'.format(ranked / answers * 1e9))
+    print('page view sorting:          {:10.6f}s'.format(sorting))
+    print('page view leaderboard:      {:10.6f}s ({:.0f}x)'.format(indexed, sorting / indexed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""Benchmark the cost of recording metrics of the hot paths.
+
+The same students answer quizzes with instrumentation never enabled, enabled,
+and disabled again, and the time per answer is compared. Students are built
+again for every run, so every run answers the same questions.
+
+Run from the directory that contains the project:
+
+    $ python -m classroom.benchmarks.metrics_overhead_bench [students] [quizzes]
+"""
+import sys
+import time
+
+from classroom.app import metrics
+from classroom.benchmarks.batch_grading_bench import build_students
+
+
+def answer_all(students) -> float:
+    """Answer one question of every quiz of every student, in ns per answer."""
+    count = 0
+    start = time.perf_counter()
+    for student in students:
+        for submissions in student.quizzes.values():
+            for quiz_id in submissions:
+                student.answer_quiz(quiz_id, 1)
+                count += 1
+    return (time.perf_counter() - start) / count * 1e9
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    quiz_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    students = build_students(count, quiz_count)
+    print('never enabled:  {:8.0f} ns per answer'.format(answer_all(students)))
+    students = build_students(count, quiz_count)
+    metrics.enable()
+    print('enabled:        {:8.0f} ns per answer'.format(answer_all(students)))
+    metrics.disable()
+    students = build_students(count, quiz_count)
+    print('disabled again: {:8.0f} ns per answer'.format(answer_all(students)))
+    recorded = metrics.snapshot()['Student.answer_quiz']
+    print('recorded {} calls, outcomes: {}'.format(recorded['count'], recorded['outcomes']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""Benchmark grading a large running course with many processes.
+
+The matrix of answers is built in this process and put in shared memory,
+then every process scores a slice of the students. The time is compared
+with grading in this process, for different numbers of processes. Only
+scoring is split, and processes are spawned, which takes a fraction of a
+second, so it only gets faster with many students and as many cores.
+
+Run from the directory that contains the project:
+
+    $ python -m classroom.benchmarks.parallel_grading_bench [students] [quizzes]
+"""
+import os
+import sys
+import time
+
+from classroom.app.grading import grade_students, grade_students_parallel
+from classroom.app.utils import get_semester_id
+from classroom.benchmarks.batch_grading_bench import build_students
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    quiz_count = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    students = build_students(count, quiz_count)
+    semester = get_semester_id()
+
+    start = time.perf_counter()
+    expected = grade_students(students, semester)
+    single = time.perf_counter() - start
+    print('{} students, {} quizzes'.format(count, quiz_count))
+    print('one process:      {:8.3f}s'.format(single))
+    processes = 2
+    while processes <= max(os.cpu_count() or 1, 2):
+        start = time.perf_counter()
+        totals = grade_students_parallel(students, semester, processes)
+        elapsed = time.perf_counter() - start
+        assert totals == expected
+        print('{:2} processes:     {:8.3f}s ({:.2f}x)'.format(
+            processes, elapsed, single / elapsed))
+        processes *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""Benchmark answer submission on quizzes of growing size.
+
+Answering a quiz end to end should cost time proportional to its number of
+questions, so the throughput (answers per second) must stay flat while the
+quiz grows.
+
+Run from the directory that contains the project:
+
+    $ python -m classroom.benchmarks.quiz_answer_bench
+"""
+import time
+
+from classroom.app.entities import Student, Teacher
+from classroom.app.quizzes import Question, Quiz, Submission
+
+SIZES = (10, 100, 1000, 10000, 100000)
+
+
+def build_quiz(size: int) -> Quiz:
+    """Create a quiz with `size` questions, all with option 1 as correct."""
+    quiz = Quiz('bench', Teacher('John', 'Doe', 'JD1966'), 'Benchmark quiz')
+    for i in range(size):
+        question = Question('Question {}'.format(i))
+        question.add_possible_answer('answer', 1, True)
+        quiz.add_question(question)
+    return quiz
+
+
+def answer_throughput(size: int) -> float:
+    """Answer every question of a quiz and return answers per second."""
+    submission = Submission(build_quiz(size), Student('Jane', 'Doe', 'S1'), '2019_1')
+    start = time.perf_counter()
+    for i in range(size):
+        submission.answer_next_question(1 + i % 4)
+    elapsed = time.perf_counter() - start
+    return size / elapsed
+
+
+def main() -> None:
+    print('{:>10} {:>16}'.format('questions', 'answers/s'))
+    for size in SIZES:
+        print('{:>10} {:>16,.0f}'.format(size, answer_throughput(size)))
+
+
+if __name__ == '__main__':
+    main()
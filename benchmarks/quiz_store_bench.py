@@ -0,0 +1,53 @@
+"""Benchmark opening a large quiz store and reading quizzes from it.
+
+Run from the directory that contains the project:
+
+    $ python -m classroom.benchmarks.quiz_store_bench [quizzes]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from classroom.app.entities import Teacher
+from classroom.app.quizstores import QuizStore, write_quiz_store
+from classroom.app.quizzes import Question, Quiz
+
+QUESTIONS_PER_QUIZ = 20
+
+
+def quizzes(count: int, teacher: Teacher):
+    """Generate quizzes one by one, so they are never all in memory."""
+    for q in range(count):
+        quiz = Quiz('quiz_{}'.format(q), teacher, 'Quiz {}'.format(q))
+        for i in range(QUESTIONS_PER_QUIZ):
+            question = Question('Question {} of quiz {}, what is the answer?'.format(i, q))
+            for position in range(1, 5):
+                question.add_possible_answer('Answer {}'.format(position), position, position == 2)
+            quiz.add_question(question)
+        yield quiz
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    teacher = Teacher('John', 'Doe', 'JD1966')
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'quizzes.bin')
+        with open(path, 'wb') as stream:
+            write_quiz_store(stream, quizzes(count, teacher))
+        size = os.path.getsize(path)
+        start = time.perf_counter()
+        store = QuizStore(path)
+        opened = time.perf_counter()
+        for q in range(0, count, max(count // 1000, 1)):
+            quiz = store.get_quiz('quiz_{}'.format(q), teacher)
+            quiz.questions[0].is_answer_correct(2)
+        read = time.perf_counter()
+        store.close()
+    print('{} quizzes x {} questions: {:.1f} MB'.format(count, QUESTIONS_PER_QUIZ, size / 2 ** 20))
+    print('open store:       {:8.3f} s'.format(opened - start))
+    print('read 1000 quizzes: {:7.3f} s'.format(read - opened))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark importing a large roster file.
+
+A roster with one enrolment per row is written to a temporary file and then
+imported, reporting the rows imported per second and the peak memory of
+the process.
+
+Run from the directory that contains the project:
+
+    $ python -m classroom.benchmarks.roster_import_bench [rows]
+"""
+import csv
+import os
+import sys
+import resource
+import tempfile
+
+from classroom.app.roster import COLUMNS, RosterImporter
+
+STUDENTS_PER_RUNNING = 50
+RUNNINGS_PER_STUDENT = 5
+
+
+def write_roster(path: str, rows: int) -> None:
+    """Write a roster where every student is in RUNNINGS_PER_STUDENT courses."""
+    runnings = rows // STUDENTS_PER_RUNNING
+    with open(path, 'w', newline='') as roster:
+        writer = csv.writer(roster)
+        writer.writerow(COLUMNS)
+        for i in range(rows):
+            student = i // RUNNINGS_PER_STUDENT
+            running = (student + (i % RUNNINGS_PER_STUDENT) * 7919) % runnings
+            department = running % 20
+            writer.writerow((
+                'D{}'.format(department), 'Department {}'.format(department),
+                'C{}'.format(running), 'Course {}'.format(running), '2019',
+                'T{}'.format(running // 3), 'Teacher', str(running // 3),
+                'S{}'.format(student), 'Student', str(student),
+            ))
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'roster.csv')
+        write_roster(path, rows)
+        importer = RosterImporter()
+        with open(path, newline='') as roster:
+            importer.import_csv(roster)
+    # Kilobytes on linux.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    print('{} rows, {} students, {} teachers, {} runnings'.format(
+        importer.rows, len(importer.students), len(importer.teachers),
+        len(importer.runnings)))
+    print('{:,.0f} rows/s'.format(importer.rows_per_second))
+    print('peak memory: {:.1f} MB'.format(peak / 2 ** 20))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""Benchmark saving and loading a snapshot of a school.
+
+Run from the directory that contains the project:
+
+    $ python -m classroom.benchmarks.snapshot_bench [students] [quizzes]
+"""
+import io
+import sys
+import time
+
+from classroom.app.courses import CourseRegistry, Department
+from classroom.app.snapshots import load_snapshot, save_snapshot
+from classroom.benchmarks.batch_grading_bench import build_students
+
+STUDENTS_PER_RUNNING = 50
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    quiz_count = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    students = build_students(count, quiz_count)
+    department = Department('Department of Mathematics', 'DEPOM')
+    for i in range(0, count, STUDENTS_PER_RUNNING):
+        course = department.add_course('Course {}'.format(i), 'C{}'.format(i))
+        running = department.mark_course_as_running(course, '2019')
+        for student in students[i:i + STUDENTS_PER_RUNNING]:
+            student.enrol(running)
+
+    stream = io.BytesIO()
+    start = time.perf_counter()
+    save_snapshot(stream, [department], students=students)
+    saved = time.perf_counter()
+    stream.seek(0)
+    school = load_snapshot(stream, CourseRegistry())
+    loaded = time.perf_counter()
+
+    size = len(stream.getvalue())
+    print('{} students, {} quizzes: {:.1f} MB'.format(
+        len(school.students), len(school.quizzes), size / 2 ** 20))
+    print('save: {:8.3f} s {:8.1f} MB/s'.format(saved - start, size / 2 ** 20 / (saved - start)))
+    print('load: {:8.3f} s {:8.1f} MB/s'.format(loaded - saved, size / 2 ** 20 / (loaded - saved)))
+
+
+if __name__ == '__main__':
+    main()
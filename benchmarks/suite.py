@@ -0,0 +1,155 @@
+"""Time the hot paths of the classroom at several scales, and keep the results.
+
+A school is generated for every scale, and these operations are timed on it:
+enroling students, answering quizzes, computing the score of a student for
+the semester and the score of a submission. Results are written as JSON, with the
+commit they were measured on, and can be compared with a previous run to find
+regressions.
+
+Run from the directory that contains the project:
+
+    $ python -m classroom.benchmarks.suite [results.json] [baseline.json] [scales]
+
+scales is a comma separated list of the names in SCALES, all of them if not
+given. Operations more than 10% slower than in the baseline are marked.
+"""
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, Optional
+
+from classroom.app.courses import CourseRegistry
+from classroom.app.entities import Student
+from classroom.app.utils import get_semester_id
+from classroom.tests.generators import generate_school
+
+SCALES = {
+    'small': dict(departments=2, courses_per_department=10, teachers=10, students=1000),
+    'medium': dict(departments=5, courses_per_department=20, teachers=50, students=10000),
+    'large': dict(departments=10, courses_per_department=50, teachers=200, students=50000),
+}
+
+# Slower than the baseline by more than this is a regression.
+TOLERANCE = 1.10
+
+Result = Dict[str, float]
+
+
+def timed(operation: Callable[[], int]) -> Result:
+    """Run operation, which returns how many operations it did, and time it."""
+    start = time.perf_counter()
+    count = operation()
+    seconds = time.perf_counter() - start
+    return {
+        'operations': count,
+        'seconds': seconds,
+        'ns_per_op': seconds / count * 1e9 if count else 0.0,
+    }
+
+
+def run_scale(sizes: Dict[str, int]) -> Dict[str, Result]:
+    """Generate a school of the given sizes and time every operation on it."""
+    semester_id = get_semester_id()
+    school = generate_school(semester_id=semester_id, registry=CourseRegistry(), **sizes)
+    students = list(school.students.values())
+    runnings = [
+        running
+        for department in school.departments.values()
+        for course in department.get_courses().values()
+        for running in course.get_runnings()
+    ]
+    new_students = [Student('New', str(s), 'N{}'.format(s)) for s in range(len(students))]
+
+    def enrol() -> int:
+        for s, student in enumerate(new_students):
+            student.enrol(runnings[s % len(runnings)])
+        return len(new_students)
+
+    def answer_quiz() -> int:
+        count = 0
+        for student in students:
+            for quiz_id in student.quizzes.get(semester_id, {}):
+                student.answer_quiz(quiz_id, 1)
+                count += 1
+        return count
+
+    def get_score_for_semester() -> int:
+        for student in students:
+            student.get_score_for_semester(semester_id)
+        return len(students)
+
+    submissions = [
+        submission
+        for quiz in school.quizzes
+        for submission in quiz.submissions.values()
+        if submission.semester_id == semester_id
+    ]
+
+    def submission_get_score() -> int:
+        for submission in submissions:
+            submission.get_score()
+        return len(submissions)
+
+    return {
+        'Student.enrol': timed(enrol),
+        'Student.answer_quiz': timed(answer_quiz),
+        'Student.get_score_for_semester': timed(get_score_for_semester),
+        'Submission.get_score': timed(submission_get_score),
+    }
+
+
+def current_commit() -> Optional[str]:
+    """Return the commit of the project, if it is a git checkout."""
+    try:
+        output = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def compare(results: Dict, baseline: Dict) -> None:
+    """Print the time of every operation relative to the baseline."""
+    for scale, operations in results['results'].items():
+        for name, result in operations.items():
+            previous = baseline['results'].get(scale, {}).get(name)
+            if not previous or not previous['ns_per_op']:
+                continue
+            ratio = result['ns_per_op'] / previous['ns_per_op']
+            print('{:8} {:32} {:6.2f}x{}'.format(
+                scale, name, ratio, '  SLOWER' if ratio > TOLERANCE else ''))
+
+
+def main() -> None:
+    output = sys.argv[1] if len(sys.argv) > 1 else 'benchmark_results.json'
+    baseline_path = sys.argv[2] if len(sys.argv) > 2 and sys.argv[2] else None
+    names = sys.argv[3].split(',') if len(sys.argv) > 3 else list(SCALES)
+
+    scale_results: Dict[str, Dict[str, Result]] = {}
+    results = {
+        'commit': current_commit(),
+        'python': platform.python_version(),
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'results': scale_results,
+    }
+    for name in names:
+        scale_results[name] = operations = run_scale(SCALES[name])
+        for operation, result in operations.items():
+            print('{:8} {:32} {:10,.0f} ops {:10.0f} ns/op'.format(
+                name, operation, result['operations'], result['ns_per_op']))
+    with open(output, 'w') as stream:
+        json.dump(results, stream, indent=2)
+    print('results written to {}'.format(output))
+    if baseline_path:
+        with open(baseline_path) as stream:
+            compare(results, json.load(stream))
+
+
+if __name__ == '__main__':
+    main()
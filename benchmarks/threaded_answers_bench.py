@@ -0,0 +1,64 @@
+"""Benchmark answering quizzes from a growing number of threads.
+
+Every thread answers for its own students, through a ThreadSafeClassroom.
+With the GIL, throughput shows the cost of the locks rather than a speed up.
+It is measured with and without a gradebook of the teacher, which every
+answer updates, to show what the gradebook adds.
+
+Run from the directory that contains the project:
+
+    $ python -m classroom.benchmarks.threaded_answers_bench [students]
+"""
+import sys
+import threading
+import time
+
+from classroom.app.concurrency import ThreadSafeClassroom
+from classroom.app.entities import Student, Teacher
+from classroom.app.quizzes import Question
+
+QUESTIONS = 20
+THREAD_COUNTS = (1, 2, 4, 8, 16)
+
+
+def throughput(count: int, threads: int, gradebook: bool) -> float:
+    """Answer every question for count students, return answers per second."""
+    teacher = Teacher('John', 'Doe', 'JD1966')
+    quiz = teacher.create_quiz('quiz_01', 'Benchmark quiz')
+    for i in range(QUESTIONS):
+        question = Question('Question {}'.format(i))
+        question.add_possible_answer('answer', 1 + i % 4, True)
+        quiz.add_question(question)
+    if gradebook:
+        teacher.get_gradebook()
+    students = [Student('Student', str(i), 'S{}'.format(i)) for i in range(count)]
+    classroom = ThreadSafeClassroom(students)
+    for student in students:
+        classroom.assign_quiz(student.student_id, quiz)
+
+    def work(n: int) -> None:
+        own = [s.student_id for s in students[n::threads]]
+        for _ in range(QUESTIONS):
+            for student_id in own:
+                classroom.answer_quiz(student_id, 'quiz_01', 1)
+
+    workers = [threading.Thread(target=work, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return count * QUESTIONS / (time.perf_counter() - start)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print('{:>8} {:>14} {:>14}'.format('threads', 'answers/s', 'no gradebook'))
+    for threads in THREAD_COUNTS:
+        print('{:>8} {:>14,.0f} {:>14,.0f}'.format(
+            threads, throughput(count, threads, True), throughput(count, threads, False)
+        ))
+
+
+if __name__ == '__main__':
+    main()
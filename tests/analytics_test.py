@@ -0,0 +1,104 @@
+"""Tests related with item analytics of quizzes."""
+import random
+
+import numpy as np
+
+from classroom.app.analytics import ItemAnalytics
+from classroom.app.entities import Student, Teacher
+from classroom.app.quizzes import Question
+from classroom.app.utils import get_semester_id
+from classroom.tests.utils import BaseTestCase
+
+
+def question(correct):
+    q = Question('Question')
+    q.add_possible_answer('answer', correct, True)
+    return q
+
+
+def expected_point_biserial(quiz, submissions):
+    '''Correlation of every question with the totals, computed directly.'''
+    key = np.array([q.correct_answer for q in quiz.questions])
+    correct = np.zeros((len(submissions), len(key)))
+    for row, submission in enumerate(submissions):
+        answers = np.array(list(submission.answers))
+        correct[row, :len(answers)] = answers == key[:len(answers)]
+    totals = correct.sum(axis=1)
+    return np.array([np.corrcoef(correct[:, i], totals)[0, 1] for i in range(len(key))])
+
+
+class ItemAnalyticsTests(BaseTestCase):
+    def setUp(self):
+        self.teacher = Teacher('John', 'Doe', 'JD1966')
+        self.quiz = self.teacher.create_quiz('q1', 'Quiz 1')
+        for correct in (1, 2, 3):
+            self.quiz.add_question(question(correct))
+        self.students = [Student('Student', str(s), 'S{}'.format(s)) for s in range(3)]
+        for student in self.students:
+            student.subscribe_to_quiz(self.quiz)
+
+    def test_options_and_difficulty(self):
+        '''Test: chosen options are counted as they are answered.'''
+        analytics = ItemAnalytics(self.quiz)
+        analytics.track()
+        self.students[0].answer_quiz_batch('q1', [1, 2, 4])
+        self.students[1].answer_quiz_batch('q1', [1, 3])
+        self.students[2].answer_quiz('q1', 7)
+        self.assertEqual(analytics.students, 3)
+        self.assertEqual(analytics.option_counts.tolist(), [
+            [1, 2, 0, 0, 0], [0, 0, 1, 1, 0], [0, 0, 0, 0, 1],
+        ])
+        self.assertEqual(analytics.answered().tolist(), [3, 2, 1])
+        np.testing.assert_allclose(analytics.difficulty(), [2 / 3, 0.5, 0])
+        np.testing.assert_allclose(analytics.option_distribution()[1], [0, 0, 0.5, 0.5, 0])
+
+    def test_incremental_matches_from_scratch(self):
+        '''Test: statistics kept while answering are the ones computed at once.'''
+        rng = random.Random(0)
+        students = [Student('Student', str(s), 'R{}'.format(s)) for s in range(40)]
+        analytics = ItemAnalytics(self.quiz)
+        analytics.track()
+        for student in students:
+            student.subscribe_to_quiz(self.quiz)
+        for _ in range(3):
+            self.quiz.add_question(question(rng.randint(1, 4)))
+            for student in students:
+                answers = [rng.randint(1, 4) for _ in range(rng.randint(0, 3))]
+                student.answer_quiz_batch('q1', answers)
+        # A submission replaced takes its answers out.
+        self.quiz.remove_submission(students[0].quizzes[get_semester_id()]['q1'])
+        from_scratch = ItemAnalytics(self.quiz)
+        from_scratch.track()
+        self.assertEqual(analytics.students, from_scratch.students)
+        np.testing.assert_array_equal(analytics.option_counts, from_scratch.option_counts)
+        np.testing.assert_allclose(analytics.point_biserial(), from_scratch.point_biserial())
+        submissions = list(self.quiz.submissions.values())
+        np.testing.assert_allclose(
+            analytics.point_biserial(), expected_point_biserial(self.quiz, submissions)
+        )
+
+    def test_answers_one_by_one_match_from_scratch(self):
+        '''Test: statistics read between single answers are the ones computed at once.'''
+        rng = random.Random(1)
+        for _ in range(7):
+            self.quiz.add_question(question(rng.randint(1, 4)))
+        analytics = ItemAnalytics(self.quiz)
+        analytics.track()
+        analytics.track()
+        for _ in range(len(self.quiz.questions)):
+            for student in self.students:
+                student.answer_quiz('q1', rng.randint(1, 4))
+            from_scratch = ItemAnalytics(self.quiz)
+            from_scratch.track()
+            self.assertEqual(analytics.students, 3)
+            np.testing.assert_array_equal(analytics.option_counts, from_scratch.option_counts)
+            np.testing.assert_allclose(analytics.point_biserial(), from_scratch.point_biserial())
+
+    def test_undefined_statistics_are_nan(self):
+        '''Test: questions nobody answered have no statistics.'''
+        analytics = ItemAnalytics(self.quiz, semester_id='2000_1')
+        analytics.track()
+        self.students[0].answer_quiz('q1', 1)
+        self.assertEqual(analytics.students, 0)
+        self.assertTrue(np.isnan(analytics.difficulty()).all())
+        self.assertTrue(np.isnan(analytics.point_biserial()).all())
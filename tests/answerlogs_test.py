@@ -0,0 +1,173 @@
+"""Tests related with answer logs."""
+import os
+import tempfile
+import threading
+import time
+
+from classroom.app.answerlogs import (
+    ANSWER,
+    ASSIGN,
+    ROTATED,
+    AnswerLog,
+    read_answer_log,
+    replay_answer_log,
+)
+from classroom.app.courses import CourseRegistry
+from classroom.app.entities import Student, Teacher
+from classroom.app.quizzes import Question
+from classroom.app.snapshots import load_snapshot
+from classroom.app.utils import get_semester_id
+from classroom.tests.factories import RandomQuestionFactory
+from classroom.tests.utils import BaseTestCase
+
+
+class AnswerLogTests(BaseTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.path = os.path.join(self.directory, 'answers.log')
+        self.teacher = Teacher('John', 'Doe', 'JD1966')
+        self.quiz = self.teacher.create_quiz('q1', 'Quiz 1')
+        for _ in range(3):
+            question = RandomQuestionFactory()
+            question.add_possible_answer('2', 1, True)
+            self.quiz.add_question(question)
+        self.student = Student('Gonzalo', 'Amadio', 'GA1988')
+
+    def write_log(self, sync_every=1000):
+        log = AnswerLog(self.path, sync_every=sync_every, sync_interval=60)
+        log.attach([self.quiz])
+        self.teacher.assign_quiz_to_student(self.student, self.quiz)
+        self.student.answer_quiz('q1', 1)
+        self.student.answer_quiz_batch('q1', [2, 1])
+        return log
+
+    def read(self):
+        with open(self.path, 'rb') as stream:
+            return list(read_answer_log(stream))
+
+    def test_log_keeps_records_until_synced(self):
+        '''Test: records are written in batches.'''
+        log = self.write_log()
+        self.assertEqual(self.read(), [])
+        log.sync()
+        semester = get_semester_id()
+        self.assertEqual(self.read(), [
+            (ASSIGN, 0, semester, 'GA1988', 'q1', b''),
+            (ANSWER, 0, semester, 'GA1988', 'q1', b'\x01'),
+            (ANSWER, 1, semester, 'GA1988', 'q1', b'\x02\x01'),
+        ])
+        log.close()
+
+    def test_log_syncs_every_some_records(self):
+        '''Test: records are written when there are sync_every of them.'''
+        log = self.write_log(sync_every=2)
+        self.assertEqual(len(self.read()), 2)
+        log.close()
+        self.assertEqual(len(self.read()), 3)
+
+    def test_log_syncs_waiting_records_after_interval(self):
+        '''Test: records are written after sync_interval, even if no more arrive.'''
+        log = AnswerLog(self.path, sync_interval=0.05)
+        log.attach([self.quiz])
+        self.teacher.assign_quiz_to_student(self.student, self.quiz)
+        deadline = time.monotonic() + 5
+        while not self.read() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(self.read()), 1)
+        log.close()
+
+    def test_log_keeps_long_batches(self):
+        '''Test: a batch of more than 65535 answers is logged whole.'''
+        for i in range(70000):
+            question = Question('Question {}'.format(i))
+            question.add_possible_answer('2', 1, True)
+            self.quiz.add_question(question)
+        with AnswerLog(self.path, sync_interval=60) as log:
+            log.attach([self.quiz])
+            self.teacher.assign_quiz_to_student(self.student, self.quiz)
+            self.student.answer_quiz_batch('q1', [1] * 70000)
+        self.assertEqual(len(self.read()[1][5]), 70000)
+
+    def test_replay_rebuilds_submissions(self):
+        '''Test: replaying a log gives the students their answers back.'''
+        self.write_log().close()
+        student = Student('Gonzalo', 'Amadio', 'GA1988')
+        applied = replay_answer_log(self.path, {'GA1988': student}, {'q1': self.quiz})
+        self.assertEqual(applied, 3)
+        submission = student.quizzes[get_semester_id()]['q1']
+        self.assertEqual(list(submission.answers), [1, 2, 1])
+        self.assertEqual(student.get_score_for_semester(), 66.67)
+        # Replaying again does not apply the answers twice.
+        replay_answer_log(self.path, {'GA1988': student}, {'q1': self.quiz})
+        self.assertEqual(list(submission.answers), [1, 2, 1])
+
+    def test_replay_stops_at_cut_record(self):
+        '''Test: a record cut by a crash is removed from the log.'''
+        self.write_log().close()
+        size = os.path.getsize(self.path)
+        with open(self.path, 'ab') as stream:
+            stream.write(b'\x10\x00\x00\x00cut')
+        student = Student('Gonzalo', 'Amadio', 'GA1988')
+        applied = replay_answer_log(self.path, {'GA1988': student}, {'q1': self.quiz})
+        self.assertEqual(applied, 3)
+        self.assertEqual(os.path.getsize(self.path), size)
+        self.assertEqual(replay_answer_log('not_existent', {}, {}), 0)
+
+    def test_compact_saves_snapshot_and_empties_log(self):
+        '''Test: after compacting, the snapshot has the answers and the log is empty.'''
+        log = self.write_log()
+        snapshot = os.path.join(self.directory, 'school.snapshot')
+        log.compact(snapshot, [], students=[self.student])
+        self.student.answer_quiz('q1', 1)
+        log.close()
+        with open(snapshot, 'rb') as stream:
+            school = load_snapshot(stream, CourseRegistry())
+        self.assertEqual(len(self.read()), 0)
+        student = school.students['GA1988']
+        self.assertEqual(list(student.quizzes[get_semester_id()]['q1'].answers), [1, 2, 1])
+
+    def add_question(self):
+        question = RandomQuestionFactory()
+        question.add_possible_answer('2', 1, True)
+        self.quiz.add_question(question)
+
+    def test_compact_lets_students_answer(self):
+        '''Test: answers given while the snapshot is written go to the new log.'''
+        self.add_question()
+        log = self.write_log()
+        snapshot = os.path.join(self.directory, 'school.snapshot')
+        answered = []
+
+        def departments():
+            thread = threading.Thread(target=self.student.answer_quiz, args=('q1', 1))
+            thread.start()
+            thread.join(5)
+            answered.append(not thread.is_alive())
+            yield from ()
+
+        log.compact(snapshot, departments(), students=[self.student])
+        log.close()
+        self.assertEqual(answered, [True])
+        self.assertFalse(os.path.exists(self.path + ROTATED))
+        self.assertEqual(self.read(), [(ANSWER, 3, get_semester_id(), 'GA1988', 'q1', b'\x01')])
+        with open(snapshot, 'rb') as stream:
+            school = load_snapshot(stream, CourseRegistry())
+        replay_answer_log(self.path, school.students, {q.quiz_id: q for q in school.quizzes})
+        submission = school.students['GA1988'].quizzes[get_semester_id()]['q1']
+        self.assertEqual(list(submission.answers), [1, 2, 1, 1])
+        self.assertEqual(submission.get_score(), 75)
+
+    def test_replay_reads_log_of_unfinished_compact(self):
+        '''Test: the log moved aside by a compact that did not finish is replayed first.'''
+        self.add_question()
+        self.write_log().close()
+        os.replace(self.path, self.path + ROTATED)
+        with AnswerLog(self.path, sync_interval=60) as log:
+            log.attach([self.quiz])
+            self.student.answer_quiz('q1', 1)
+        student = Student('Gonzalo', 'Amadio', 'GA1988')
+        applied = replay_answer_log(self.path, {'GA1988': student}, {'q1': self.quiz})
+        self.assertEqual(applied, 4)
+        self.assertEqual(list(student.quizzes[get_semester_id()]['q1'].answers), [1, 2, 1, 1])
@@ -0,0 +1,94 @@
+"""Tests related with question banks."""
+
+from classroom.app.banks import BankQuestion, QuestionBank
+from classroom.app.exceptions import AnswerPositionOverflow
+from classroom.app.quizzes import Submission
+from classroom.tests.factories import QuestionFactory, StudentFactory, TeacherFactory
+from classroom.tests.utils import BaseTestCase
+
+
+class QuestionBankTests(BaseTestCase):
+    def setUp(self):
+        self.bank = QuestionBank()
+        self.bank.add_question('How much is 1 + 1?', ['1', '2', '3', '4'], 2)
+        self.bank.add_question('How much is 2 + 2?', ['2', '4'], 2)
+
+    def test_bank_has_attrs(self):
+        '''Test: bank has basic attributes.'''
+        self.assertHasAttr(self.bank, 'texts')
+        self.assertHasAttr(self.bank, 'question_texts')
+        self.assertHasAttr(self.bank, 'answer_texts')
+        self.assertHasAttr(self.bank, 'correct_answers')
+
+    def test_bank_stores_repeated_texts_once(self):
+        '''Test: answers shared by questions are only once in the string table.'''
+        self.assertEqual(len(self.bank), 2)
+        self.assertEqual(self.bank.texts.count('2'), 1)
+        self.assertEqual(self.bank.texts.count('4'), 1)
+        self.assertEqual(list(self.bank.correct_answers), [2, 2])
+
+    def test_bank_rejects_invalid_questions(self):
+        '''Test: only 4 choices, and the correct one must be one of them.'''
+        with self.assertRaises(AnswerPositionOverflow):
+            self.bank.add_question('Too many', ['1', '2', '3', '4', '5'], 1)
+        with self.assertRaises(AnswerPositionOverflow):
+            self.bank.add_question('Wrong position', ['1', '2'], 5)
+        with self.assertRaises(IndexError):
+            self.bank.question(2)
+
+    def test_bank_question_is_a_view(self):
+        '''Test: a question reads its data from the bank.'''
+        question = self.bank.question(1)
+        self.assertIsInstance(question, BankQuestion)
+        self.assertEqual(question.text, 'How much is 2 + 2?')
+        self.assertEqual(question.possible_answers, ['2', '4', '', ''])
+        self.assertEqual(question.correct_answer, 2)
+        self.assertTrue(question.is_answer_correct(2))
+        question.add_possible_answer('8', 3, True)
+        self.assertEqual(self.bank.question(1).possible_answers, ['2', '4', '8', ''])
+        self.assertEqual(self.bank.question(1).correct_answer, 3)
+        with self.assertRaises(AnswerPositionOverflow):
+            question.add_possible_answer('3', 5, True)
+
+    def test_bank_question_answers_can_be_set(self):
+        '''Test: setting a possible answer, as in Question, changes the bank.'''
+        question = self.bank.question(1)
+        question.possible_answers[2] = '6'
+        question.possible_answers[-1] = '10'
+        self.assertEqual(self.bank.question(1).possible_answers, ['2', '4', '6', '10'])
+        self.assertEqual(question.possible_answers[1:3], ['4', '6'])
+        self.assertEqual(len(question.possible_answers), 4)
+        with self.assertRaises(IndexError):
+            question.possible_answers[4] = '12'
+
+    def test_bank_question_adds_answers_as_question(self):
+        '''Test: adding an answer moves the correct one, as in Question.'''
+        question = self.bank.question(0)
+        plain = QuestionFactory()
+        for q in (question, plain):
+            q.add_possible_answer('9', 4, False)
+        self.assertEqual(question.correct_answer, plain.correct_answer)
+        self.assertFalse(hasattr(question, '__dict__'))
+
+    def test_bank_can_create_quiz(self):
+        '''Test: a quiz built from a bank can be answered as any other quiz.'''
+        quiz = self.bank.create_quiz('quiz_01', TeacherFactory(), 'Sums', [0, 1])
+        self.assertEqual([q.text for q in quiz.questions],
+                         ['How much is 1 + 1?', 'How much is 2 + 2?'])
+        submission = Submission(quiz, StudentFactory(), '2019_1')
+        submission.answer_next_question(2)
+        submission.answer_next_question(1)
+        self.assertEqual(submission.get_score(), 50)
+        self.assertTrue(submission.is_finished)
+
+    def test_bank_quiz_is_graded_by_its_teacher(self):
+        '''Test: a quiz built from a bank is one of its teacher, in the gradebook.'''
+        teacher = TeacherFactory()
+        gradebook = teacher.get_gradebook()
+        quiz = self.bank.create_quiz('quiz_01', teacher, 'Sums', [0, 1])
+        self.assertEqual(teacher.quizzes, [quiz])
+        student = StudentFactory(student_id='S1')
+        student.subscribe_to_quiz(quiz)
+        student.answer_quiz_batch('quiz_01', [2, 2])
+        self.assertEqual(student.get_score_for_semester(), 100)
+        self.assertEqual(gradebook.get_total('S1'), 100)
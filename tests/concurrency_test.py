@@ -0,0 +1,107 @@
+"""Tests related with using the classroom from many threads."""
+import sys
+import threading
+
+from classroom.app.concurrency import STUDENT_NOT_FOUND, ShardedLocks, ThreadSafeClassroom
+from classroom.app.entities import Student, Teacher
+from classroom.app.quizzes import Question
+from classroom.tests.utils import BaseTestCase
+
+THREADS = 8
+QUESTIONS = 40
+
+
+class ShardedLocksTests(BaseTestCase):
+    def test_same_key_same_lock(self):
+        '''Test: a key always gets the same lock.'''
+        locks = ShardedLocks(4)
+        self.assertEqual(len(locks), 4)
+        self.assertIs(locks.lock_for('S1'), locks.lock_for('S1'))
+        self.assertEqual(locks.all(), locks.all())
+        self.assertIn(locks.lock_for('S1'), locks.all())
+
+
+class ThreadSafeClassroomTests(BaseTestCase):
+    def setUp(self):
+        self.teacher = Teacher('John', 'Doe', 'JD1966')
+        self.quiz = self.teacher.create_quiz('q1', 'Quiz 1')
+        for i in range(QUESTIONS):
+            question = Question('Question {}'.format(i))
+            question.add_possible_answer('answer', 1, True)
+            self.quiz.add_question(question)
+        self.gradebook = self.teacher.get_gradebook()
+        self.students = [Student('A', 'B', 'S{}'.format(i)) for i in range(50)]
+        self.classroom = ThreadSafeClassroom(self.students, shards=8)
+        # Switch threads as often as possible, so races show up.
+        self.addCleanup(sys.setswitchinterval, sys.getswitchinterval())
+        sys.setswitchinterval(1e-6)
+
+    def run_threads(self, target):
+        threads = [threading.Thread(target=target, args=(n,)) for n in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def test_no_answer_is_lost_or_applied_twice(self):
+        '''Test: every thread answers for every student, all answers count once.'''
+        results = [[] for _ in range(THREADS)]
+
+        def work(n):
+            for student in self.students:
+                self.classroom.assign_quiz(student.student_id, self.quiz)
+            # Every thread gives a part of the answers of every student.
+            for _ in range(QUESTIONS // THREADS):
+                for student in self.students:
+                    results[n].append(self.classroom.answer_quiz(student.student_id, 'q1', 1))
+            # Once the quiz is finished, answers are rejected.
+            for student in self.students:
+                results[n].append(self.classroom.answer_quiz(student.student_id, 'q1', 1))
+
+        self.run_threads(work)
+        answers = [r for thread in results for r in thread]
+        self.assertEqual(answers.count('Ok'), QUESTIONS * len(self.students))
+        self.assertEqual(answers.count('Quiz already finished'), THREADS * len(self.students))
+        for student in self.students:
+            self.assertEqual(student.quizzes[self.gradebook.semester_id]['q1'].answers,
+                             bytearray([1] * QUESTIONS))
+            self.assertEqual(student.get_score_for_semester(), 100)
+            self.assertEqual(self.gradebook.get_total(student.student_id), 100)
+        self.assertEqual(len(self.quiz.submissions), len(self.students))
+
+    def test_batches_and_scores_from_many_threads(self):
+        '''Test: batches of answers do not overlap.'''
+        def work(n):
+            for student in self.students:
+                self.classroom.assign_quiz(student.student_id, self.quiz)
+                self.classroom.answer_quiz_batch(student.student_id, 'q1', [1, 2] * 4)
+                self.classroom.get_score_for_semester(student.student_id)
+
+        self.run_threads(work)
+        for student in self.students:
+            self.assertEqual(self.classroom.get_score_for_semester(student.student_id), 50)
+        self.assertEqual(self.classroom.answer_quiz('unknown', 'q1', 1), STUDENT_NOT_FOUND)
+
+    def test_questions_added_while_answering(self):
+        '''Test: answers given while questions are added are kept, and graded.'''
+        for student in self.students:
+            self.classroom.assign_quiz(student.student_id, self.quiz)
+
+        def work(n):
+            if n == 0:
+                for i in range(QUESTIONS):
+                    question = Question('Added {}'.format(i))
+                    question.add_possible_answer('answer', 1, True)
+                    self.classroom.add_question(self.quiz, question)
+                return
+            for _ in range(QUESTIONS // THREADS):
+                for student in self.students:
+                    self.classroom.answer_quiz(student.student_id, 'q1', 1)
+
+        self.run_threads(work)
+        answered = QUESTIONS // THREADS * (THREADS - 1)
+        for student in self.students:
+            submission = student.quizzes[self.gradebook.semester_id]['q1']
+            self.assertEqual(submission.answers, bytearray([1] * answered))
+            self.assertEqual(
+                self.gradebook.get_total(student.student_id), submission.get_score())
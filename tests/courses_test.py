@@ -1,5 +1,6 @@
 """Tests related with entities belonging to a school."""
 
+from classroom.app.courses import CourseRegistry
 from classroom.tests.factories import (
     CourseFactory,
     CourseRunningFactory,
@@ -72,6 +73,67 @@ class DepartmentTests(BaseTestCase):
         student = StudentFactory()
         department.add_student_to_course(student, crunning)
         self.assertIn(student, crunning.students)
+        # Adding again the same student does not duplicate it.
+        department.add_student_to_course(student, crunning)
+        self.assertEqual(crunning.students, [student])
+        self.assertTrue(crunning.has_student(student.student_id))
+
+
+class CourseRegistryTests(BaseTestCase):
+    def setUp(self):
+        self.registry = CourseRegistry()
+
+    def test_registry_indexes_by_code_and_teacher(self):
+        """Test: running courses are found by code and by teacher."""
+        crunning = CourseRunningFactory()
+        teacher = TeacherFactory(teacher_id='T1')
+        self.registry.add(crunning)
+        department_code = crunning.course.department.department_code
+        self.assertIs(self.registry.get(department_code, crunning.get_code()), crunning)
+        self.assertIsNone(self.registry.get(department_code, 'not_existent'))
+        self.assertEqual(self.registry.get_teacher_runnings('T1'), [])
+        self.registry.assign_teacher(crunning, teacher)
+        self.assertEqual(self.registry.get_teacher_runnings('T1'), [crunning])
+
+    def test_registry_moves_course_to_new_teacher(self):
+        """Test: a running course is only indexed under its last teacher."""
+        crunning = CourseRunningFactory()
+        self.registry.assign_teacher(crunning, TeacherFactory(teacher_id='T1'))
+        self.registry.assign_teacher(crunning, TeacherFactory(teacher_id='T2'))
+        self.assertEqual(self.registry.get_teacher_runnings('T1'), [])
+        self.assertEqual(self.registry.get_teacher_runnings('T2'), [crunning])
+
+    def test_department_registers_running_courses(self):
+        """Test: courses marked as running through a department are indexed."""
+        department = DepartmentFactory()
+        course = department.add_course('Registered', 'REG')
+        crunning = department.mark_course_as_running(course, '2019', self.registry)
+        department.assign_teacher_to_course(
+            TeacherFactory(teacher_id='REG_T'), crunning, self.registry)
+        self.assertIs(self.registry.get('DEPOM', 'REG_2019'), crunning)
+        self.assertEqual(self.registry.get_teacher_runnings('REG_T'), [crunning])
+
+    def test_registry_keeps_same_code_of_other_departments(self):
+        """Test: two departments can run courses with the same code."""
+        teacher = TeacherFactory(teacher_id='T1')
+        runnings = []
+        for code in ('D1', 'D2'):
+            department = DepartmentFactory(department_code=code)
+            running = department.mark_course_as_running(
+                department.add_course('Course', '101'), '2019', self.registry)
+            department.assign_teacher_to_course(teacher, running, self.registry)
+            runnings.append(running)
+        self.assertIs(self.registry.get('D1', '101_2019'), runnings[0])
+        self.assertIs(self.registry.get('D2', '101_2019'), runnings[1])
+        self.assertEqual(self.registry.get_teacher_runnings('T1'), runnings)
+
+    def test_department_without_registry_indexes_nothing(self):
+        """Test: running courses are only indexed in the registry given."""
+        department = DepartmentFactory()
+        crunning = department.mark_course_as_running(department.add_course('A', 'A'), '2019')
+        department.assign_teacher_to_course(TeacherFactory(), crunning)
+        self.assertIsNone(self.registry.get('DEPOM', 'A_2019'))
+        self.assertIs(crunning.teacher.get_teaching_courses()[-1], crunning.get_code())
 
 
 class CourseRunningTests(BaseTestCase):
@@ -22,6 +22,12 @@ class StudentTests(BaseTestCase):
         self.assertHasAttr(self.student, 'classes')
         self.assertHasAttr(self.student, 'quizzes')
 
+    def test_student_has_no_instance_dict(self):
+        '''Test: students are slotted, they can not get new attributes.'''
+        self.assertFalse(hasattr(self.student, '__dict__'))
+        with self.assertRaises(AttributeError):
+            self.student.nickname = 'Gonza'
+
     def test_student_basic_info(self):
         '''Test: student does not modify params on creation.'''
         student = self.student
@@ -51,6 +57,18 @@ class StudentTests(BaseTestCase):
         # Check if after enrol, course was added to student list of courses
         self.assertIn(course.running_course_code, student.get_enroled_courses())
 
+    def test_student_enrol_is_idempotent(self):
+        '''Test: enroling twice to the same course keeps one enrolment.'''
+        student = StudentFactory(student_id='S1')
+        course = CourseRunningFactory()
+        self.assertFalse(student.is_enroled(course.get_code()))
+        student.enrol(course)
+        student.enrol(course)
+        self.assertTrue(student.is_enroled(course.get_code()))
+        self.assertTrue(course.has_student('S1'))
+        self.assertEqual(student.get_enroled_courses(), [course.get_code()])
+        self.assertEqual(course.get_students(), [student])
+
     def test_student_can_subscribe_to_quiz(self):
         quiz = QuizFactory()
         self.student.subscribe_to_quiz(quiz)
@@ -84,6 +102,54 @@ class StudentTests(BaseTestCase):
         res = student.get_score_for_semester()
         assert res == 100.00
 
+    def test_student_can_answer_quiz_batch(self):
+        student = StudentFactory(student_id='S1')
+        res = student.answer_quiz_batch('non_existent', [1])
+        assert res == ("You are not subscribed to this quiz in current semester", 0)
+        quiz = QuizFactory()
+        for _ in range(3):
+            question = QuestionFactory()
+            question.add_possible_answer('2', 1, True)
+            quiz.add_question(question)
+        student.subscribe_to_quiz(quiz)
+        assert student.answer_quiz_batch(quiz.quiz_id, [1, 2]) == ("Ok", 2)
+        # Only one question is left, so the last answer is not applied.
+        res = student.answer_quiz_batch(quiz.quiz_id, [1, 1])
+        assert res == ("Quiz already finished", 1)
+        assert student.get_score_for_semester() == 66.67
+
+    def test_student_can_answer_many_quizzes_batch(self):
+        student = StudentFactory(student_id='S1')
+        quizzes = []
+        for quiz_id in ('q1', 'q2'):
+            quiz = QuizFactory(quiz_id=quiz_id)
+            question = QuestionFactory()
+            question.add_possible_answer('2', 1, True)
+            quiz.add_question(question)
+            student.subscribe_to_quiz(quiz)
+        res = student.answer_quizzes_batch({'q1': [1], 'q2': [2, 1], 'q3': [1]})
+        assert res == {
+            'q1': ("Ok", 1),
+            'q2': ("Quiz already finished", 1),
+            'q3': ("Quiz not defined", 0),
+        }
+        assert student.get_score_for_semester() == 100.00
+
+    def test_students_sharing_a_quiz_answer_independently(self):
+        quiz = QuizFactory()
+        question = QuestionFactory()
+        question.add_possible_answer('2', 1, True)
+        quiz.add_question(question)
+        s1 = StudentFactory(student_id='S1')
+        s2 = StudentFactory(student_id='S2')
+        s1.subscribe_to_quiz(quiz)
+        s2.subscribe_to_quiz(quiz)
+        assert s1.answer_quiz(quiz.quiz_id, 1) == "Ok"
+        assert s1.answer_quiz(quiz.quiz_id, 1) == "Quiz already finished"
+        assert s2.answer_quiz(quiz.quiz_id, 2) == "Ok"
+        assert s1.get_score_for_semester() == 100.00
+        assert s2.get_score_for_semester() == 0.0
+
 
 
 class TeacherTests(BaseTestCase):
@@ -119,6 +185,15 @@ class TeacherTests(BaseTestCase):
         teacher.add_course_to_teach(course.get_code())
         self.assertIn(course.get_code(), teacher.get_teaching_courses())
 
+    def test_teacher_adds_course_once(self):
+        '''Test if adding twice a running course to teach keeps only one.'''
+        teacher = TeacherFactory()
+        course = CourseRunningFactory()
+        teacher.add_course_to_teach(course.get_code())
+        teacher.add_course_to_teach(course.get_code())
+        self.assertTrue(teacher.is_teaching(course.get_code()))
+        self.assertEqual(teacher.get_teaching_courses(), [course.get_code()])
+
     def test_teacher_can_create_quiz(self):
         q = self.teacher.create_quiz('myid', 'Math quiz')
         self.assertIsInstance(q, Quiz)
@@ -0,0 +1,69 @@
+"""Tests related with exporting grades."""
+import io
+import json
+
+from classroom.app.courses import Department
+from classroom.app.entities import Student, Teacher
+from classroom.app.exports import GradeRow, iter_grade_rows, write_grades_csv, write_grades_jsonl
+from classroom.app.utils import FixedSemesterClock, semester_clock
+from classroom.tests.factories import RandomQuestionFactory
+from classroom.tests.utils import BaseTestCase
+
+
+class ExportTests(BaseTestCase):
+    def setUp(self):
+        self.department = Department('Department of Mathematics', 'DEPOM')
+        self.teacher = Teacher('John', 'Doe', 'JD1966')
+        self.other_teacher = Teacher('Jane', 'Roe', 'JR1970')
+        self.student = Student('Gonzalo', 'Amadio', 'GA1988')
+        mat = self.department.add_course('Mathematics', 'MAT')
+        alg = self.department.add_course('Algebra', 'ALG')
+        for course, teacher in ((mat, self.teacher), (alg, self.other_teacher)):
+            for year in ('2019', '2020'):
+                running = Department.mark_course_as_running(course, year)
+                Department.assign_teacher_to_course(teacher, running)
+                running.add_student(self.student)
+        with semester_clock(FixedSemesterClock('2019_1')):
+            for teacher, quiz_id in ((self.teacher, 'q1'), (self.other_teacher, 'q2')):
+                quiz = teacher.create_quiz(quiz_id, 'Quiz')
+                question = RandomQuestionFactory()
+                question.add_possible_answer('2', 1, True)
+                quiz.add_question(question)
+                quiz.add_question(RandomQuestionFactory())
+                teacher.assign_quiz_to_student(self.student, quiz)
+            self.student.answer_quiz('q1', 1)
+
+    def test_rows_of_semester(self):
+        '''Test: quizzes are graded in the running courses of their teacher.'''
+        rows = list(iter_grade_rows([self.department], '2019_1'))
+        self.assertEqual(rows, [
+            GradeRow('GA1988', 'MAT_2019', 'q1', 50),
+            GradeRow('GA1988', 'ALG_2019', 'q2', 0),
+        ])
+        self.assertEqual(list(iter_grade_rows([self.department], '2020_1')), [])
+
+    def test_filters(self):
+        '''Test: departments and courses can be left out.'''
+        rows = iter_grade_rows([self.department], '2019_1', course_codes={'ALG'})
+        self.assertEqual([row.quiz_id for row in rows], ['q2'])
+        rows = iter_grade_rows([self.department], '2019_1', department_codes=set())
+        self.assertEqual(list(rows), [])
+
+    def test_writers(self):
+        '''Test: rows are written as CSV and as JSON Lines.'''
+        stream = io.StringIO()
+        count = write_grades_csv(stream, iter_grade_rows([self.department], '2019_1'))
+        self.assertEqual(count, 2)
+        self.assertEqual(stream.getvalue().splitlines(), [
+            'student_id,running_course_code,quiz_id,score',
+            'GA1988,MAT_2019,q1,50.0',
+            'GA1988,ALG_2019,q2,0.0',
+        ])
+        stream = io.StringIO()
+        count = write_grades_jsonl(stream, iter_grade_rows([self.department], '2019_1'))
+        self.assertEqual(count, 2)
+        first = json.loads(stream.getvalue().splitlines()[0])
+        self.assertEqual(first, {
+            'student_id': 'GA1988', 'running_course_code': 'MAT_2019',
+            'quiz_id': 'q1', 'score': 50.0,
+        })
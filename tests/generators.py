@@ -0,0 +1,90 @@
+"""Build whole schools at once, for load tests and benchmarks.
+
+The factories create one entity at a time with fake names, which is fine for
+unit tests but too slow for thousands of students. generate_school creates
+every entity of a school from a seed, so the same arguments always give the
+same school.
+
+Every course of every department runs in the year of the semester, with a
+teacher. Students are enroled in some of the running courses, are assigned
+the quizzes of their teachers and answered part of each of them.
+"""
+import random
+from typing import Dict, List, Optional
+
+from classroom.app.courses import CourseRegistry, CourseRunning, Department
+from classroom.app.entities import Student, Teacher
+from classroom.app.quizzes import Question, Quiz
+from classroom.app.snapshots import School
+from classroom.app.utils import FixedSemesterClock, get_semester_id, semester_clock
+
+
+def generate_school(
+    departments: int = 2,
+    courses_per_department: int = 5,
+    teachers: int = 5,
+    students: int = 100,
+    classes_per_student: int = 3,
+    quizzes_per_running: int = 2,
+    questions_per_quiz: int = 10,
+    seed: int = 0,
+    semester_id: Optional[str] = None,
+    registry: Optional[CourseRegistry] = None,
+) -> School:
+    """Create a school with the given number of entities.
+
+    Running courses are added to the registry, if given, as if they were
+    marked as running by their departments. The answers are given in the semester
+    semester_id, the current one if it is not given.
+    """
+    rng = random.Random(seed)
+    if not semester_id:
+        semester_id = get_semester_id()
+    year = semester_id.split('_')[0]
+    school = School()
+    all_teachers = [Teacher('Teacher', str(t), 'T{}'.format(t)) for t in range(teachers)]
+    school.teachers = {teacher.teacher_id: teacher for teacher in all_teachers}
+    runnings: List[CourseRunning] = []
+    for d in range(departments):
+        department = Department('Department {}'.format(d), 'D{}'.format(d))
+        school.departments[department.department_code] = department
+        for c in range(courses_per_department):
+            course = department.add_course('Course {}'.format(c), 'D{}C{}'.format(d, c))
+            running = course.add_running(year)
+            teacher = all_teachers[len(runnings) % teachers]
+            running.assign_teacher(teacher)
+            teacher.add_course_to_teach(running.running_course_code)
+            if registry is not None:
+                registry.add(running)
+            runnings.append(running)
+
+    running_quizzes: Dict[str, List[Quiz]] = {}
+    for running in runnings:
+        quizzes = running_quizzes[running.running_course_code] = []
+        for q in range(quizzes_per_running):
+            quiz = running.teacher.create_quiz(
+                '{}_Q{}'.format(running.running_course_code, q), 'Quiz {}'.format(q)
+            )
+            for i in range(questions_per_quiz):
+                question = Question('Question {}'.format(i))
+                correct = rng.randint(1, 4)
+                # The last answer added is taken as the correct one.
+                for position in (1, 2, 3, 4, correct):
+                    question.add_possible_answer('Answer {}'.format(position), position, True)
+                quiz.add_question(question)
+            quizzes.append(quiz)
+            school.quizzes.append(quiz)
+
+    classes = min(classes_per_student, len(runnings))
+    with semester_clock(FixedSemesterClock(semester_id)):
+        for s in range(students):
+            student = Student('Student', str(s), 'S{}'.format(s))
+            school.students[student.student_id] = student
+            for running in rng.sample(runnings, classes):
+                student.enrol(running)
+                for quiz in running_quizzes[running.running_course_code]:
+                    student.subscribe_to_quiz(quiz)
+            for submission in student.quizzes.get(semester_id, {}).values():
+                given = rng.randint(0, questions_per_quiz)
+                submission.answer_next_questions([rng.randint(1, 4) for _ in range(given)])
+    return school
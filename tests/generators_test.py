@@ -0,0 +1,45 @@
+"""Tests related with generating whole schools."""
+from classroom.app.courses import CourseRegistry
+from classroom.tests.generators import generate_school
+from classroom.tests.utils import BaseTestCase
+
+
+def describe(school):
+    '''Return every id and answer of a school, to compare schools.'''
+    return (
+        sorted(school.departments), sorted(school.teachers),
+        {sid: (s.classes, {qid: bytes(sub.answers) for qid, sub in s.quizzes['2019_1'].items()})
+         for sid, s in school.students.items()},
+    )
+
+
+class GenerateSchoolTests(BaseTestCase):
+    def test_school_has_every_entity(self):
+        '''Test: the school has the entities asked for, related.'''
+        registry = CourseRegistry()
+        school = generate_school(
+            departments=2, courses_per_department=3, teachers=2, students=10,
+            classes_per_student=2, quizzes_per_running=2, questions_per_quiz=5,
+            semester_id='2019_1', registry=registry,
+        )
+        self.assertEqual(len(school.departments), 2)
+        self.assertEqual(len(school.teachers), 2)
+        self.assertEqual(len(school.students), 10)
+        self.assertEqual(len(school.quizzes), 12)
+        self.assertEqual(len(registry.get_teacher_runnings('T0')), 3)
+        student = school.students['S0']
+        self.assertEqual(len(student.get_enroled_courses()), 2)
+        submissions = student.quizzes['2019_1']
+        self.assertEqual(len(submissions), 4)
+        for submission in submissions.values():
+            self.assertTrue(student.is_enroled(submission.quiz_id.rsplit('_', 1)[0]))
+            self.assertLessEqual(len(submission.answers), 5)
+
+    def test_same_seed_gives_same_school(self):
+        '''Test: schools are generated from the seed only.'''
+        def school(seed):
+            return generate_school(
+                students=20, seed=seed, semester_id='2019_1', registry=CourseRegistry()
+            )
+        self.assertEqual(describe(school(1)), describe(school(1)))
+        self.assertNotEqual(describe(school(1)), describe(school(2)))
@@ -0,0 +1,95 @@
+"""Tests related with gradebooks."""
+
+from classroom.app.courses import CourseRegistry
+from classroom.app.gradebooks import Gradebook
+from classroom.app.utils import get_semester_id
+from classroom.tests.factories import (
+    CourseRunningFactory,
+    RandomQuestionFactory,
+    StudentFactory,
+    TeacherFactory,
+)
+from classroom.tests.utils import BaseTestCase
+
+
+class GradebookTests(BaseTestCase):
+    def setUp(self):
+        self.teacher = TeacherFactory(teacher_id='T1')
+        self.quiz = self.teacher.create_quiz('q1', 'Quiz 1')
+        for _ in range(3):
+            question = RandomQuestionFactory()
+            question.add_possible_answer('2', 1, True)
+            self.quiz.add_question(question)
+        self.student = StudentFactory(student_id='S1')
+
+    def test_teacher_gradebook_is_kept(self):
+        '''Test: a teacher has one gradebook per semester.'''
+        gradebook = self.teacher.get_gradebook()
+        self.assertIsInstance(gradebook, Gradebook)
+        self.assertEqual(gradebook.semester_id, get_semester_id())
+        self.assertIs(self.teacher.get_gradebook(get_semester_id()), gradebook)
+
+    def test_gradebook_updates_as_answers_arrive(self):
+        '''Test: totals follow the answers, without asking for the score.'''
+        gradebook = self.teacher.get_gradebook()
+        self.teacher.assign_quiz_to_student(self.student, self.quiz)
+        self.assertEqual(gradebook.get_totals(), {'S1': 0})
+        self.student.answer_quiz('q1', 1)
+        self.assertEqual(gradebook.get_total('S1'), 33.33)
+        self.student.answer_quiz_batch('q1', [1, 1])
+        self.assertEqual(gradebook.get_total('S1'), 100)
+        self.assertEqual(gradebook.get_total('not_existent'), 0)
+
+    def test_gradebook_includes_previous_answers_and_new_quizzes(self):
+        '''Test: a gradebook created late knows the answers given before.'''
+        self.teacher.assign_quiz_to_student(self.student, self.quiz)
+        self.student.answer_quiz('q1', 1)
+        gradebook = self.teacher.get_gradebook()
+        quiz = self.teacher.create_quiz('q2', 'Quiz 2')
+        question = RandomQuestionFactory()
+        question.add_possible_answer('2', 1, True)
+        quiz.add_question(question)
+        self.teacher.assign_quiz_to_student(self.student, quiz)
+        self.student.answer_quiz('q2', 1)
+        self.assertEqual(gradebook.get_total('S1'), 133.33)
+        self.assertAlmostEqual(gradebook.get_total('S1'), self.student.get_score_for_semester())
+
+    def test_gradebook_follows_new_questions(self):
+        '''Test: adding a question to a quiz changes its scores.'''
+        gradebook = self.teacher.get_gradebook()
+        self.teacher.assign_quiz_to_student(self.student, self.quiz)
+        self.student.answer_quiz_batch('q1', [1, 1, 1])
+        self.quiz.add_question(RandomQuestionFactory())
+        self.assertEqual(gradebook.get_total('S1'), 75)
+
+    def test_gradebook_notifies_total_changes(self):
+        '''Test: total listeners get the previous and new totals in hundredths.'''
+        gradebook = self.teacher.get_gradebook()
+        changes = []
+        gradebook.add_total_listener(lambda s, old, new: changes.append((s.student_id, old, new)))
+        self.teacher.assign_quiz_to_student(self.student, self.quiz)
+        self.student.answer_quiz('q1', 1)
+        self.student.answer_quiz('q1', 2)
+        self.assertEqual(changes, [('S1', 0, 0), ('S1', 0, 3333)])
+
+    def test_gradebook_ignores_other_semesters(self):
+        '''Test: answers of other semesters are not in the gradebook.'''
+        gradebook = self.teacher.get_gradebook('1999_1')
+        self.teacher.assign_quiz_to_student(self.student, self.quiz)
+        self.student.answer_quiz('q1', 1)
+        self.assertEqual(gradebook.get_totals(), {})
+
+    def test_teacher_semester_report(self):
+        '''Test: the report has every student of every class of the teacher.'''
+        registry = CourseRegistry()
+        running = CourseRunningFactory()
+        registry.add(running)
+        registry.assign_teacher(running, self.teacher)
+        other = StudentFactory(student_id='S2')
+        self.student.enrol(running)
+        other.enrol(running)
+        self.teacher.assign_quiz_to_student(self.student, self.quiz)
+        self.student.answer_quiz_batch('q1', [1, 1, 2])
+        report = self.teacher.get_semester_report(registry)
+        self.assertEqual(report, {registry.key(running): {'S1': 66.67, 'S2': 0}})
+
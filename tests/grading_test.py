@@ -0,0 +1,142 @@
+"""Tests related with grading many students at once."""
+
+from classroom.app.entities import Student
+from classroom.app.grading import (
+    AnswerCopies,
+    AnswerMatrix,
+    grade_students,
+    grade_students_parallel,
+)
+from classroom.app.utils import get_semester_id
+from classroom.tests.factories import (
+    CourseRunningFactory,
+    QuizFactory,
+    RandomQuestionFactory,
+    TeacherFactory,
+)
+from classroom.tests.utils import BaseTestCase
+
+
+def make_quiz(quiz_id, size):
+    quiz = QuizFactory(quiz_id=quiz_id)
+    for _ in range(size):
+        question = RandomQuestionFactory()
+        question.add_possible_answer('2', 1, True)
+        quiz.add_question(question)
+    return quiz
+
+
+class GradingTests(BaseTestCase):
+    def setUp(self):
+        self.quizzes = [make_quiz('q1', 3), make_quiz('q2', 2), make_quiz('empty', 0)]
+        self.students = [Student('A', 'A', 'S{}'.format(i)) for i in range(4)]
+        answers = [
+            {'q1': [1, 1, 1], 'q2': [1, 2]},
+            {'q1': [1, 2], 'empty': []},
+            {'q2': [1, 1]},
+            {},
+        ]
+        for student, quiz_answers in zip(self.students, answers):
+            for quiz in self.quizzes:
+                if quiz.quiz_id in quiz_answers:
+                    student.subscribe_to_quiz(quiz)
+                    for answer in quiz_answers[quiz.quiz_id]:
+                        student.answer_quiz(quiz.quiz_id, answer)
+
+    def test_matrix_shape(self):
+        '''Test: one row per student and one column per question.'''
+        matrix = AnswerMatrix.build(self.students, get_semester_id())
+        self.assertEqual(matrix.answers.shape, (4, 5))
+        self.assertEqual(list(matrix.quiz_starts), [0, 3])
+        self.assertEqual(list(matrix.answers[1]), [1, 2, 0, 0, 0])
+
+    def test_matrix_after_changes(self):
+        '''Test: replaced submissions and questions added later are handled.'''
+        # A new quiz with the same id replaces the answers of S0 to q2.
+        replacement = make_quiz('q2', 2)
+        self.students[0].subscribe_to_quiz(replacement)
+        self.students[0].answer_quiz('q2', 1)
+        self.quizzes[0].add_question(RandomQuestionFactory())
+        self.students[1].answer_quiz('q1', 4)
+        matrix = AnswerMatrix.build(self.students[:2], get_semester_id())
+        self.assertEqual(matrix.answers.shape, (2, 6))
+        self.assertEqual(list(matrix.answers[0]), [1, 1, 1, 0, 1, 0])
+        self.assertEqual(list(matrix.answers[1]), [1, 2, 4, 0, 0, 0])
+        for student, total in zip(self.students, matrix.totals()):
+            self.assertAlmostEqual(total, student.get_score_for_semester())
+
+    def test_quizzes_with_the_same_id(self):
+        '''Test: every quiz gets its columns, even if another one has its id.'''
+        students = [Student('A', 'A', 'SA'), Student('B', 'B', 'SB')]
+        for student in students:
+            quiz = make_quiz('same', 3)
+            student.subscribe_to_quiz(quiz)
+            student.answer_quiz_batch('same', [1, 1, 1])
+        matrix = AnswerMatrix.build(students, get_semester_id())
+        self.assertEqual(matrix.answers.shape, (2, 6))
+        self.assertEqual(grade_students(students), {'SA': 100, 'SB': 100})
+        # Also when the first student does not have the other quiz.
+        self.assertEqual(grade_students(students + self.students)['SB'], 100)
+
+    def test_answers_given_after_copying(self):
+        '''Test: the matrix has the answers copied, not the ones given later.'''
+        copies = AnswerCopies.collect(self.students, get_semester_id())
+        self.students[1].answer_quiz('q1', 1)
+        self.students[3].subscribe_to_quiz(self.quizzes[0])
+        matrix = copies.build()
+        self.assertEqual(list(matrix.answers[1]), [1, 2, 0, 0, 0])
+        self.assertEqual(list(matrix.answers[3]), [0, 0, 0, 0, 0])
+
+    def test_copies_miss_quizzes_with_the_same_id(self):
+        '''Test: building tells when a quiz was missed, copying every quiz finds it.'''
+        students = [Student('A', 'A', 'SA'), Student('B', 'B', 'SB')]
+        for student in students:
+            student.subscribe_to_quiz(make_quiz('same', 2))
+            student.answer_quiz_batch('same', [1, 1])
+        self.assertIsNone(AnswerCopies.collect(students, get_semester_id()).build())
+        copies = AnswerCopies.collect(students, get_semester_id(), every_quiz=True)
+        self.assertEqual(copies.build().totals().tolist(), [100, 100])
+
+    def test_grade_few_students_of_large_quizzes(self):
+        '''Test: grading a few students reads only their rows, with the same grades.'''
+        others = [Student('O', 'O', 'O{}'.format(i)) for i in range(40)]
+        for student in others:
+            student.subscribe_to_quiz(self.quizzes[0])
+            student.answer_quiz('q1', 2)
+        self.students[1].answer_quiz('q1', 1)
+        grades = grade_students(self.students[:2])
+        self.assertAlmostEqual(grades['S0'], self.students[0].get_score_for_semester())
+        self.assertAlmostEqual(grades['S1'], 66.67)
+        self.assertEqual(grade_students(others[:1]), {'O0': 0})
+
+    def test_grades_match_student_scores(self):
+        '''Test: batch grades are the ones each student computes.'''
+        grades = grade_students(self.students)
+        self.assertEqual(list(grades), ['S0', 'S1', 'S2', 'S3'])
+        for student in self.students[:3]:
+            self.assertAlmostEqual(grades[student.student_id], student.get_score_for_semester())
+        self.assertAlmostEqual(grades['S0'], 150.0)
+        self.assertAlmostEqual(grades['S1'], 33.33)
+        self.assertEqual(grades['S3'], 0)
+
+    def test_grade_students_of_other_semester(self):
+        '''Test: students without quizzes in the semester get 0.'''
+        grades = grade_students(self.students, 'not_existent')
+        self.assertEqual(grades, {'S0': 0, 'S1': 0, 'S2': 0, 'S3': 0})
+
+    def test_grade_students_in_processes(self):
+        '''Test: grading in processes gives the same grades.'''
+        self.assertEqual(grade_students_parallel(self.students, processes=2),
+                         grade_students(self.students))
+        self.assertEqual(grade_students_parallel(self.students, processes=1),
+                         grade_students(self.students))
+        self.assertEqual(grade_students_parallel([], processes=2), {})
+
+    def test_teacher_can_grade_a_running_course(self):
+        '''Test: a teacher grades all the students of a running course.'''
+        running = CourseRunningFactory()
+        for student in self.students:
+            running.add_student(student)
+        grades = TeacherFactory().calc_grades_for_semester(running)
+        self.assertAlmostEqual(grades['S2'], 100.0)
+        self.assertEqual(len(grades), 4)
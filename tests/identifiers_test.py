@@ -0,0 +1,55 @@
+"""Tests related with interned ids and their integer keys."""
+from array import array
+
+from classroom.app.courses import Course, CourseRunning, Department
+from classroom.app.entities import Student, Teacher
+from classroom.app.identifiers import IdRegistry
+from classroom.tests.utils import BaseTestCase
+
+
+def fresh(text):
+    '''Return a string equal to text, but not the same object.'''
+    return ''.join(list(text))
+
+
+class IdRegistryTests(BaseTestCase):
+    def test_keys_are_dense_and_stable(self):
+        '''Test: ids get keys 0, 1, 2... and keep them.'''
+        registry = IdRegistry()
+        self.assertEqual(registry.key('GA1988'), 0)
+        self.assertEqual(registry.key('JS1990'), 1)
+        self.assertEqual(registry.key(fresh('GA1988')), 0)
+        self.assertEqual(len(registry), 2)
+        self.assertIn('JS1990', registry)
+        self.assertNotIn('XX', registry)
+        self.assertEqual(registry.id(1), 'JS1990')
+        self.assertEqual(list(registry), ['GA1988', 'JS1990'])
+
+    def test_many_ids_as_arrays(self):
+        '''Test: lists of ids are kept as arrays of keys, and back.'''
+        registry = IdRegistry()
+        keys = registry.keys(['MAT_2019', 'ALG_2019', 'MAT_2019'])
+        self.assertEqual(keys, array('i', [0, 1, 0]))
+        self.assertEqual(registry.ids(keys), ['MAT_2019', 'ALG_2019', 'MAT_2019'])
+
+    def test_intern_gives_one_string(self):
+        '''Test: equal ids are the same string object.'''
+        registry = IdRegistry()
+        first = registry.intern(fresh('GA1988'))
+        self.assertIs(registry.intern(fresh('GA1988')), first)
+
+
+class InternedEntityIdsTests(BaseTestCase):
+    def test_entities_share_their_ids(self):
+        '''Test: ids and codes built apart are one string in memory.'''
+        first = Student('Gonzalo', 'Amadio', fresh('GA1988'))
+        second = Student('Gonzalo', 'Amadio', fresh('GA1988'))
+        self.assertIs(first.student_id, second.student_id)
+        teacher = Teacher('John', 'Doe', fresh('JD1966'))
+        self.assertIs(teacher.teacher_id, Teacher('John', 'Doe', fresh('JD1966')).teacher_id)
+        teacher.add_course_to_teach(fresh('MAT_2019'))
+        department = Department('Department of Mathematics', fresh('DEPOM'))
+        course = Course('Mathematics', fresh('MAT'), department)
+        running = CourseRunning(course, '2019')
+        self.assertIs(running.running_course_code, teacher.get_teaching_courses()[0])
+        self.assertIs(course.course_code, Course('Mathematics', fresh('MAT'), department).course_code)
@@ -0,0 +1,106 @@
+"""Tests related with leaderboards of running courses."""
+import random
+
+from classroom.app.courses import CourseRunning
+from classroom.app.entities import Student, Teacher
+from classroom.app.leaderboards import Leaderboard, _FenwickTree
+from classroom.app.quizzes import Question
+from classroom.tests.factories import CourseFactory
+from classroom.tests.utils import BaseTestCase
+
+
+def question(correct):
+    q = Question('Question')
+    q.add_possible_answer('answer', correct, True)
+    return q
+
+
+class FenwickTreeTests(BaseTestCase):
+    def test_counts_and_finds_values(self):
+        '''Test: prefix counts and k-th values match a sorted list.'''
+        rng = random.Random(0)
+        tree = _FenwickTree(100)
+        values = [rng.randrange(100) for _ in range(200)]
+        for value in values:
+            tree.add(value, 1)
+        values.sort()
+        for value in (0, 13, 50, 99, 150):
+            self.assertEqual(tree.count_up_to(value), sum(v <= value for v in values))
+        for k in (1, 2, 100, 200):
+            self.assertEqual(tree.find(k), values[k - 1])
+
+
+class LeaderboardTests(BaseTestCase):
+    def setUp(self):
+        self.teacher = Teacher('John', 'Doe', 'JD1966')
+        self.running = CourseRunning(CourseFactory(), '2019', self.teacher)
+        self.quiz = self.teacher.create_quiz('q1', 'Quiz 1')
+        for correct in (1, 1, 1, 1):
+            self.quiz.add_question(question(correct))
+        self.students = [Student('Student', str(s), 'S{}'.format(s)) for s in range(4)]
+        for student in self.students:
+            student.enrol(self.running)
+            self.teacher.assign_quiz_to_student(student, self.quiz)
+
+    def test_ranking_follows_answers(self):
+        '''Test: ranks, percentiles and top change as students answer.'''
+        leaderboard = self.running.get_leaderboard()
+        self.assertIs(self.running.get_leaderboard(), leaderboard)
+        self.assertEqual(len(leaderboard), 4)
+        self.assertEqual(leaderboard.rank('S0'), 1)
+        self.assertEqual(leaderboard.percentile('S0'), 100)
+        self.students[0].answer_quiz_batch('q1', [1, 1])
+        self.students[1].answer_quiz_batch('q1', [1, 1, 1, 1])
+        self.students[2].answer_quiz_batch('q1', [1, 2, 2, 2])
+        self.assertEqual(leaderboard.top(3), [('S1', 100), ('S0', 50), ('S2', 25)])
+        self.assertEqual(leaderboard.rank('S1'), 1)
+        self.assertEqual(leaderboard.rank('S3'), 4)
+        self.assertEqual(leaderboard.percentile('S0'), 75)
+        self.assertEqual(leaderboard.get_total('S2'), 25)
+        self.assertIsNone(leaderboard.rank('not_existent'))
+        self.assertIsNone(leaderboard.percentile('not_existent'))
+        self.assertIsNone(leaderboard.get_total('not_existent'))
+
+    def test_ties_and_late_students(self):
+        '''Test: equal totals share a rank, students enroled later are ranked.'''
+        leaderboard = self.running.get_leaderboard()
+        late = Student('Student', 'late', 'S9')
+        late.enrol(self.running)
+        self.assertEqual(leaderboard.rank('S9'), 1)
+        self.assertEqual(len(leaderboard), 5)
+        self.teacher.assign_quiz_to_student(late, self.quiz)
+        late.answer_quiz('q1', 1)
+        self.students[3].answer_quiz('q1', 1)
+        self.assertEqual(leaderboard.top(2), [('S3', 25), ('S9', 25)])
+        self.assertEqual(leaderboard.rank('S9'), 1)
+        self.assertEqual(leaderboard.rank('S0'), 3)
+        self.assertEqual(len(leaderboard.top(10)), 5)
+
+    def test_students_of_other_courses_are_ignored(self):
+        '''Test: only the students of the running course are ranked.'''
+        leaderboard = self.running.get_leaderboard()
+        other = Student('Student', 'other', 'X1')
+        self.teacher.assign_quiz_to_student(other, self.quiz)
+        other.answer_quiz('q1', 1)
+        self.assertIsNone(leaderboard.rank('X1'))
+        self.assertEqual(len(leaderboard), 4)
+
+    def test_high_totals_grow_the_tree(self):
+        '''Test: totals beyond the initial size are ranked.'''
+        leaderboard = Leaderboard(self.running)
+        for q in range(200):
+            quiz = self.teacher.create_quiz('big{}'.format(q), 'Quiz')
+            quiz.add_question(question(1))
+            self.teacher.assign_quiz_to_student(self.students[2], quiz)
+            self.students[2].answer_quiz(quiz.quiz_id, 1)
+        self.assertEqual(leaderboard.top(1), [('S2', 20000)])
+        self.assertEqual(leaderboard.rank('S0'), 2)
+
+    def test_running_without_teacher(self):
+        '''Test: students of a course without teacher are all tied at 0.'''
+        running = CourseRunning(CourseFactory(), '2019')
+        for student in self.students:
+            student.enrol(running)
+        leaderboard = running.get_leaderboard()
+        self.assertEqual(leaderboard.rank('S3'), 1)
+        self.assertEqual(leaderboard.top(1), [('S0', 0)])
@@ -0,0 +1,84 @@
+"""Tests related with instrumenting the hot paths."""
+from classroom.app import metrics
+from classroom.app.courses import Department
+from classroom.app.quizzes import Submission
+from classroom.app.entities import Student
+from classroom.app.exceptions import QuizFinishedException
+from classroom.tests.factories import (
+    CourseRunningFactory,
+    QuizFactory,
+    RandomQuestionFactory,
+    StudentFactory,
+    TeacherFactory,
+)
+from classroom.tests.utils import BaseTestCase
+
+
+class MetricsTests(BaseTestCase):
+    def setUp(self):
+        metrics.reset()
+        self.addCleanup(metrics.disable)
+        self.quiz = QuizFactory(quiz_id='q1', teacher=TeacherFactory())
+        question = RandomQuestionFactory()
+        question.add_possible_answer('2', 1, True)
+        self.quiz.add_question(question)
+        self.student = StudentFactory(student_id='S1', quizzes={})
+
+    def test_disabled_costs_nothing(self):
+        '''Test: methods are the original ones unless enabled.'''
+        answer_quiz = Student.answer_quiz
+        mark_course_as_running = Department.__dict__['mark_course_as_running']
+        metrics.enable()
+        self.assertTrue(metrics.is_enabled())
+        self.assertIsNot(Student.answer_quiz, answer_quiz)
+        metrics.disable()
+        self.assertFalse(metrics.is_enabled())
+        self.assertIs(Student.answer_quiz, answer_quiz)
+        self.assertIs(Department.__dict__['mark_course_as_running'], mark_course_as_running)
+        self.student.answer_quiz('q1', 1)
+        self.assertEqual(metrics.snapshot(), {})
+
+    def test_outcomes_of_answer_quiz(self):
+        '''Test: every message of answer_quiz is counted.'''
+        metrics.enable()
+        self.student.answer_quiz('q1', 1)
+        self.student.subscribe_to_quiz(self.quiz)
+        self.student.answer_quiz('q1', 1)
+        self.student.answer_quiz('q1', 1)
+        self.student.answer_quiz('q2', 1)
+        self.student.get_score_for_semester()
+        answer_quiz = metrics.snapshot()['Student.answer_quiz']
+        self.assertEqual(answer_quiz['count'], 4)
+        self.assertEqual(answer_quiz['outcomes'], {
+            'You are not subscribed to this quiz in current semester': 1,
+            'Ok': 1,
+            'Quiz already finished': 1,
+            'Quiz not defined': 1,
+        })
+        self.assertEqual(sum(answer_quiz['histogram'].values()), 4)
+        self.assertGreater(answer_quiz['total_seconds'], 0)
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['Submission.answer_next_question']['outcomes'], {
+            'ok': 1, 'QuizFinishedException': 1,
+        })
+        self.assertEqual(snapshot['Student.get_score_for_semester']['outcomes'], {'ok': 1})
+
+    def test_submission_and_department_helpers(self):
+        '''Test: exceptions are counted and raised, static methods still work.'''
+        metrics.enable()
+        submission = Submission(self.quiz, self.student, '2019_1')
+        submission.answer_next_question(1)
+        with self.assertRaises(QuizFinishedException):
+            submission.answer_next_question(1)
+        self.assertEqual(submission.get_score(), 100)
+        running = CourseRunningFactory()
+        Department.add_student_to_course(self.student, running)
+        self.assertEqual(running.get_students(), [self.student])
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['Submission.answer_next_question']['outcomes'], {
+            'ok': 1, 'QuizFinishedException': 1,
+        })
+        self.assertEqual(snapshot['Submission.get_score']['count'], 1)
+        self.assertEqual(snapshot['Department.add_student_to_course']['count'], 1)
+        metrics.reset()
+        self.assertEqual(metrics.snapshot(), {})
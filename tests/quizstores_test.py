@@ -0,0 +1,95 @@
+"""Tests related with quiz stores."""
+import os
+import tempfile
+
+from classroom.app.exceptions import QuizException
+from classroom.app.quizstores import StoredQuestion, QuizStore, write_quiz_store
+from classroom.tests.factories import (
+    QuestionFactory,
+    QuizFactory,
+    StudentFactory,
+    TeacherFactory,
+)
+from classroom.tests.utils import BaseTestCase
+
+
+class QuizStoreTests(BaseTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'quizzes.bin')
+        quizzes = []
+        for number in range(3):
+            quiz = QuizFactory(quiz_id='q{}'.format(number), name='Quiz {}'.format(number))
+            for correct in range(1, number + 2):
+                question = QuestionFactory(text='¿{} + 1?'.format(correct))
+                question.add_possible_answer(str(correct + 1), correct, True)
+                quiz.add_question(question)
+            quizzes.append(quiz)
+        with open(self.path, 'wb') as stream:
+            write_quiz_store(stream, quizzes)
+        self.store = QuizStore(self.path)
+        self.addCleanup(self.store.close)
+
+    def test_store_has_index(self):
+        '''Test: the ids of the quizzes are known when the store is opened.'''
+        self.assertEqual(len(self.store), 3)
+        self.assertEqual(self.store.get_quiz_ids(), ['q0', 'q1', 'q2'])
+        self.assertIn('q1', self.store)
+        self.assertNotIn('q3', self.store)
+        with self.assertRaises(KeyError):
+            self.store.get_quiz('q3', TeacherFactory())
+
+    def test_store_reads_questions(self):
+        '''Test: questions are read from the file.'''
+        quiz = self.store.get_quiz('q2', TeacherFactory())
+        self.assertEqual(quiz.name, 'Quiz 2')
+        self.assertEqual(len(quiz.questions), 3)
+        question = quiz.questions[2]
+        self.assertIsInstance(question, StoredQuestion)
+        self.assertEqual(question.text, '¿3 + 1?')
+        self.assertEqual(question.possible_answers, ['', '', '4', ''])
+        self.assertEqual(question.correct_answer, 3)
+        with self.assertRaises(QuizException):
+            question.add_possible_answer('5', 1, True)
+
+    def test_store_quizzes_can_be_answered(self):
+        '''Test: the same quiz is given to a teacher every time, and can be assigned.'''
+        teacher = TeacherFactory()
+        quiz = self.store.get_quiz('q1', teacher)
+        self.assertIs(self.store.get_quiz('q1', teacher), quiz)
+        self.assertIs(quiz.teacher, teacher)
+        student = StudentFactory(student_id='S1')
+        student.subscribe_to_quiz(quiz)
+        self.assertEqual(student.answer_quiz_batch('q1', [1, 1]), ('Ok', 2))
+        self.assertEqual(student.get_score_for_semester(), 50)
+        self.assertEqual(teacher.quizzes, [quiz])
+        self.assertEqual(teacher.get_gradebook().get_total('S1'), 50)
+
+    def test_store_gives_every_teacher_its_quiz(self):
+        '''Test: a quiz read by another teacher is a quiz of that teacher.'''
+        first, second = TeacherFactory(teacher_id='T1'), TeacherFactory(teacher_id='T2')
+        quiz = self.store.get_quiz('q1', first)
+        other = self.store.get_quiz('q1', second)
+        self.assertIsNot(other, quiz)
+        self.assertIs(other.teacher, second)
+        self.assertEqual(other.name, quiz.name)
+        self.assertEqual(len(other.questions), len(quiz.questions))
+
+    def test_store_rejects_other_files(self):
+        '''Test: only quiz stores can be opened.'''
+        with open(self.path, 'wb') as stream:
+            stream.write(b'\0' * 32)
+        with self.assertRaises(QuizException):
+            QuizStore(self.path)
+        for data in (b'', b'QZST'):
+            with open(self.path, 'wb') as stream:
+                stream.write(data)
+            with self.assertRaises(QuizException) as e:
+                QuizStore(self.path)
+            self.assertEqual(str(e.exception), 'Not a quiz store')
+        with open(self.path, 'wb') as stream:
+            stream.write(b'QZST\x02\x00' + b'\0' * 12)
+        with self.assertRaises(QuizException) as e:
+            QuizStore(self.path)
+        self.assertEqual(str(e.exception), 'Unsupported quiz store version 2')
@@ -2,10 +2,12 @@
 
 from classroom.app.entities import Teacher
 from classroom.app.exceptions import AnswerPositionOverflow, QuizFinishedException
+from classroom.app.quizzes import NO_ANSWER, BaseQuestion, QuizListener, Submission
 from classroom.tests.factories import (
     QuestionFactory,
     QuizFactory,
     RandomQuestionFactory,
+    StudentFactory,
 )
 from classroom.tests.utils import BaseTestCase
 
@@ -20,7 +22,7 @@ class QuizTests(BaseTestCase):
         self.assertHasAttr(self.quiz, 'teacher')
         self.assertHasAttr(self.quiz, 'name')
         self.assertHasAttr(self.quiz, 'questions')
-        self.assertHasAttr(self.quiz, 'is_finished')
+        self.assertHasAttr(self.quiz, 'submissions')
 
     def test_quiz_params_on_creation(self):
         '''Test: quiz does not modify params on creation.'''
@@ -28,7 +30,7 @@ class QuizTests(BaseTestCase):
         self.assertEqual(self.quiz.name, 'Mathematics Quiz Number 1')
         self.assertIsInstance(self.quiz.teacher, Teacher)
         self.assertEqual(self.quiz.questions, [])
-        self.assertEqual(self.quiz.is_finished, False)
+        self.assertEqual(self.quiz.submissions, {})
 
     def test_quiz_can_add_question(self):
         '''Test: Can we add a question to a quiz?.'''
@@ -38,45 +40,161 @@ class QuizTests(BaseTestCase):
         quiz.add_question(q1)
         quiz.add_question(q2)
         self.assertEqual(len(quiz.questions), 2)
-        self.assertEqual(quiz.is_finished, False)
 
-    def test_quiz_can_answer_next_question(self):
-        '''Test if there is a function to answer next question.'''
-        quiz = self.quiz
-        q1 = RandomQuestionFactory()
-        quiz.add_question(q1)
-        quiz.answer_next_question(1)
+    def test_quiz_is_not_answered_itself(self):
+        '''Test: answering state lives in submissions, not in the quiz.'''
+        self.assertFalse(hasattr(self.quiz, 'answer_next_question'))
+        self.assertFalse(hasattr(self.quiz, 'get_score'))
+        self.assertFalse(hasattr(self.quiz, 'is_finished'))
 
-    def test_quiz_is_marked_as_finished_when_last_question_i1s_answered(self):
-        '''Test if a quiz is flagged as finished when there are no more questions to answer.'''
-        quiz = self.quiz
-        q1 = RandomQuestionFactory()
-        # q1.correct_answer = 1
-        quiz.add_question(q1)
-        quiz.answer_next_question(1)
-        self.assertEqual(quiz.is_finished, True)
 
-    def test_quiz_cannot_be_answered_if_finished_or_empty(self):
-        '''If a quiz is finished, we cannot answer it again.'''
-        quiz = self.quiz
+class SubmissionTests(BaseTestCase):
+    def setUp(self):
+        self.quiz = QuizFactory()
+        for _ in range(2):
+            q = RandomQuestionFactory()
+            q.add_possible_answer('2', 1, True)
+            self.quiz.add_question(q)
+        self.submission = Submission(self.quiz, StudentFactory(), '2019_1')
+
+    def test_submission_params_on_creation(self):
+        '''Test: submission starts with no answers.'''
+        submission = self.submission
+        self.assertEqual(submission.quiz_id, 'quiz_01')
+        self.assertEqual(submission.semester_id, '2019_1')
+        self.assertEqual(submission.answers, bytearray())
+        self.assertEqual(submission.is_finished, False)
+        self.assertEqual(submission.get_score(), 0)
+
+    def test_submission_records_chosen_options(self):
+        '''Test: answers are stored in order, unknown choices as NO_ANSWER.'''
+        submission = self.submission
+        submission.answer_next_question(1)
+        submission.answer_next_question(7)
+        self.assertEqual(list(submission.answers), [1, NO_ANSWER])
+        self.assertEqual(submission.is_finished, True)
+        self.assertEqual(submission.get_score(), 50)
+        with self.assertRaises(QuizFinishedException):
+            submission.answer_next_question(1)
+
+    def test_submission_answers_many_questions(self):
+        '''Test: answers left after finishing the quiz are not applied.'''
+        submission = self.submission
+        self.assertEqual(submission.answer_next_questions([2]), 1)
+        self.assertEqual(submission.answer_next_questions([1, 1, 1]), 1)
+        self.assertEqual(submission.answer_next_questions([1]), 0)
+        self.assertEqual(list(submission.answers), [2, 1])
+        self.assertEqual(submission.get_score(), 50)
+
+    def test_submission_is_marked_as_finished_when_last_question_is_answered(self):
+        '''Test if a submission is flagged as finished when there are no more questions.'''
+        submission = Submission(QuizFactory(), StudentFactory(), '2019_1')
+        self.assertEqual(submission.is_finished, False)
+        submission.quiz.add_question(RandomQuestionFactory())
+        submission.answer_next_question(1)
+        self.assertEqual(submission.is_finished, True)
+
+    def test_submission_answers_questions_in_order(self):
+        '''Each answer goes to the next unanswered question, even after adding more.'''
+        submission = self.submission
+        submission.answer_next_question(1)
+        self.assertEqual(len(submission.answers), 1)
+        self.assertEqual(submission.is_finished, False)
+        submission.answer_next_question(3)
+        self.assertEqual(submission.is_finished, True)
+        self.quiz.add_question(RandomQuestionFactory())
+        self.assertEqual(submission.is_finished, False)
+        submission.answer_next_question(2)
+        self.assertEqual(list(submission.answers), [1, 3, 2])
+        self.assertEqual(submission.is_finished, True)
+
+    def test_submission_cannot_be_answered_if_empty(self):
+        '''If a quiz has no questions, its submissions cannot be answered.'''
+        submission = Submission(QuizFactory(), StudentFactory(), '2019_1')
         with self.assertRaises(QuizFinishedException) as e:
-            quiz.answer_next_question(2)
+            submission.answer_next_question(2)
         self.assertEqual(str(e.exception), 'Quiz is already finished')
 
-    def test_quiz_get_score(self):
+    def test_submission_get_score(self):
         '''Test get score, should be a ratio between total questions and correct.'''
-        quiz = self.quiz
-        self.assertEqual(quiz.get_score(), 0)
+        quiz = QuizFactory()
+        submission = Submission(quiz, StudentFactory(), '2019_1')
+        self.assertEqual(submission.get_score(), 0)
         q1 = RandomQuestionFactory()
         q1.add_possible_answer('2', 1, True)
         quiz.add_question(q1)
-        quiz.answer_next_question(1)
-        self.assertEqual(quiz.get_score(), 100)
+        submission.answer_next_question(1)
+        self.assertEqual(submission.get_score(), 100)
         q2 = RandomQuestionFactory()
         q2.add_possible_answer('2', 1, True)
         quiz.add_question(q2)
-        quiz.answer_next_question(2)
-        self.assertEqual(quiz.get_score(), 50)
+        submission.answer_next_question(2)
+        self.assertEqual(submission.get_score(), 50)
+
+    def test_submission_get_score_rounds_to_two_decimals(self):
+        '''Test get score keeps two decimals when the ratio is not exact.'''
+        self.quiz.add_question(RandomQuestionFactory())
+        submission = self.submission
+        submission.answer_next_question(1)
+        self.assertEqual(submission.get_score(), 33.33)
+        submission.answer_next_question(1)
+        self.assertEqual(submission.get_score(), 66.67)
+        submission.answer_next_question(3)
+        self.assertEqual(submission.get_score(), 66.67)
+
+    def test_submission_does_not_modify_quiz(self):
+        '''Test: answering a submission leaves the shared quiz untouched.'''
+        other = Submission(self.quiz, StudentFactory(), '2019_1')
+        self.submission.answer_next_question(1)
+        self.assertEqual(len(other.answers), 0)
+        self.assertEqual(other.get_score(), 0)
+        self.assertEqual(len(self.quiz.questions), 2)
+
+
+class QuizListenerTests(BaseTestCase):
+    class Recorder(QuizListener):
+        def __init__(self):
+            self.events = []
+
+        def on_assign(self, submission):
+            self.events.append(('assign', submission.student.student_id))
+
+        def on_unassign(self, submission):
+            self.events.append(('unassign', submission.student.student_id))
+
+        def on_answer(self, submission, start, count):
+            self.events.append(('answer', start, count))
+
+        def on_question_added(self, quiz):
+            self.events.append(('question', len(quiz.questions)))
+
+    def test_listener_is_notified(self):
+        '''Test: listeners know about assignments, answers and new questions.'''
+        quiz = QuizFactory()
+        recorder = self.Recorder()
+        quiz.add_listener(recorder)
+        quiz.add_listener(recorder)
+        quiz.add_question(RandomQuestionFactory())
+        quiz.add_question(RandomQuestionFactory())
+        student = StudentFactory(student_id='S1')
+        student.subscribe_to_quiz(quiz)
+        # Subscribing again to the same quiz keeps the submission.
+        student.subscribe_to_quiz(quiz)
+        student.answer_quiz(quiz.quiz_id, 1)
+        student.answer_quiz_batch(quiz.quiz_id, [1, 1])
+        # Subscribing to another quiz with the same id replaces the submission.
+        student.subscribe_to_quiz(QuizFactory())
+        quiz.remove_listener(recorder)
+        quiz.add_question(RandomQuestionFactory())
+        self.assertEqual(recorder.events, [
+            ('question', 1),
+            ('question', 2),
+            ('assign', 'S1'),
+            ('answer', 0, 1),
+            ('answer', 1, 1),
+            ('unassign', 'S1'),
+        ])
+        self.assertEqual(quiz.submissions, {})
 
 
 class QuestionTests(BaseTestCase):
@@ -88,23 +206,26 @@ class QuestionTests(BaseTestCase):
         self.assertHasAttr(self.question, 'text')
         self.assertHasAttr(self.question, '_correct_answer')
         self.assertHasAttr(self.question, 'possible_answers')
-        self.assertHasAttr(self.question, 'is_answered')
-        self.assertHasAttr(self.question, 'is_answered_correct')
 
     def test_question_params_on_creation(self):
         '''Test: question does not modify params on creation.'''
         self.assertEqual(self.question.text, 'How much is 1 + 1?')
         self.assertEqual(self.question._correct_answer, 1)
         self.assertEqual(len(self.question.possible_answers), 4)
-        self.assertEqual(self.question.is_answered, False)
-        self.assertEqual(self.question.is_answered_correct, False)
 
     def test_question_can_add_a_possible_answer(self):
         '''Add an answer to the multiple choice of this question.'''
         question = self.question
         # Add answer, in a position, is it correct?
         question.add_possible_answer('2', 1, True)
+        question.add_possible_answer('4', 4, True)
+        self.assertEqual(question.possible_answers, ['2', '', '', '4'])
         # We assume to have only 4 choices.
         with self.assertRaises(AnswerPositionOverflow) as e:
             question.add_possible_answer('3', 5, True)
         self.assertEqual(str(e.exception), 'Position must be between 1 and 4')
+
+    def test_base_question_needs_add_possible_answer(self):
+        '''Test: a question must say how answers are added to it.'''
+        with self.assertRaises(TypeError):
+            BaseQuestion()
@@ -0,0 +1,77 @@
+"""Tests related with the index of unfinished quizzes."""
+from classroom.app.courses import CourseRunning
+from classroom.app.entities import Student, Teacher
+from classroom.app.quizzes import Question
+from classroom.app.reminders import IncompleteIndex
+from classroom.app.utils import FixedSemesterClock, get_semester_id, semester_clock
+from classroom.tests.factories import CourseFactory
+from classroom.tests.utils import BaseTestCase
+
+
+def question():
+    q = Question('Question')
+    q.add_possible_answer('answer', 1, True)
+    return q
+
+
+class IncompleteIndexTests(BaseTestCase):
+    def setUp(self):
+        self.teacher = Teacher('John', 'Doe', 'JD1966')
+        self.running = CourseRunning(CourseFactory(), '2019', self.teacher)
+        self.quiz = self.teacher.create_quiz('q1', 'Quiz 1')
+        for _ in range(2):
+            self.quiz.add_question(question())
+        self.students = [Student('Student', str(s), 'S{}'.format(s)) for s in range(3)]
+        for student in self.students:
+            student.enrol(self.running)
+        self.index = IncompleteIndex()
+
+    def ids(self, students):
+        return sorted(student.student_id for student in students)
+
+    def test_submissions_leave_when_finished(self):
+        '''Test: assigned quizzes are in the index until finished.'''
+        self.teacher.assign_quiz_to_student(self.students[0], self.quiz)
+        self.students[0].answer_quiz('q1', 1)
+        self.index.track([self.quiz])
+        self.teacher.assign_quiz_to_student(self.students[1], self.quiz)
+        self.assertEqual(self.ids(self.index.get_students('q1')), ['S0', 'S1'])
+        self.students[0].answer_quiz('q1', 2)
+        self.students[1].answer_quiz_batch('q1', [1, 1])
+        self.assertEqual(self.index.get_students('q1'), [])
+        self.assertEqual(len(self.index), 0)
+        self.assertEqual(self.index.get_students('not_existent'), [])
+
+    def test_added_question_unfinishes_submissions(self):
+        '''Test: a finished quiz with a new question has to be finished again.'''
+        self.index.track([self.quiz])
+        self.teacher.assign_quiz_to_student(self.students[0], self.quiz)
+        self.students[0].answer_quiz_batch('q1', [1, 1])
+        self.assertEqual(len(self.index), 0)
+        self.quiz.add_question(question())
+        self.assertEqual(self.ids(self.index.get_students('q1')), ['S0'])
+        self.assertEqual([s.quiz_id for s in self.index], ['q1'])
+
+    def test_students_of_a_running_course(self):
+        '''Test: only students of the course with quizzes of its teacher are given.'''
+        other_teacher = Teacher('Jane', 'Roe', 'JR1970')
+        other_quiz = other_teacher.create_quiz('q2', 'Quiz 2')
+        other_quiz.add_question(question())
+        outsider = Student('Student', 'out', 'X1')
+        self.index.track([self.quiz, other_quiz])
+        self.teacher.assign_quiz_to_student(self.students[0], self.quiz)
+        self.teacher.assign_quiz_to_student(outsider, self.quiz)
+        other_teacher.assign_quiz_to_student(self.students[1], other_quiz)
+        self.assertEqual(self.ids(self.index.get_running_students(self.running)), ['S0'])
+        self.assertEqual(self.index.get_running_students(CourseRunning(CourseFactory(), '2019')), [])
+
+    def test_other_semesters_and_replaced_submissions(self):
+        '''Test: submissions of other semesters, or replaced, are not in the index.'''
+        self.index.track([self.quiz])
+        with semester_clock(FixedSemesterClock('2000_1')):
+            self.teacher.assign_quiz_to_student(self.students[0], self.quiz)
+        self.assertEqual(len(self.index), 0)
+        self.teacher.assign_quiz_to_student(self.students[1], self.quiz)
+        submission = self.students[1].quizzes[get_semester_id()]['q1']
+        self.quiz.remove_submission(submission)
+        self.assertEqual(len(self.index), 0)
@@ -0,0 +1,87 @@
+"""Tests related with importing rosters."""
+import io
+
+from classroom.app.courses import CourseRegistry
+from classroom.app.exceptions import RosterImportException
+from classroom.app.roster import COLUMNS, RosterImporter
+from classroom.tests.utils import BaseTestCase
+
+ROWS = [
+    ('DEPOM', 'Department of Mathematics', 'MAT', 'Mathematics', '2019',
+     'JD1966', 'John', 'Doe', 'GA1988', 'Gonzalo', 'Amadio'),
+    ('DEPOM', 'Department of Mathematics', 'MAT', 'Mathematics', '2019',
+     'JD1966', 'John', 'Doe', 'JS1990', 'Jane', 'Smith'),
+    ('DEPOM', 'Department of Mathematics', 'ALG', 'Algebra', '2019',
+     '', '', '', 'GA1988', 'Gonzalo', 'Amadio'),
+    # Same enrolment again, as a sync that runs twice.
+    ('DEPOM', 'Department of Mathematics', 'MAT', 'Mathematics', '2019',
+     'JD1966', 'John', 'Doe', 'GA1988', 'Gonzalo', 'Amadio'),
+]
+
+
+def roster(rows, columns=COLUMNS):
+    lines = [','.join(columns)] + [','.join(row) for row in rows]
+    return io.StringIO('\n'.join(lines) + '\n')
+
+
+class RosterImporterTests(BaseTestCase):
+    def setUp(self):
+        self.importer = RosterImporter()
+
+    def test_import_builds_entities_once(self):
+        '''Test: every entity is created once, whatever the rows it is in.'''
+        rows = self.importer.import_csv(roster(ROWS))
+        self.assertEqual(rows, 4)
+        self.assertEqual(self.importer.rows, 4)
+        self.assertEqual(list(self.importer.departments), ['DEPOM'])
+        department = self.importer.departments['DEPOM']
+        self.assertEqual(list(department.get_courses()), ['MAT', 'ALG'])
+        self.assertEqual(list(self.importer.runnings),
+                         [('DEPOM', 'MAT_2019'), ('DEPOM', 'ALG_2019')])
+        self.assertEqual(list(self.importer.students), ['GA1988', 'JS1990'])
+        self.assertEqual(list(self.importer.teachers), ['JD1966'])
+
+    def test_import_links_entities(self):
+        '''Test: students are enroled and teachers assigned.'''
+        self.importer.import_csv(roster(ROWS))
+        mat = self.importer.runnings[('DEPOM', 'MAT_2019')]
+        alg = self.importer.runnings[('DEPOM', 'ALG_2019')]
+        teacher = self.importer.teachers['JD1966']
+        student = self.importer.students['GA1988']
+        self.assertIs(mat.teacher, teacher)
+        self.assertIsNone(alg.teacher)
+        self.assertEqual(teacher.get_teaching_courses(), ['MAT_2019'])
+        self.assertEqual([s.student_id for s in mat.get_students()], ['GA1988', 'JS1990'])
+        self.assertEqual(student.get_enroled_courses(), ['MAT_2019', 'ALG_2019'])
+        self.assertEqual(mat.course.get_runnings(), [mat])
+
+    def test_import_columns_in_any_order(self):
+        '''Test: columns are found by their name in the header.'''
+        columns = tuple(reversed(COLUMNS))
+        rows = [tuple(reversed(row)) for row in ROWS]
+        self.importer.import_csv(roster(rows, columns))
+        self.assertEqual(list(self.importer.students), ['GA1988', 'JS1990'])
+
+    def test_import_fails_without_columns(self):
+        '''Test: a roster without every column can not be imported.'''
+        with self.assertRaises(RosterImportException) as e:
+            self.importer.import_csv(roster([], COLUMNS[:-1]))
+        self.assertEqual(str(e.exception), 'Missing columns: student_last_name')
+
+    def test_import_fails_with_short_rows(self):
+        '''Test: a row with fewer columns than the header tells its line.'''
+        lines = list(roster(ROWS))
+        lines.insert(2, 'DEPOM,Department of Mathematics,MAT\n')
+        with self.assertRaises(RosterImportException) as e:
+            self.importer.import_csv(lines)
+        self.assertEqual(str(e.exception), 'Line 3: expected 11 columns, found 3')
+
+    def test_import_same_code_in_other_departments(self):
+        '''Test: running courses are told apart by department.'''
+        registry = CourseRegistry()
+        importer = RosterImporter(registry)
+        other = ('DEPPH', 'Department of Physics') + ROWS[0][2:]
+        importer.import_csv(roster([ROWS[0], other]))
+        self.assertEqual(list(importer.runnings), [('DEPOM', 'MAT_2019'), ('DEPPH', 'MAT_2019')])
+        self.assertIsNot(registry.get('DEPOM', 'MAT_2019'), registry.get('DEPPH', 'MAT_2019'))
+        self.assertEqual(len(registry.get_teacher_runnings('JD1966')), 2)
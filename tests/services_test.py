@@ -0,0 +1,88 @@
+"""Tests related with the asyncio service."""
+import asyncio
+
+from classroom.app.concurrency import STUDENT_NOT_FOUND
+from classroom.app.entities import Student
+from classroom.app.services import ClassroomService
+from classroom.tests.factories import (
+    CourseRunningFactory,
+    QuizFactory,
+    RandomQuestionFactory,
+)
+from classroom.tests.utils import BaseTestCase
+
+
+class ClassroomServiceTests(BaseTestCase):
+    def setUp(self):
+        self.quiz = QuizFactory()
+        for _ in range(4):
+            question = RandomQuestionFactory()
+            question.add_possible_answer('2', 1, True)
+            self.quiz.add_question(question)
+        self.students = [Student('A', 'B', 'S{}'.format(i)) for i in range(20)]
+        self.service = ClassroomService(self.students)
+
+    def test_service_answers_concurrently(self):
+        '''Test: concurrent answers of many students are all applied, in order.'''
+        async def student_session(student_id):
+            await self.service.assign_quiz(student_id, self.quiz)
+            results = []
+            for answer in (1, 2, 1, 1, 1):
+                results.append(await self.service.answer_quiz(student_id, 'quiz_01', answer))
+                await asyncio.sleep(0)
+            return results
+
+        async def main():
+            return await asyncio.gather(*(student_session(s.student_id) for s in self.students))
+
+        for results in asyncio.run(main()):
+            self.assertEqual(results, ['Ok', 'Ok', 'Ok', 'Ok', 'Quiz already finished'])
+        for student in self.students:
+            self.assertEqual(student.get_score_for_semester(), 75)
+
+    def test_service_grades_and_enrols(self):
+        '''Test: enrolment, batch answers and grading through the service.'''
+        running = CourseRunningFactory()
+
+        async def main():
+            self.assertIsNone(await self.service.enrol('S1', running))
+            await self.service.assign_quiz('S1', self.quiz)
+            batch = await self.service.answer_quiz_batch('S1', 'quiz_01', [1, 1])
+            score = await self.service.get_score_for_semester('S1')
+            grades = await self.service.grade_students(['S1', 'S2', 'unknown'])
+            return batch, score, grades
+
+        batch, score, grades = asyncio.run(main())
+        self.assertTrue(running.has_student('S1'))
+        self.assertEqual(batch, ('Ok', 2))
+        self.assertEqual(score, 50)
+        self.assertEqual(grades, {'S1': 50, 'S2': 0})
+
+    def test_service_grades_answers_given_before(self):
+        '''Test: answers given while grading do not change the grades.'''
+        async def main():
+            for student in self.students[:2]:
+                await self.service.assign_quiz(student.student_id, self.quiz)
+            await self.service.answer_quiz('S0', 'quiz_01', 1)
+            grading = asyncio.ensure_future(self.service.grade_students(['S0', 'S1']))
+            await asyncio.sleep(0)
+            await self.service.answer_quiz_batch('S1', 'quiz_01', [1, 1, 1, 1])
+            return await grading
+
+        self.assertEqual(asyncio.run(main()), {'S0': 25, 'S1': 0})
+
+    def test_service_unknown_student(self):
+        '''Test: requests for unknown students get an error message.'''
+        async def main():
+            return [
+                await self.service.answer_quiz('unknown', 'quiz_01', 1),
+                await self.service.answer_quiz_batch('unknown', 'quiz_01', [1]),
+                await self.service.assign_quiz('unknown', self.quiz),
+                await self.service.enrol('unknown', CourseRunningFactory()),
+                await self.service.get_score_for_semester('unknown'),
+            ]
+
+        self.assertEqual(asyncio.run(main()), [
+            STUDENT_NOT_FOUND, (STUDENT_NOT_FOUND, 0), STUDENT_NOT_FOUND,
+            STUDENT_NOT_FOUND, STUDENT_NOT_FOUND,
+        ])
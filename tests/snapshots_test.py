@@ -0,0 +1,100 @@
+"""Tests related with snapshots of the school."""
+import io
+
+from classroom.app.courses import CourseRegistry, Department
+from classroom.app.entities import Student, Teacher
+from classroom.app.exceptions import SnapshotException
+from classroom.app.quizzes import Question
+from classroom.app.snapshots import load_snapshot, save_snapshot
+from classroom.app.utils import get_semester_id
+from classroom.tests.utils import BaseTestCase
+
+
+class SnapshotTests(BaseTestCase):
+    def setUp(self):
+        self.department = Department('Department of Mathematics', 'DEPOM')
+        course = self.department.add_course('Mathematics', 'MAT')
+        self.running = self.department.mark_course_as_running(course, '2019')
+        self.department.mark_course_as_running(self.department.add_course('Álgebra', 'ALG'), '2020')
+        self.teacher = Teacher('John', 'Doe', 'JD1966')
+        self.department.assign_teacher_to_course(self.teacher, self.running)
+        self.quiz = self.teacher.create_quiz('q1', 'Quiz 1')
+        for text, correct in (('1 + 1?', 2), ('2 + 2?', 4)):
+            question = Question(text)
+            question.add_possible_answer(str(correct), correct, True)
+            self.quiz.add_question(question)
+        self.students = [Student('Gonzalo', 'Amadio', 'GA1988'), Student('Jane', 'Smith', 'JS1990')]
+        for student in self.students:
+            student.enrol(self.running)
+            self.teacher.assign_quiz_to_student(student, self.quiz)
+        self.students[0].answer_quiz_batch('q1', [2, 3])
+        # A student only reachable from its own quiz subscription.
+        self.loner = Student('Lone', 'Wolf', 'LW2000')
+        self.teacher.assign_quiz_to_student(self.loner, self.quiz)
+
+    def round_trip(self, **kwargs):
+        stream = io.BytesIO()
+        save_snapshot(stream, [self.department], **kwargs)
+        stream.seek(0)
+        return load_snapshot(stream, CourseRegistry())
+
+    def test_snapshot_keeps_courses(self):
+        '''Test: departments, courses and running courses are loaded.'''
+        school = self.round_trip()
+        department = school.departments['DEPOM']
+        self.assertEqual(department.name, 'Department of Mathematics')
+        self.assertEqual(list(department.get_courses()), ['MAT', 'ALG'])
+        self.assertEqual(department.get_courses()['ALG'].description, 'Álgebra')
+        running = department.get_courses()['MAT'].get_runnings()[0]
+        self.assertEqual(running.get_code(), 'MAT_2019')
+        self.assertIs(running.teacher, school.teachers['JD1966'])
+        self.assertIsNone(department.get_courses()['ALG'].get_runnings()[0].teacher)
+        self.assertEqual([s.student_id for s in running.get_students()], ['GA1988', 'JS1990'])
+
+    def test_snapshot_keeps_people(self):
+        '''Test: teachers and students, with their classes, are loaded.'''
+        school = self.round_trip()
+        self.assertEqual(list(school.students), ['GA1988', 'JS1990', 'LW2000'])
+        student = school.students['GA1988']
+        self.assertEqual(student.get_names(), 'Gonzalo Amadio')
+        self.assertTrue(student.is_enroled('MAT_2019'))
+        teacher = school.teachers['JD1966']
+        self.assertEqual(teacher.get_teaching_courses(), ['MAT_2019'])
+        self.assertEqual([q.quiz_id for q in teacher.quizzes], ['q1'])
+
+    def test_snapshot_keeps_quizzes_and_answers(self):
+        '''Test: quizzes are shared by the submissions, answers are kept.'''
+        school = self.round_trip()
+        quiz = school.quizzes[0]
+        self.assertEqual([q.text for q in quiz.questions], ['1 + 1?', '2 + 2?'])
+        self.assertEqual(quiz.questions[1].possible_answers, ['', '', '', '4'])
+        self.assertEqual(quiz.questions[1].correct_answer, 4)
+        self.assertGreaterEqual(quiz.answer_table.columns, 2)
+        semester = get_semester_id()
+        submission = school.students['GA1988'].quizzes[semester]['q1']
+        self.assertIs(submission.quiz, quiz)
+        self.assertEqual(list(submission.answers), [2, 3])
+        self.assertEqual(school.students['GA1988'].get_score_for_semester(), 50)
+        self.assertEqual(len(quiz.submissions), 3)
+        # Answering goes on from where it was left.
+        self.assertEqual(school.students['JS1990'].answer_quiz('q1', 2), 'Ok')
+        self.assertEqual(school.teachers['JD1966'].get_gradebook().get_total('JS1990'), 50)
+
+    def test_snapshot_rejects_other_files(self):
+        '''Test: only snapshots of this version can be loaded.'''
+        with self.assertRaises(SnapshotException) as e:
+            load_snapshot(io.BytesIO(b'not a snapshot'))
+        self.assertEqual(str(e.exception), 'Not a snapshot')
+        with self.assertRaises(SnapshotException) as e:
+            load_snapshot(io.BytesIO(b'CLSS\x02\x00'))
+        self.assertEqual(str(e.exception), 'Unsupported snapshot version 2')
+
+    def test_snapshot_rejects_truncated_files(self):
+        '''Test: a snapshot cut at any point can not be loaded.'''
+        stream = io.BytesIO()
+        save_snapshot(stream, [self.department])
+        data = stream.getvalue()
+        for length in range(6, len(data)):
+            with self.assertRaises(SnapshotException) as e:
+                load_snapshot(io.BytesIO(data[:length]))
+            self.assertEqual(str(e.exception), 'Snapshot is truncated')